@@ -0,0 +1,210 @@
+"""
+Benchmark deck-analysis coercion on malformed vision outputs.
+
+Builds a seeded corpus of DeckAnalysis-shaped JSON documents with the kinds
+of defects the vision model produces (nulls for lists, ``[]`` for optional
+strings, stringified JSON, lists where strings are expected, bad items inside
+lists) and times the compiled single-pass plan against the previous
+fix-then-salvage approach.
+
+Usage:
+    python -m benchmarks.bench_coercion
+    python -m benchmarks.bench_coercion --docs 200 --items 80 --defect-rate 0.3
+"""
+import argparse
+import copy
+import json
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from src.deck_analysis.coercion import coerce_model
+from src.deck_analysis.schemas import DeckAnalysis
+from .fake_llm import sample_payload
+
+
+LIST_OF_MODELS = [
+    "funding_details", "team", "competitive_advantages", "awards_and_grants",
+    "projection_analysis", "slides", "unconventional_data", "additional_insights", "text_heavy_sections",
+]
+LIST_OF_STR = [
+    "facts", "storytelling", "observations", "market_insights", "customer_testimonials",
+    "technology_stack", "present_elements", "missing_elements", "notable_strengths",
+]
+OPTIONAL_STR = ["problem_statement", "solution_overview", "target_market", "sales_strategy", "technical_approach"]
+
+
+def _item(schema_payload: Dict[str, Any], i: int) -> Dict[str, Any]:
+    item = copy.deepcopy(schema_payload)
+    for key, value in item.items():
+        if isinstance(value, str):
+            item[key] = f"{value} #{i}"
+    return item
+
+
+def make_document(rng: random.Random, items: int, defect_rate: float) -> Dict[str, Any]:
+    """One large, partly malformed vision output."""
+    base = sample_payload(DeckAnalysis)
+    doc = {k: v for k, v in base.items() if k not in ("deck_name", "total_slides")}
+    for field in LIST_OF_MODELS:
+        template = doc[field][0] if doc.get(field) else {}
+        doc[field] = [_item(template, i) for i in range(items)]
+    for field in LIST_OF_STR:
+        doc[field] = [f"{field} entry {i}" for i in range(items)]
+    doc["metrics"] = {
+        category: [_item(doc["metrics"][next(iter(doc["metrics"]))][0], i) for i in range(items // 4)]
+        for category in ("funding", "traction", "market_size", "financials")
+    }
+
+    def defect(p: float = defect_rate) -> bool:
+        return rng.random() < p
+
+    for field in LIST_OF_MODELS:
+        for item in doc[field]:
+            if defect():
+                # null list fields / [] optional strings / missing required keys
+                for key, value in list(item.items()):
+                    if isinstance(value, list):
+                        item[key] = None
+                    elif value is None:
+                        item[key] = []
+                if defect(0.5):
+                    item.pop(next(iter(item)), None)
+        if defect(0.2):
+            doc[field] = json.dumps(doc[field])
+    for field in LIST_OF_STR:
+        if defect():
+            doc[field] = None
+        elif defect():
+            doc[field] = doc[field] + [None, {"note": "object instead of string"}]
+    for field in OPTIONAL_STR:
+        if defect():
+            doc[field] = []
+        elif defect():
+            doc[field] = ["first part", "second part"]
+    if defect():
+        doc["business_model_details"] = json.dumps(doc.get("business_model_details") or {})
+    if defect():
+        doc["slides"] = doc["slides"] if isinstance(doc["slides"], str) else doc["slides"] + ["not a slide"]
+    return doc
+
+
+# ---------- previous approach (kept here as the baseline) ----------
+_LIST_KEYS = ['investors', 'partnerships', 'distribution_channels', 'assumptions_stated', 'supporting_evidence',
+              'flags', 'key_takeaways', 'key_points', 'data_items', 'slide_numbers']
+_OPTIONAL_KEYS = ['context', 'details', 'date', 'valuation', 'status', 'relevance', 'sales_strategy',
+                  'technical_approach', 'pricing_structure', 'customer_acquisition', 'sales_cycle',
+                  'expansion_strategy']
+
+
+def _deep_fix_types(obj):
+    if isinstance(obj, dict):
+        fixed = {}
+        for k, v in obj.items():
+            if v is None and k in _LIST_KEYS:
+                fixed[k] = []
+            elif v == [] and k in _OPTIONAL_KEYS:
+                fixed[k] = None
+            elif isinstance(v, str) and v.strip().startswith(('{', '[')):
+                try:
+                    fixed[k] = json.loads(v.replace("'", '"'))
+                except Exception:
+                    fixed[k] = v
+            elif isinstance(v, dict):
+                fixed[k] = _deep_fix_types(v)
+            elif isinstance(v, list):
+                fixed[k] = [_deep_fix_types(i) if isinstance(i, (dict, list)) else i for i in v]
+            else:
+                fixed[k] = v
+        return fixed
+    if isinstance(obj, list):
+        return [_deep_fix_types(i) if isinstance(i, (dict, list)) else i for i in obj]
+    return obj
+
+
+def legacy_coerce(doc: Dict[str, Any]) -> DeckAnalysis:
+    """Fix types, validate; on failure salvage, then test each field with a full rebuild."""
+    base = {"deck_name": "bench", "total_slides": 10}
+    try:
+        return DeckAnalysis(**base, **_deep_fix_types(doc))
+    except Exception:
+        pass
+    salvaged = dict(base)
+    for key, value in doc.items():
+        if key not in DeckAnalysis.model_fields:
+            continue
+        annotation = str(DeckAnalysis.model_fields[key].annotation)
+        if isinstance(value, list) and 'str' in annotation and 'List' not in annotation:
+            salvaged[key] = "; ".join(str(v) for v in value) if value else None
+        elif isinstance(value, list):
+            salvaged[key] = [
+                {k: ([] if v is None and k in _LIST_KEYS + ['notes'] else
+                     [x for x in v if x is not None] if isinstance(v, list) else v)
+                 for k, v in item.items()} if isinstance(item, dict) else item
+                for item in value
+            ]
+        else:
+            salvaged[key] = value
+    try:
+        return DeckAnalysis(**salvaged)
+    except Exception:
+        pass
+    safe = dict(base)
+    for key, value in salvaged.items():
+        if key in base:
+            continue
+        try:
+            DeckAnalysis(**{**safe, key: value})
+            safe[key] = value
+        except Exception:
+            pass
+    return DeckAnalysis(**safe)
+
+
+def compiled_coerce(doc: Dict[str, Any]) -> DeckAnalysis:
+    analysis, _ = coerce_model(DeckAnalysis, {**doc, "deck_name": "bench", "total_slides": 10})
+    return analysis
+
+
+def _recovered_items(analysis: DeckAnalysis) -> int:
+    return sum(len(getattr(analysis, f)) for f in LIST_OF_MODELS + LIST_OF_STR) + \
+        sum(len(v) for v in analysis.metrics.values())
+
+
+def _time(fn: Callable, corpus: List[Dict[str, Any]]) -> dict:
+    timings, recovered = [], 0
+    for doc in corpus:
+        start = time.perf_counter()
+        analysis = fn(doc)
+        timings.append((time.perf_counter() - start) * 1000)
+        recovered += _recovered_items(analysis)
+    return {
+        "total_ms": sum(timings),
+        "p50_ms": statistics.median(timings),
+        "max_ms": max(timings),
+        "recovered_items": recovered,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deck analysis coercion")
+    parser.add_argument("--docs", type=int, default=50, help="Documents in the corpus")
+    parser.add_argument("--items", type=int, default=40, help="Items per list field")
+    parser.add_argument("--defect-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_document(rng, args.items, args.defect_rate) for _ in range(args.docs)]
+    compiled_coerce(corpus[0])  # compile the plan outside the timed loop
+
+    print(f"Corpus: {args.docs} docs, {args.items} items per list, defect rate {args.defect_rate}")
+    print(f"{'Approach':<12} {'Total (ms)':>11} {'p50 (ms)':>10} {'Max (ms)':>10} {'Items kept':>11}")
+    for name, fn in (("legacy", legacy_coerce), ("compiled", compiled_coerce)):
+        r = _time(fn, [copy.deepcopy(d) for d in corpus])
+        print(f"{name:<12} {r['total_ms']:>11.1f} {r['p50_ms']:>10.2f} {r['max_ms']:>10.2f} {r['recovered_items']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark PDF rasterizer backends on the fixture deck corpus.
+
+Each backend renders every fixture deck ``--repeat`` times in its own
+subprocess, so peak RSS (including poppler's ``pdftoppm`` children) is
+measured independently. Backends that are not installed are reported and
+skipped. ``--sandbox`` renders through the sandboxed worker process that the
+pipeline uses (one worker per deck) instead of in-process.
+
+Usage:
+    python -m benchmarks.bench_rasterize
+    python -m benchmarks.bench_rasterize --backends pdfium,poppler --repeat 5 --dpi 150
+    python -m benchmarks.bench_rasterize --sandbox
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+from src.deck_analysis.raster_sandbox import sandboxed_render
+from src.deck_analysis.rasterizers import RASTER_DPI, RASTERIZERS, get_rasterizer
+from .fixtures.make_fixtures import DECKS_DIR
+
+
+def _rss_mb(who: int) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_backend(backend: str, decks: list, repeat: int, dpi: int, sandbox: bool = False) -> dict:
+    """
+    Render the corpus with one backend and return measurements.
+
+    Args:
+        backend: Rasterizer name
+        decks: PDF paths
+        repeat: Passes over the corpus
+        dpi: Render resolution
+        sandbox: Render each deck in the sandboxed worker process instead of in this process
+
+    Returns:
+        Dict with pages, elapsed seconds and peak RSS
+    """
+    rasterizer = get_rasterizer(backend)
+    workdir = tempfile.mkdtemp(prefix="pp-raster-")
+    pages, timings = 0, []
+    try:
+        for i in range(repeat):
+            for deck in decks:
+                output_dir = os.path.join(workdir, f"{i}")
+                os.makedirs(output_dir, exist_ok=True)
+                start = time.perf_counter()
+                if sandbox:
+                    pages += len(sandboxed_render(deck, output_dir, backend=backend, dpi=dpi))
+                else:
+                    pages += len(rasterizer.render(deck, output_dir, dpi=dpi))
+                timings.append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = sum(timings)
+    return {
+        "backend": f"{backend}+sandbox" if sandbox else backend,
+        "pages": pages,
+        "elapsed_s": elapsed,
+        "pages_per_s": pages / elapsed if elapsed else 0.0,
+        "p50_deck_ms": sorted(timings)[len(timings) // 2] * 1000,
+        "peak_rss_mb": _rss_mb(resource.RUSAGE_SELF),
+        "peak_child_rss_mb": _rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def _child(backend, decks, repeat, dpi, sandbox, queue):
+    queue.put(run_backend(backend, decks, repeat, dpi, sandbox))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF rasterizer backends")
+    parser.add_argument("--backends", default=",".join(RASTERIZERS), help="Comma-separated backend names")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the fixture corpus")
+    parser.add_argument("--dpi", type=int, default=RASTER_DPI)
+    parser.add_argument("--sandbox", action="store_true", help="Render through the sandboxed worker process")
+    args = parser.parse_args()
+
+    decks = sorted(glob.glob(os.path.join(DECKS_DIR, "*.pdf")))
+    print(f"Corpus: {len(decks)} decks x {args.repeat} passes at {args.dpi} dpi"
+          + (" (sandboxed worker)" if args.sandbox else ""))
+    print(f"{'Backend':<16} {'Pages':>6} {'Elapsed (s)':>12} {'Pages/s':>9} {'p50 deck (ms)':>14} "
+          f"{'Peak RSS (MB)':>14} {'Child RSS (MB)':>15}")
+
+    ctx = multiprocessing.get_context("spawn")
+    for backend in args.backends.split(","):
+        if backend not in RASTERIZERS or not RASTERIZERS[backend].available():
+            print(f"{backend:<16} not installed, skipped")
+            continue
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_child, args=(backend, decks, args.repeat, args.dpi, args.sandbox, queue))
+        proc.start()
+        r = queue.get()
+        proc.join()
+        print(f"{r['backend']:<16} {r['pages']:>6} {r['elapsed_s']:>12.2f} {r['pages_per_s']:>9.1f} "
+              f"{r['p50_deck_ms']:>14.1f} {r['peak_rss_mb']:>14.1f} {r['peak_child_rss_mb']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
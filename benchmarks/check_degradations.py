@@ -0,0 +1,61 @@
+"""
+Check that deadline-mode degradations show up in the trace.
+
+Runs the web graph offline (fake LLM, fixture homepage) once per web
+degradation set and verifies that every applied degradation is recorded as
+a ``degraded.<name>`` event on the company's spans. Routing functions run
+outside any span, so an event recorded there would be lost silently.
+
+Usage:
+    python -m benchmarks.check_degradations
+"""
+import sys
+from typing import Dict, Tuple
+
+from src.core.degradation import SKIP_COMPETITION, SKIP_MARKET_SIZE
+from src.core.llm import set_model_factory
+from src.core.telemetry import tracer
+from src.web_analysis.graph import analysis_graph, AnalysisState
+from .fake_llm import fake_model_factory
+from .run_pipeline import COMPANIES, _serve_html
+
+
+WEB_CASES: Tuple[Tuple[str, ...], ...] = (
+    (SKIP_MARKET_SIZE,),
+    (SKIP_COMPETITION,),
+    (SKIP_MARKET_SIZE, SKIP_COMPETITION),
+)
+
+
+def _events(trace) -> Dict[str, int]:
+    events: Dict[str, int] = {}
+    for span in trace.spans:
+        for name, value in span.events.items():
+            events[name] = events.get(name, 0) + value
+    return events
+
+
+def main() -> int:
+    set_model_factory(fake_model_factory({}, seed=0, time_scale=0.01))
+    server, base_url = _serve_html()
+    slug, name, _ = COMPANIES[0]
+    failures = 0
+    try:
+        for degradations in WEB_CASES:
+            with tracer.company(name) as trace:
+                analysis_graph.invoke(AnalysisState(
+                    startup_name=name, startup_url=f"{base_url}/{slug}.html", degradations=list(degradations),
+                ))
+            events = _events(trace)
+            missing = [d for d in degradations if events.get(f"degraded.{d}") != 1]
+            status = "ok" if not missing else f"MISSING {', '.join(missing)}"
+            print(f"web {'+'.join(degradations)}: {status}")
+            failures += bool(missing)
+    finally:
+        server.shutdown()
+        set_model_factory(None)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Regression cases for the text heuristics that gate LLM calls.
+
+Each heuristic is run on short strings whose expected result is known. Past
+false positives are kept here, so a pattern change that brings one back fails.
+
+Usage:
+    python -m benchmarks.check_heuristics
+"""
+import sys
+from typing import Tuple
+
+from src.deck_analysis.text_layer import extract_metric_candidates, source_numbers
+from src.web_analysis.utils import is_parked
+
+
+# (text, parked?)
+PARKED_CASES: Tuple[Tuple[str, bool], ...] = (
+    ("This domain is for sale! Make an offer today.", True),
+    ("Buy this domain. Contact sedo.com for details.", True),
+    ("example.io is listed on Dan.com. Make an offer.", True),
+    ("Get in touch: hello@jordan.com", False),
+    ("We ship coffee from Sudan.com partners across East Africa.", False),
+    ("Our partner sedo.company runs the logistics.", False),
+    ("Acme builds grid storage. Press: dan.com/press-kit", False),
+)
+# (slide text, expected source numbers, expected candidate values)
+NUMBER_CASES: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("Product launch planned for Q3 2025 in 4 markets", ("2025", "4"), ()),
+    ("We are raising $1,500,000 at a $12M valuation", ("1.2e+07", "1.5e+06", "12"), ("$1,500,000", "$12M")),
+    ("TAM \u20ac2\u00a0500\u00a0000", ("2.5e+06",), ("\u20ac2\u00a0500\u00a0000",)),
+)
+
+
+def main() -> int:
+    failures = 0
+    for text, expected in PARKED_CASES:
+        got = is_parked(text)
+        if got != expected:
+            print(f"parked {text!r}: expected {expected}, got {got}")
+            failures += 1
+    print(f"parked: {len(PARKED_CASES) - failures}/{len(PARKED_CASES)} ok")
+
+    number_failures = 0
+    for text, numbers, values in NUMBER_CASES:
+        got_numbers = tuple(source_numbers([text]))
+        got_values = tuple(m.value for metrics in extract_metric_candidates([text]).values() for m in metrics)
+        if got_numbers != numbers or got_values != values:
+            print(f"numbers {text!r}: expected {numbers} / {values}, got {got_numbers} / {got_values}")
+            number_failures += 1
+    print(f"deck numbers: {len(NUMBER_CASES) - number_failures}/{len(NUMBER_CASES)} ok")
+    return 1 if failures or number_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
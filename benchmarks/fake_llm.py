@@ -0,0 +1,237 @@
+"""
+Deterministic fake chat model for offline benchmarks.
+
+``FakeChatModel`` stands in for ``ChatOpenAI`` in every graph (it is
+installed through ``src.core.llm.set_model_factory``). It sleeps for a
+latency sampled from a seeded distribution and answers with schema-valid
+JSON (for the strict ``response_format`` it is called with, or canned by
+prompt marker otherwise), so the pipeline runs end to end with no network.
+"""
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+import types
+import typing
+from typing import Any, Dict, List, Optional, Type
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from src.core.prompt_cache import prefix_digest, static_prefix
+from src.core.structured import registered_model
+from src.core.telemetry import telemetry_callback
+from src.deck_analysis.schemas import DeckAnalysis
+from src.web_analysis.schemas import Analysis, Competitor, MarketSize
+
+
+class Latency(BaseModel):
+    """
+    Latency distribution in seconds.
+
+    Spec strings: ``const:0.5``, ``uniform:0.2:1.5``, ``lognormal:1.0:0.4``
+    (median, sigma).
+    """
+    kind: str = "const"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        parts = spec.split(":")
+        kind = parts[0]
+        values = [float(p) for p in parts[1:]] + [0.0, 0.0]
+        return cls(kind=kind, a=values[0], b=values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(max(self.a, 1e-6)), self.b)
+        return self.a
+
+
+# Default per-model latency profiles (roughly shaped after production traces)
+DEFAULT_PROFILES: Dict[str, str] = {
+    "gpt-4o-mini": "lognormal:0.4:0.3",
+    "gpt-4o": "lognormal:1.2:0.4",
+}
+
+
+def sample_payload(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build a deterministic instance payload that validates against a schema.
+
+    Args:
+        schema: Pydantic model class
+
+    Returns:
+        Dict accepted by ``schema.model_validate``
+    """
+    payload = {}
+    for field_name, field in schema.model_fields.items():
+        payload[field_name] = _sample_value(field.annotation, field_name, field.metadata)
+    return payload
+
+
+def _sample_value(annotation, field_name: str, metadata=()) -> Any:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType):
+        inner = [a for a in args if a is not type(None)]
+        return _sample_value(inner[0], field_name, metadata)
+    if origin in (list, List):
+        return [_sample_value(args[0], field_name)]
+    if origin in (dict, Dict):
+        return {"traction": _sample_value(args[1], field_name)}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return sample_payload(annotation)
+    if annotation is bool:
+        return False
+    if annotation is int:
+        low = next((m.ge for m in metadata if getattr(m, "ge", None) is not None), 1)
+        high = next((m.le for m in metadata if getattr(m, "le", None) is not None), low + 4)
+        return (low + high) // 2
+    if annotation is float:
+        return 3.0
+    return f"Sample {field_name.replace('_', ' ')}"
+
+
+def _analysis_payload() -> Dict[str, Any]:
+    payload = sample_payload(Analysis)
+    payload.pop("market_size", None)
+    payload["competition"] = []
+    return payload
+
+
+# Prompt markers -> canned free-form JSON response (first match wins)
+CANNED_RESPONSES = [
+    ("pitch deck", lambda: {k: v for k, v in sample_payload(DeckAnalysis).items()
+                            if k not in ("deck_name", "total_slides")}),
+    ("competing startups", lambda: {"competition": [sample_payload(Competitor) for _ in range(3)]}),
+    ("market size", lambda: sample_payload(MarketSize)),
+    ("", _analysis_payload),
+]
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    parts = []
+    for message in messages:
+        if isinstance(message.content, str):
+            parts.append(message.content)
+        else:
+            parts.extend(p.get("text", "") for p in message.content if isinstance(p, dict))
+    return "\n".join(parts)
+
+
+# Static prefixes already sent in this process, to mimic provider prompt caching
+_seen_prefixes = set()
+_seen_lock = threading.Lock()
+
+
+def _cached_tokens(messages: List[BaseMessage]) -> int:
+    """Tokens a provider would serve from cache: repeated prefix over 1024 tokens, 128-token steps."""
+    digest = prefix_digest(messages)
+    if digest is None:
+        return 0
+    with _seen_lock:
+        seen = digest in _seen_prefixes
+        _seen_prefixes.add(digest)
+    prefix_tokens = len(static_prefix(messages)) // 4
+    if not seen or prefix_tokens < 1024:
+        return 0
+    return prefix_tokens // 128 * 128
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that sleeps for a sampled latency and returns canned JSON."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "gpt-4o"
+    latency: Latency = Latency()
+    seed: int = 0
+    time_scale: float = 1.0
+
+    _rng: random.Random = PrivateAttr()
+    _rng_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context) -> None:
+        self._rng = random.Random(f"{self.seed}:{self.model_name}")
+
+    @property
+    def _llm_type(self) -> str:
+        return "pitchpanda-fake"
+
+    def _delay(self) -> float:
+        with self._rng_lock:
+            delay = self.latency.sample(self._rng)
+        return max(delay, 0.0) * self.time_scale
+
+    def _message(self, messages: List[BaseMessage], content: str) -> AIMessage:
+        prompt_tokens = len(_prompt_text(messages)) // 4
+        completion_tokens = len(content) // 4
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "input_token_details": {"cache_read": _cached_tokens(messages)},
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._delay())
+        return self._reply(messages, kwargs)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs) -> ChatResult:
+        # Used by hedged calls; cancelling the task cancels the sleep, like closing a real request
+        await asyncio.sleep(self._delay())
+        return self._reply(messages, kwargs)
+
+    def _reply(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> ChatResult:
+        schema = registered_model(kwargs.get("response_format"))
+        if schema is not None:
+            # Strict structured output: answer with exactly the requested properties
+            properties = kwargs["response_format"]["json_schema"]["schema"].get("properties", {})
+            content = json.dumps({k: v for k, v in sample_payload(schema).items() if k in properties})
+        else:
+            text = _prompt_text(messages).lower()
+            for marker, factory in CANNED_RESPONSES:
+                if marker in text:
+                    content = json.dumps(factory())
+                    break
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, content))])
+
+
+def fake_model_factory(profiles: Optional[Dict[str, str]] = None, seed: int = 0, time_scale: float = 1.0):
+    """
+    Build a registry factory producing fake models.
+
+    Args:
+        profiles: Model name -> latency spec (defaults to DEFAULT_PROFILES)
+        seed: RNG seed for reproducible latency samples
+        time_scale: Multiplier applied to every sampled delay
+
+    Returns:
+        Callable suitable for ``set_model_factory``
+    """
+    profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+
+    def factory(model: str, temperature: float) -> FakeChatModel:
+        return FakeChatModel(
+            model_name=model,
+            latency=Latency.parse(profiles.get(model, "const:0.1")),
+            seed=seed,
+            time_scale=time_scale,
+            callbacks=[telemetry_callback],
+        )
+    return factory
@@ -0,0 +1,137 @@
+"""
+Generate the benchmark fixture corpus.
+
+Writes small text-layer pitch deck PDFs to ``benchmarks/fixtures/decks`` and
+static homepages to ``benchmarks/fixtures/html``. The output is committed, so
+this only needs re-running when the corpus changes.
+
+Usage:
+    python -m benchmarks.fixtures.make_fixtures
+"""
+import os
+from typing import List
+
+
+FIXTURES_DIR = os.path.dirname(os.path.abspath(__file__))
+DECKS_DIR = os.path.join(FIXTURES_DIR, "decks")
+HTML_DIR = os.path.join(FIXTURES_DIR, "html")
+
+# (slug, company name, number of slides)
+COMPANIES = [
+    ("acme-robotics", "Acme Robotics", 6),
+    ("bluefin-health", "Bluefin Health", 12),
+    ("cobalt-grid", "Cobalt Grid", 20),
+    ("dune-logistics", "Dune Logistics", 9),
+]
+
+SLIDE_TEMPLATES = [
+    ("{name}", ["Seed round 2025", "Confidential"]),
+    ("Problem", ["Operators lose 18% of capacity to unplanned downtime", "Manual inspections cost $40K per site per year"]),
+    ("Solution", ["Sensor kit plus SaaS dashboard", "Predicts failures 14 days ahead"]),
+    ("Market", ["TAM $12.4B", "SAM $2.1B", "SOM $85M"]),
+    ("Traction", ["MRR $62K", "Growth 18% MoM", "41 paying customers", "3 LOIs signed"]),
+    ("Business Model", ["Annual subscription: $1,200 per site", "Hardware at cost"]),
+    ("Team", ["CEO - ex-Siemens", "CTO - PhD robotics", "COO - 2 prior exits"]),
+    ("Financials", ["Year    2024    2025    2026", "Revenue  $0.4M  $1.9M  $6.5M", "EBITDA  -$1.2M  -$0.8M  $0.9M"]),
+    ("Competition", ["Incumbent A: on-prem only", "Startup B: no hardware"]),
+    ("The Ask", ["Raising $3M seed", "Runway 24 months"]),
+]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, pages: List[List[str]]) -> None:
+    """
+    Write a minimal PDF with one text page per entry (landscape, Helvetica).
+
+    Args:
+        path: Output file
+        pages: Lines of text for each page
+    """
+    objects = []
+    kids = []
+    font_id = 3
+    objects.append(None)  # 1: catalog
+    objects.append(None)  # 2: pages
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for lines in pages:
+        stream_lines = ["BT", "/F1 28 Tf", "60 330 Td"]
+        for i, line in enumerate(lines):
+            if i == 1:
+                stream_lines.append("/F1 18 Tf")
+            stream_lines.append(f"({_pdf_escape(line)}) Tj")
+            stream_lines.append("0 -36 Td")
+        stream_lines.append("ET")
+        stream = "\n".join(stream_lines).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 720 405] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        kids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def deck_pages(name: str, slides: int) -> List[List[str]]:
+    """Cycle through the slide templates to build a deck of the given length."""
+    pages = []
+    for i in range(slides):
+        title, lines = SLIDE_TEMPLATES[i % len(SLIDE_TEMPLATES)]
+        pages.append([title.format(name=name)] + lines)
+    return pages
+
+
+def homepage_html(name: str) -> str:
+    """Render a static homepage for a fixture company."""
+    return f"""<!doctype html>
+<html>
+<head><title>{name}</title><style>body {{ font-family: sans-serif; }}</style></head>
+<body>
+<nav><a href="/">Home</a> <a href="/about">About</a> <a href="/careers">Careers</a></nav>
+<h1>{name}: predictive maintenance for industrial sites</h1>
+<p>{name} helps plant operators avoid unplanned downtime. Our sensor kit streams vibration and
+temperature data to a cloud dashboard that flags failing equipment two weeks in advance.</p>
+<h2>Who we serve</h2>
+<p>Mid-sized manufacturers, water utilities and logistics hubs across Belgium, the Netherlands
+and Germany.</p>
+<h2>How it works</h2>
+<ol><li>Install the kit in under an hour.</li><li>Connect to the dashboard.</li>
+<li>Receive maintenance alerts with recommended actions.</li></ol>
+<footer>Offices: Ghent, Belgium &middot; Rotterdam, Netherlands</footer>
+<script>console.log("analytics");</script>
+</body>
+</html>
+"""
+
+
+def main():
+    os.makedirs(DECKS_DIR, exist_ok=True)
+    os.makedirs(HTML_DIR, exist_ok=True)
+    for slug, name, slides in COMPANIES:
+        write_text_pdf(os.path.join(DECKS_DIR, f"{slug}.pdf"), deck_pages(name, slides))
+        with open(os.path.join(HTML_DIR, f"{slug}.html"), "w", encoding="utf-8") as f:
+            f.write(homepage_html(name))
+    print(f"Wrote {len(COMPANIES)} decks to {DECKS_DIR} and homepages to {HTML_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Offline end-to-end pipeline benchmark.
+
+Runs ``run_all_companies`` against the fixture corpus with every chat model
+replaced by ``FakeChatModel`` and homepages served from a local HTTP server,
+so no network or API key is needed. Each worker count runs in its own
+subprocess so peak RSS is measured independently.
+
+Usage:
+    python -m benchmarks.run_pipeline
+    python -m benchmarks.run_pipeline --workers 1,4,8 --companies 24 --time-scale 0.25
+    python -m benchmarks.run_pipeline --latency gpt-4o=uniform:0.5:3.0
+"""
+import argparse
+import csv
+import functools
+import http.server
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+from .fixtures.make_fixtures import COMPANIES, DECKS_DIR, HTML_DIR
+
+
+def _serve_html() -> tuple:
+    """Serve the fixture homepages on an ephemeral localhost port."""
+    handler = functools.partial(_QuietHandler, directory=HTML_DIR)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _prepare_inputs(workdir: str, companies: int, base_url: str) -> str:
+    """Write a CSV and decks dir with ``companies`` rows cycling the fixtures."""
+    decks_dir = os.path.join(workdir, "decks")
+    os.makedirs(decks_dir, exist_ok=True)
+    csv_path = os.path.join(workdir, "pitches.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["startup_name", "startup_url"])
+        for i in range(companies):
+            slug, name, _ = COMPANIES[i % len(COMPANIES)]
+            company = f"{name} {i:03d}"
+            writer.writerow([company, f"{base_url}/{slug}.html"])
+            shutil.copy(
+                os.path.join(DECKS_DIR, f"{slug}.pdf"),
+                os.path.join(decks_dir, f"{slug}-{i:03d}.pdf"),
+            )
+    return csv_path
+
+
+def run_once(workers: int, companies: int, profiles: dict, seed: int, time_scale: float) -> dict:
+    """
+    Run the full pipeline once in this process and return measurements.
+
+    Args:
+        workers: Concurrent companies
+        companies: Number of CSV rows
+        profiles: Model name -> latency spec overrides
+        seed: Fake model RNG seed
+        time_scale: Multiplier for fake latencies
+
+    Returns:
+        Dict with throughput, per-node latency rows and peak RSS
+    """
+    from src import main as pipeline
+    from src.core.llm import set_model_factory
+    from src.core.telemetry import tracer
+    from src.deck_analysis.slide_cache import slide_cache
+    from .fake_llm import fake_model_factory
+
+    set_model_factory(fake_model_factory(profiles, seed=seed, time_scale=time_scale))
+    server, base_url = _serve_html()
+    workdir = tempfile.mkdtemp(prefix="pp-bench-")
+    try:
+        csv_path = _prepare_inputs(workdir, companies, base_url)
+        pipeline.INPUT_DECKS_DIR = os.path.join(workdir, "decks")
+        pipeline.OUTPUT_DIR = os.path.join(workdir, "output")
+        # Cold slide cache per run so repeated runs measure the same work
+        slide_cache.directory = os.path.join(workdir, "slide_cache")
+
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            pipeline.run_all_companies(
+                csv_path, workers=workers, queue_path=os.path.join(workdir, "queue.sqlite")
+            )
+        elapsed = time.perf_counter() - start
+
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+        return {
+            "workers": workers,
+            "companies": companies,
+            "elapsed_s": elapsed,
+            "companies_per_min": companies / elapsed * 60 if elapsed else 0.0,
+            "peak_rss_mb": rss_mb,
+            "nodes": tracer.summary_rows(),
+        }
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _print_results(results: list) -> None:
+    print(f"\n{'='*60}")
+    print("Pipeline benchmark (fake LLM, local fixtures)")
+    print(f"{'='*60}")
+    print(f"{'Workers':>8} {'Companies':>10} {'Elapsed (s)':>12} {'Companies/min':>14} {'Peak RSS (MB)':>14}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['companies']:>10} {r['elapsed_s']:>12.2f} "
+              f"{r['companies_per_min']:>14.1f} {r['peak_rss_mb']:>14.1f}")
+
+    for r in results:
+        print(f"\nPer-node latency — {r['workers']} worker(s)")
+        print(f"  {'Node':<34} {'Count':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'Errors':>7}")
+        for row in r["nodes"]:
+            print(f"  {row['node']:<34} {row['count']:>6} {row['p50_ms']:>10.1f} "
+                  f"{row['p95_ms']:>10.1f} {row['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline PitchPanda pipeline benchmark")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--companies", type=int, default=12, help="Companies per run")
+    parser.add_argument("--latency", action="append", default=[],
+                        help="Per-model latency override, e.g. gpt-4o=lognormal:1.2:0.4")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Multiply every fake latency (0.1 = 10x faster runs)")
+    parser.add_argument("--json", help="Also write raw results to this file")
+    parser.add_argument("--single-run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    profiles = dict(spec.split("=", 1) for spec in args.latency)
+
+    if args.single_run:
+        result = run_once(int(args.workers), args.companies, profiles, args.seed, args.time_scale)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for workers in [int(w) for w in args.workers.split(",")]:
+        cmd = [
+            sys.executable, "-m", "benchmarks.run_pipeline", "--single-run",
+            "--workers", str(workers), "--companies", str(args.companies),
+            "--seed", str(args.seed), "--time-scale", str(args.time_scale),
+        ]
+        for spec in args.latency:
+            cmd += ["--latency", spec]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True,
+                             env={**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-offline")})
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    _print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
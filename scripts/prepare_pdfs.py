@@ -11,13 +11,13 @@ This will:
 3. Help you match and rename PDFs to the correct slug format
 """
 import os
-import csv
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-from core.utils import slugify
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.core.utils import slugify
+from src.orchestration.intake import iter_rows, iter_jobs
 
 
 def main():
@@ -35,23 +35,7 @@ def main():
         return
     
     # Read company names
-    companies = []
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames:
-            reader.fieldnames = [
-                (fn or "").lstrip("\ufeff").strip() 
-                for fn in reader.fieldnames
-            ]
-        
-        for row in reader:
-            row = {
-                (k or "").lstrip("\ufeff").strip(): (v or "").strip() 
-                for k, v in row.items()
-            }
-            name = row.get("startup_name", "")
-            if name:
-                companies.append(name)
+    companies = [job.startup_name for job in iter_jobs(iter_rows(str(csv_path)))]
     
     # List PDF files
     pdf_files = list(decks_dir.glob("*.pdf"))
@@ -0,0 +1,217 @@
+"""
+Cheap-first model cascades.
+
+With a cascade enabled for a stage, its main LLM call is first made with
+the cheaper, faster model. The result is accepted unless:
+
+- the reply could not be parsed or validated (``invalid``)
+- too few of the stage's required fields are filled (``coverage``)
+- the model's own confidence labels average below the threshold (``confidence``)
+
+in which case the call is repeated with the next, stronger model. The last
+model's result is always kept. Attempts, acceptances and escalation reasons
+are recorded as telemetry events (``cascade.<stage>.*``) and summarized in
+the run report, so thresholds can be tuned against throughput.
+
+Cascades are opt-in: ``PITCHPANDA_CASCADE=web,deck`` (or ``all``).
+"""
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from .telemetry import record_event
+
+
+T = TypeVar("T")
+
+CHEAP_MODEL = "gpt-4o-mini"
+STRONG_MODEL = "gpt-4o"
+CASCADE_STAGES = {
+    s.strip() for s in os.environ.get("PITCHPANDA_CASCADE", "").lower().split(",") if s.strip()
+}
+# Self-reported confidence labels (deck metrics, competitor matches) as scores
+CONFIDENCE_SCORES = {"high": 1.0, "medium": 0.6, "low": 0.2}
+# Values that count as "not filled" for coverage
+_EMPTY_VALUES = {"", "unknown", "n/a", "none", "not available", "not specified"}
+
+
+class CascadePolicy(NamedTuple):
+    """Models to try for a stage (cheapest first) and when to escalate."""
+    models: Tuple[str, ...]
+    # Dotted field paths that should be filled in a good reply
+    required: Tuple[str, ...]
+    min_coverage: float = 0.75
+    min_confidence: float = 0.5
+
+
+CASCADE_POLICIES: Dict[str, CascadePolicy] = {
+    "web": CascadePolicy(
+        models=(CHEAP_MODEL, STRONG_MODEL),
+        required=("company_summary", "problem.general", "solution.what_it_is", "product_type", "sector", "subsector"),
+        min_coverage=0.8,
+    ),
+    "deck": CascadePolicy(
+        models=(CHEAP_MODEL, STRONG_MODEL),
+        required=(
+            "problem_statement", "solution_overview", "value_proposition", "target_market",
+            "business_model", "team", "metrics", "slides",
+        ),
+    ),
+    "merge": CascadePolicy(
+        models=(CHEAP_MODEL, STRONG_MODEL),
+        required=(
+            "company_overview.description", "problem_solution", "market", "business_model",
+            "financial_data", "competitors",
+        ),
+    ),
+    "evaluation": CascadePolicy(
+        models=(CHEAP_MODEL, STRONG_MODEL),
+        required=("reasoning",),
+        min_coverage=1.0,
+    ),
+}
+
+
+def cascade_enabled(stage: str) -> bool:
+    """True if the cascade is switched on for this stage (PITCHPANDA_CASCADE)."""
+    return stage in CASCADE_POLICIES and bool(CASCADE_STAGES & {stage, "all"})
+
+
+def _lookup(obj: Any, path: str) -> Any:
+    for part in path.split("."):
+        if obj is None:
+            return None
+        obj = obj.get(part) if isinstance(obj, dict) else getattr(obj, part, None)
+    return obj
+
+
+def _filled(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.strip().lower() not in _EMPTY_VALUES
+    if isinstance(value, BaseModel):
+        return any(_filled(v) for v in value.__dict__.values())
+    if isinstance(value, dict):
+        return any(_filled(v) for v in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return len(value) > 0
+    return True
+
+
+def field_coverage(result: Any, required: Sequence[str]) -> float:
+    """
+    Share of required fields that are filled in a reply.
+
+    Args:
+        result: Pydantic model or dict
+        required: Dotted field paths
+
+    Returns:
+        Coverage between 0 and 1 (1 when nothing is required)
+    """
+    if not required:
+        return 1.0
+    return sum(1 for path in required if _filled(_lookup(result, path))) / len(required)
+
+
+def _confidence_labels(value: Any, found: List[float]) -> None:
+    if isinstance(value, BaseModel):
+        value = value.__dict__
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "confidence" and isinstance(item, str) and item.lower() in CONFIDENCE_SCORES:
+                found.append(CONFIDENCE_SCORES[item.lower()])
+            else:
+                _confidence_labels(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _confidence_labels(item, found)
+
+
+def reported_confidence(result: Any) -> Optional[float]:
+    """Average of every ``confidence`` label in a reply (None if it has none)."""
+    found: List[float] = []
+    _confidence_labels(result, found)
+    return sum(found) / len(found) if found else None
+
+
+def escalation_reason(policy: CascadePolicy, result: Any, required: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Why a reply should be escalated to the next model, or None to accept it."""
+    if field_coverage(result, policy.required if required is None else required) < policy.min_coverage:
+        return "coverage"
+    confidence = reported_confidence(result)
+    if confidence is not None and confidence < policy.min_confidence:
+        return "confidence"
+    return None
+
+
+def run_cascade(
+    stage: str,
+    default_model: str,
+    attempt: Callable[[str], T],
+    view: Optional[Callable[[T], Any]] = None,
+    required: Optional[Sequence[str]] = None,
+    pinned: bool = False,
+) -> T:
+    """
+    Run a stage's LLM call through its cascade (see ``run_cascade_with_model``).
+
+    Returns:
+        The first accepted reply (always the last model's if all escalate)
+    """
+    return run_cascade_with_model(stage, default_model, attempt, view, required, pinned)[0]
+
+
+def run_cascade_with_model(
+    stage: str,
+    default_model: str,
+    attempt: Callable[[str], T],
+    view: Optional[Callable[[T], Any]] = None,
+    required: Optional[Sequence[str]] = None,
+    pinned: bool = False,
+) -> Tuple[T, str]:
+    """
+    Run a stage's LLM call through its cascade.
+
+    Args:
+        stage: Pipeline stage ("web", "deck", "merge", "evaluation")
+        default_model: Model used when the stage has no cascade enabled
+        attempt: Makes the call with the given model and returns the parsed reply;
+            raising ValueError / ValidationError marks the reply invalid
+        view: Maps the reply to the object that is checked (default: the reply);
+            may raise ValueError / ValidationError too
+        required: Required field paths for this call (default: the stage policy's)
+        pinned: ``default_model`` was chosen by a deadline-mode degradation;
+            the cascade starts from it and never escalates past it
+
+    Returns:
+        The first accepted reply (always the last model's if all escalate)
+        and the model that produced it
+
+    Raises:
+        Exception: Whatever the last model's attempt raised
+    """
+    if not cascade_enabled(stage):
+        return attempt(default_model), default_model
+
+    policy = CASCADE_POLICIES[stage]
+    models = (default_model,) if pinned else policy.models
+    for i, model in enumerate(models):
+        last = i == len(models) - 1
+        record_event(f"cascade.{stage}.attempts")
+        try:
+            result = attempt(model)
+            reason = escalation_reason(policy, view(result) if view else result, required)
+        except (ValueError, ValidationError) as e:
+            if last:
+                raise
+            reason = "invalid"
+            print(f"  Cascade: {model} reply invalid ({str(e)[:120]})")
+        if reason is None or last:
+            record_event(f"cascade.{stage}.accepted.{model}")
+            return result, model
+        record_event(f"cascade.{stage}.escalated.{reason}")
+        print(f"  Cascade: escalating {stage} from {model} to {models[i + 1]} ({reason})")
+    raise RuntimeError(f"Cascade for {stage} has no models")  # unreachable with a non-empty policy
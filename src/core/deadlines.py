@@ -0,0 +1,155 @@
+"""
+Per-stage and per-company deadlines with cooperative cancellation.
+
+``company_deadline`` and ``stage_deadline`` open nested deadline scopes in
+the current context (threads started with ``contextvars.copy_context``
+inherit them). The innermost scope's deadline is the earlier of its own and
+its parent's. Each scope owns a ``cancel`` event that is set when its
+deadline passes. Work in flight observes the deadline like this:
+
+- graph nodes: ``traced_node`` calls ``check_deadline`` before each node
+- LLM calls: run on the background event loop and cancelled at the
+  deadline, which closes the HTTP connection (``DeadlineChatModel`` in
+  ``llm.py``)
+- homepage fetches and ``pdftotext``: socket/subprocess timeouts and the
+  download cap shrink to the time left
+- rasterization: the sandbox worker process is killed when the scope's
+  ``cancel`` event fires
+
+An expired deadline raises ``DeadlineExceeded``. The orchestrator records
+stage timeouts and company timeouts and re-queues the company for a later
+attempt.
+
+Timeouts (seconds) can be overridden with ``PITCHPANDA_STAGE_TIMEOUTS``
+(e.g. ``web=120,deck=900``) and ``PITCHPANDA_COMPANY_TIMEOUT``; 0 disables
+one.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+def _stage_timeouts() -> Dict[str, float]:
+    timeouts = {"web": 180.0, "deck": 900.0, "merge": 300.0, "evaluation": 300.0}
+    for item in os.environ.get("PITCHPANDA_STAGE_TIMEOUTS", "").split(","):
+        stage, _, value = item.partition("=")
+        if stage.strip() and value.strip():
+            timeouts[stage.strip()] = float(value)
+    return timeouts
+
+
+STAGE_TIMEOUTS: Dict[str, float] = _stage_timeouts()
+COMPANY_TIMEOUT = float(os.environ.get("PITCHPANDA_COMPANY_TIMEOUT", "1800"))
+
+
+class DeadlineExceeded(TimeoutError):
+    """A stage or company ran past its deadline."""
+
+    def __init__(self, scope: str, name: str, seconds: float):
+        self.scope = scope  # "stage" or "company"
+        self.name = name  # stage name or company name
+        self.seconds = seconds
+        super().__init__(f"{scope} {name} exceeded its {seconds:g}s deadline")
+
+
+class Deadline:
+    """One deadline scope; ``cancel`` is set when it expires."""
+
+    def __init__(self, scope: str, name: str, seconds: float, parent: Optional["Deadline"] = None):
+        self.scope = scope
+        self.name = name
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.parent = parent
+        # The tightest enclosing deadline decides when work here must stop
+        self.limit = self if parent is None or self.expires_at <= parent.limit.expires_at else parent.limit
+        self.cancel = threading.Event()
+        self._timer = threading.Timer(max(0.0, self.limit.expires_at - time.monotonic()), self.cancel.set)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(0.0, self.limit.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.cancel.is_set() or time.monotonic() >= self.limit.expires_at
+
+    def error(self) -> DeadlineExceeded:
+        """The exception for this scope's expiry (attributed to the scope that set the limit)."""
+        return DeadlineExceeded(self.limit.scope, self.limit.name, self.limit.seconds)
+
+    def close(self) -> None:
+        self._timer.cancel()
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("pp_deadline", default=None)
+
+
+@contextmanager
+def _scope(scope: str, name: str, seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    parent = _current.get()
+    if not seconds or seconds <= 0:
+        yield parent
+        return
+    deadline = Deadline(scope, name, seconds, parent)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+        deadline.close()
+
+
+def company_deadline(name: str, seconds: Optional[float] = None):
+    """
+    Deadline scope for one company.
+
+    Args:
+        name: Company name (for messages)
+        seconds: Time budget (default COMPANY_TIMEOUT; 0 disables)
+    """
+    return _scope("company", name, COMPANY_TIMEOUT if seconds is None else seconds)
+
+
+def stage_deadline(stage: str, seconds: Optional[float] = None):
+    """
+    Deadline scope for one pipeline stage, bounded by the company's.
+
+    Args:
+        stage: Pipeline stage ("web", "deck", "merge", "evaluation")
+        seconds: Time budget (default STAGE_TIMEOUTS[stage]; 0 disables)
+    """
+    return _scope("stage", stage, STAGE_TIMEOUTS.get(stage) if seconds is None else seconds)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Innermost deadline scope of this context, if any."""
+    return _current.get()
+
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left in the current scope (``default`` when there is no deadline)."""
+    deadline = _current.get()
+    return default if deadline is None else deadline.remaining()
+
+
+def cancel_event() -> Optional[threading.Event]:
+    """Event set when the current scope expires (None without a deadline)."""
+    deadline = _current.get()
+    return None if deadline is None else deadline.cancel
+
+
+def check_deadline() -> None:
+    """
+    Raise if the current scope has expired.
+
+    Raises:
+        DeadlineExceeded: The stage or company deadline has passed
+    """
+    deadline = _current.get()
+    if deadline is not None and deadline.expired():
+        raise deadline.error()
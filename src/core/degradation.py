@@ -0,0 +1,118 @@
+"""
+Degraded execution plans for deadline-bound runs.
+
+When a run has to finish by a deadline, the budget guard
+(``orchestration/planner.py``) picks a plan per company: the shortest
+prefix of ``DEGRADATION_LEVELS`` whose projected wall time fits that
+company's share of the remaining time. The chosen degradations travel with
+the company through the web, deck and merge graphs (``degradations`` in
+each state), are recorded as ``degraded.<name>`` telemetry events, and are
+noted at the top of every markdown output they affect.
+
+``execution_plan.json`` in the company folder lists what was applied and
+which stages were deferred, so ``python -m src.main --evaluate-deferred``
+can finish them later.
+"""
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+SKIP_MARKET_SIZE = "skip_market_size"
+SKIP_COMPETITION = "skip_competition"
+LOW_DETAIL_SLIDES = "low_detail_slides"
+MINI_MERGE = "mini_merge"
+DEFER_EVALUATION = "defer_evaluation"
+
+# Name -> (stage it affects, note shown in the outputs)
+DEGRADATIONS: Dict[str, Tuple[str, str]] = {
+    SKIP_MARKET_SIZE: ("web", "market size (TAM/SAM/SOM) was not estimated"),
+    SKIP_COMPETITION: ("web", "competitors were not researched"),
+    LOW_DETAIL_SLIDES: ("deck", "all slides were read at low image detail"),
+    MINI_MERGE: ("merge", "an LLM merge would use gpt-4o-mini"),
+    DEFER_EVALUATION: ("evaluation", "the evaluation was deferred"),
+}
+
+# Each level adds the next degradation, least quality loss first. MINI_MERGE has
+# no level of its own: the planned path is the rule-based pre-merge, so it only
+# saves time on the fallback LLM merge and would project the same as the level
+# before it. It rides along with SKIP_COMPETITION.
+DEGRADATION_LEVELS: List[Tuple[str, ...]] = [
+    (),
+    (SKIP_MARKET_SIZE,),
+    (SKIP_MARKET_SIZE, SKIP_COMPETITION, MINI_MERGE),
+    (SKIP_MARKET_SIZE, SKIP_COMPETITION, MINI_MERGE, LOW_DETAIL_SLIDES),
+    (SKIP_MARKET_SIZE, SKIP_COMPETITION, MINI_MERGE, LOW_DETAIL_SLIDES, DEFER_EVALUATION),
+]
+
+EXECUTION_PLAN_FILE = "execution_plan.json"
+
+
+def degradation_note(degradations: Iterable[str], stages: Optional[Iterable[str]] = None) -> str:
+    """
+    Markdown note listing the degradations that affect an output.
+
+    Args:
+        degradations: Applied degradation names
+        stages: Stages the output depends on (None = all)
+
+    Returns:
+        Blockquote followed by a blank line, or "" when nothing applies
+    """
+    wanted = set(stages) if stages is not None else None
+    notes = [
+        DEGRADATIONS[name][1]
+        for name in degradations
+        if name in DEGRADATIONS and (wanted is None or DEGRADATIONS[name][0] in wanted)
+    ]
+    if not notes:
+        return ""
+    return f"> ⚠️ **Deadline mode:** {'; '.join(notes)}.\n\n"
+
+
+def write_execution_plan(output_dir: str, company_name: str, degradations: Iterable[str], reason: str = "") -> str:
+    """
+    Record the degradations applied to a company.
+
+    Args:
+        output_dir: Company output directory
+        company_name: Company name (needed to run deferred stages later)
+        degradations: Applied degradation names
+        reason: Why they were applied
+
+    Returns:
+        Path of execution_plan.json
+    """
+    degradations = list(degradations)
+    plan = {
+        "company": company_name,
+        "degradations": degradations,
+        "deferred": ["evaluation"] if DEFER_EVALUATION in degradations else [],
+        "reason": reason,
+        "planned_at": time.time(),
+    }
+    path = os.path.join(output_dir, EXECUTION_PLAN_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+    return path
+
+
+def read_execution_plan(output_dir: str) -> Optional[dict]:
+    """execution_plan.json of a company folder (None if the company ran in full)."""
+    path = os.path.join(output_dir, EXECUTION_PLAN_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def mark_completed(output_dir: str, stage: str) -> None:
+    """Remove a stage from the deferred list once it has run."""
+    plan = read_execution_plan(output_dir)
+    if plan is None or stage not in plan.get("deferred", []):
+        return
+    plan["deferred"].remove(stage)
+    plan.setdefault("completed_later", []).append(stage)
+    with open(os.path.join(output_dir, EXECUTION_PLAN_FILE), "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
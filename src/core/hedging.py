@@ -0,0 +1,177 @@
+"""
+Hedged LLM requests.
+
+A few vision and merge calls hang for minutes before they succeed and
+dominate per-company tail latency. With hedging on for a stage, a call that
+has not answered by that stage's latency percentile (measured per node over
+recent calls) gets a duplicate request. The first reply that completes
+without error wins and the other request is cancelled, which closes its
+HTTP connection.
+
+Hedges are capped at ``HEDGE_MAX_EXTRA`` of all hedgeable calls (plus a
+small burst), so the extra spend stays bounded even when the provider is
+slow across the board. Fired, won and skipped hedges are recorded as
+telemetry events (``hedge.*``).
+
+Hedging is opt-in: ``PITCHPANDA_HEDGE=deck,merge`` (or ``all``). Calls are
+then made through the async client on one background event loop so the
+losing request can actually be cancelled.
+"""
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from langchain_core.runnables import Runnable
+
+from .telemetry import current_span, record_event
+
+
+HEDGE_STAGES = {
+    s.strip() for s in os.environ.get("PITCHPANDA_HEDGE", "").lower().split(",") if s.strip()
+}
+# Hedge once a call is slower than this percentile of recent calls of the same node
+HEDGE_PERCENTILES: Dict[str, float] = {"web": 95, "deck": 90, "merge": 90, "evaluation": 95}
+# Deadline (seconds) until enough latencies have been observed for a node
+HEDGE_DEFAULT_DEADLINES: Dict[str, float] = {"web": 20.0, "deck": 90.0, "merge": 60.0, "evaluation": 45.0}
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 200
+# Extra requests allowed, as a share of hedgeable calls, plus a burst for the first calls
+HEDGE_MAX_EXTRA = 0.05
+HEDGE_BURST = 2
+
+
+def hedging_enabled(stage: Optional[str] = None) -> bool:
+    """True if hedging is on for the stage (or for any stage when ``stage`` is None)."""
+    if stage is None:
+        return bool(HEDGE_STAGES)
+    return bool(HEDGE_STAGES & {stage, "all"})
+
+
+class _HedgeState:
+    """Latency windows per node and the hedge budget, shared by every hedged model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.calls = 0
+        self.hedges = 0
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=HEDGE_WINDOW)).append(seconds)
+
+    def deadline(self, stage: str, key: str) -> float:
+        with self._lock:
+            window = sorted(self._latencies.get(key, ()))
+        if len(window) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DEADLINES.get(stage, 60.0)
+        rank = max(1, math.ceil(HEDGE_PERCENTILES.get(stage, 95) / 100 * len(window)))
+        return window[rank - 1]
+
+    def count_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def try_hedge(self) -> bool:
+        """Take one hedge from the budget (False when exhausted)."""
+        with self._lock:
+            if self.hedges >= HEDGE_BURST + HEDGE_MAX_EXTRA * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+
+hedge_state = _HedgeState()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def hedge_loop() -> asyncio.AbstractEventLoop:
+    """Background event loop that runs every hedged call (started on first use)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-hedge", daemon=True).start()
+        return _loop
+
+
+def close_on_hedge_loop(client) -> None:
+    """Close an async HTTP client on the loop that owns its connections (no-op if never used)."""
+    with _loop_lock:
+        loop = _loop
+    if loop is not None:
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+async def in_context(ctx: contextvars.Context, coro_fn, *args, **kwargs):
+    """Await ``coro_fn`` on the hedge loop with the caller's context variables."""
+    # Tasks copy the loop thread's context; carry the caller's span (and deadline) over
+    for var, value in ctx.items():
+        var.set(value)
+    return await coro_fn(*args, **kwargs)
+
+
+class HedgedChatModel(Runnable):
+    """
+    Wraps a chat model; calls from hedged stages race a duplicate after the deadline.
+
+    Supports ``invoke`` and ``bind`` like the wrapped model, which is all the
+    graphs use.
+    """
+
+    def __init__(self, client: Runnable, model: str):
+        self.client = client
+        self.model = model
+
+    def invoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
+        span = current_span()
+        if span is None or not hedging_enabled(span.stage):
+            return self.client.invoke(input, config, **kwargs)
+        future = asyncio.run_coroutine_threadsafe(
+            in_context(contextvars.copy_context(), self._race, span.stage, f"{span.stage}.{span.node}",
+                        input, config, kwargs),
+            hedge_loop(),
+        )
+        return future.result()
+
+    async def _race(self, stage: str, key: str, input: Any, config: Optional[dict], kwargs: dict) -> Any:
+        hedge_state.count_call()
+        deadline = hedge_state.deadline(stage, key)
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self.client.ainvoke(input, config, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=deadline)
+        if done:
+            hedge_state.record(key, time.monotonic() - started)
+            return primary.result()
+
+        if not hedge_state.try_hedge():
+            record_event("hedge.budget_exhausted")
+            result = await primary
+            hedge_state.record(key, time.monotonic() - started)
+            return result
+
+        record_event("hedge.fired")
+        print(f"  Hedging {key} ({self.model}) after {deadline:.1f}s")
+        backup = asyncio.ensure_future(self.client.ainvoke(input, config, **kwargs))
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        record_event("hedge.won" if task is backup else "hedge.primary_won")
+                        hedge_state.record(key, time.monotonic() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,256 @@
+"""
+Shared LLM client registry.
+
+Every graph gets its chat models from here instead of constructing
+``ChatOpenAI`` inline. Clients are keyed by (model, temperature), share a
+single keep-alive HTTP connection pool and report usage to telemetry.
+When request hedging is enabled (``PITCHPANDA_HEDGE``, see ``hedging``) the
+clients handed out are wrapped in ``HedgedChatModel``. Calls made under a
+stage or company deadline (see ``deadlines``) are cancelled when it passes
+(``DeadlineChatModel``). Identical requests in
+flight at the same time are coalesced into one (``CoalescedChatModel``, see
+``singleflight``).
+Structured-output runnables use strict JSON-schema output (see
+``structured``) and are built once per (schema, model, temperature) so the
+schema conversion is not repeated for every company.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+
+import httpx
+from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+from .deadlines import DeadlineExceeded, check_deadline, current_deadline
+from .hedging import HedgedChatModel, close_on_hedge_loop, hedge_loop, hedging_enabled, in_context
+from .singleflight import SingleFlight, fingerprint
+from .structured import strict_response_format, parse_strict_reply
+from .telemetry import telemetry_callback
+
+
+# Load environment (OPENAI_API_KEY) before the first client is created
+load_dotenv()
+
+# Connection pool shared by every client handed out by the registry
+POOL_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=120.0,
+)
+# Vision and merge calls can legitimately take minutes; only fail fast on connect
+REQUEST_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_lock = threading.RLock()
+_http_client: httpx.Client | None = None
+# Only used by hedged calls, all of which run on the hedging event loop
+_async_http_client: httpx.AsyncClient | None = None
+_models: Dict[Tuple[str, float], BaseChatModel] = {}
+_structured: Dict[Tuple[Type[BaseModel], str, float, Tuple[str, ...]], Runnable] = {}
+# Optional override used by benchmarks to swap in a fake model
+_model_factory: Optional[Callable[[str, float], BaseChatModel]] = None
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the process-wide pooled HTTP client used by all chat models.
+
+    Returns:
+        Shared httpx.Client with keep-alive connections
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide pooled async HTTP client (used by hedged calls).
+
+    Returns:
+        Shared httpx.AsyncClient with keep-alive connections
+    """
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None or _async_http_client.is_closed:
+            _async_http_client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+        return _async_http_client
+
+
+_llm_flight = SingleFlight("llm")
+
+
+class DeadlineChatModel(Runnable):
+    """
+    Wraps a chat model so calls stop at the current stage/company deadline.
+
+    Without a deadline the call is passed through unchanged. Under one, it
+    runs through the async client on the hedging event loop; when the
+    deadline passes, the request task is cancelled (closing its HTTP
+    connection) and ``DeadlineExceeded`` is raised in the caller.
+    """
+
+    def __init__(self, client: Runnable):
+        self.client = client
+
+    def invoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
+        deadline = current_deadline()
+        if deadline is None:
+            return self.client.invoke(input, config, **kwargs)
+        check_deadline()
+        future = asyncio.run_coroutine_threadsafe(
+            in_context(contextvars.copy_context(), self.ainvoke, input, config, **kwargs),
+            hedge_loop(),
+        )
+        try:
+            return future.result(timeout=deadline.remaining())
+        except DeadlineExceeded:
+            raise
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise deadline.error() from None
+
+    async def ainvoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
+        deadline = current_deadline()
+        if deadline is None:
+            return await self.client.ainvoke(input, config, **kwargs)
+        try:
+            return await asyncio.wait_for(self.client.ainvoke(input, config, **kwargs), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise deadline.error() from None
+
+
+class CoalescedChatModel(Runnable):
+    """
+    Wraps a chat model so concurrent identical requests share one call.
+
+    The fingerprint covers the model, temperature, every message and the
+    call's keyword arguments (e.g. ``response_format``).
+    """
+
+    def __init__(self, client: Runnable, model: str, temperature: float):
+        self.client = client
+        self.model = model
+        self.temperature = temperature
+
+    def _key(self, input: Any, kwargs: dict) -> str:
+        if isinstance(input, PromptValue):
+            messages = input.to_messages()
+        elif isinstance(input, str):
+            messages = convert_to_messages([input])
+        else:
+            messages = convert_to_messages(input)
+        return fingerprint(
+            self.model, self.temperature,
+            [(m.type, m.content) for m in messages],
+            kwargs,
+        )
+
+    def invoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
+        return _llm_flight.do(self._key(input, kwargs), lambda: self.client.invoke(input, config, **kwargs))
+
+
+def get_chat_model(model: str = "gpt-4o", temperature: float = 0.0) -> BaseChatModel:
+    """
+    Get a pooled chat model client.
+
+    Args:
+        model: OpenAI model name
+        temperature: Sampling temperature
+
+    Returns:
+        Cached ChatOpenAI instance sharing the registry connection pool,
+        wrapped for deadlines, request coalescing (and hedging, when enabled)
+    """
+    key = (model, float(temperature))
+    with _lock:
+        client = _models.get(key)
+        if client is None:
+            if _model_factory is not None:
+                client = _model_factory(model, temperature)
+            else:
+                client = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    http_client=get_http_client(),
+                    http_async_client=get_async_http_client(),
+                    callbacks=[telemetry_callback],
+                )
+            client = DeadlineChatModel(client)
+            if hedging_enabled():
+                client = HedgedChatModel(client, model)
+            client = CoalescedChatModel(client, model, float(temperature))
+            _models[key] = client
+        return client
+
+
+def get_structured_model(
+    schema: Type[BaseModel],
+    model: str = "gpt-4o",
+    temperature: float = 0.0,
+    exclude: Iterable[str] = (),
+) -> Runnable:
+    """
+    Get a cached strict structured-output runnable for a Pydantic schema.
+
+    The reply is constrained server-side to the schema, so there is no
+    free-form JSON to repair and no parse-failure retry.
+
+    Args:
+        schema: Pydantic model the response is parsed into
+        model: OpenAI model name
+        temperature: Sampling temperature
+        exclude: Top-level fields left out of the schema (filled with defaults)
+
+    Returns:
+        Runnable returning ``schema`` instances
+    """
+    exclude = tuple(sorted(exclude))
+    key = (schema, model, float(temperature), exclude)
+    with _lock:
+        runnable = _structured.get(key)
+        if runnable is None:
+            chat = get_chat_model(model, temperature).bind(
+                response_format=strict_response_format(schema, exclude)
+            )
+            runnable = chat | RunnableLambda(
+                lambda message: schema.model_validate(parse_strict_reply(message, schema))
+            )
+            _structured[key] = runnable
+        return runnable
+
+
+def set_model_factory(factory: Optional[Callable[[str, float], BaseChatModel]]) -> None:
+    """
+    Replace how chat models are constructed (``None`` restores ChatOpenAI).
+
+    Args:
+        factory: Callable taking (model, temperature) and returning a chat model
+    """
+    global _model_factory
+    reset_registry()
+    with _lock:
+        _model_factory = factory
+
+
+def reset_registry() -> None:
+    """Drop all cached clients and close the shared connection pool."""
+    global _http_client, _async_http_client
+    with _lock:
+        _models.clear()
+        _structured.clear()
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        if _async_http_client is not None:
+            close_on_hedge_loop(_async_http_client)
+        _async_http_client = None
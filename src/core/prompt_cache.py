@@ -0,0 +1,86 @@
+"""
+Prompt layout for provider-side prompt caching.
+
+OpenAI automatically caches the longest previously seen prompt prefix (for
+prompts over 1024 tokens, in 128-token steps). To benefit, every stage sends
+its long static instructions first, as the system message, and puts
+everything that varies per company (name, URL, scraped text, slide images)
+in the messages after it. One interpolated company name near the top is
+enough to make the whole prompt a cache miss.
+
+``cacheable_prompt`` enforces that layout when a template is built, and the
+telemetry callback uses ``prefix_digest`` to flag nodes whose prefix drifts
+between calls.
+"""
+import hashlib
+from typing import List, Optional
+
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+
+def cacheable_prompt(system: str, human: str) -> ChatPromptTemplate:
+    """
+    Build a [static system, variable human] chat template.
+
+    Args:
+        system: Static instructions (braces escaped as ``{{ }}``, no variables)
+        human: Per-call part with the template variables
+
+    Returns:
+        ChatPromptTemplate
+
+    Raises:
+        ValueError: If the system part contains template variables
+    """
+    static = ChatPromptTemplate.from_messages([("system", system)])
+    if static.input_variables:
+        raise ValueError(
+            f"Static prompt prefix must not contain variables, found: {static.input_variables}"
+        )
+    return ChatPromptTemplate.from_messages([("system", system), ("human", human)])
+
+
+def shared_prefix_prompt(system: str, context: str, task: str) -> ChatPromptTemplate:
+    """
+    Build a [static system, shared context, per-call task] chat template.
+
+    For fanning one company's context out to several calls (e.g. rubrics):
+    the context message is identical across the calls, so after the first
+    one the provider serves system + context from its prompt cache and only
+    the short task message is new.
+
+    Args:
+        system: Static instructions (braces escaped as ``{{ }}``, no variables)
+        context: Company context template, the same for every call of the fan-out
+        task: Call-specific instructions template
+
+    Returns:
+        ChatPromptTemplate
+
+    Raises:
+        ValueError: If the system part contains template variables
+    """
+    cacheable_prompt(system, context)  # validates the static part
+    return ChatPromptTemplate.from_messages([("system", system), ("human", context), ("human", task)])
+
+
+def static_prefix(messages: List[BaseMessage]) -> str:
+    """Text of the leading system messages (the part meant to be cached)."""
+    parts = []
+    for message in messages:
+        if not isinstance(message, SystemMessage):
+            break
+        if isinstance(message.content, str):
+            parts.append(message.content)
+        else:
+            parts.extend(p.get("text", "") for p in message.content if isinstance(p, dict))
+    return "\n".join(parts)
+
+
+def prefix_digest(messages: List[BaseMessage]) -> Optional[str]:
+    """Stable hash of the static prefix, or None if the call has no system prefix."""
+    prefix = static_prefix(messages)
+    if not prefix:
+        return None
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
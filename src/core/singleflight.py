@@ -0,0 +1,104 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+The same startup often appears twice in a batch (added by two analysts) and
+reruns overlap with scheduled runs, so identical homepage fetches and LLM
+prompts end up running at the same time. A ``SingleFlight`` group runs only
+the first call for a fingerprint; concurrent callers with the same
+fingerprint wait for it and share its result (or its exception). Nothing is
+cached after the call returns, so later calls always run again.
+
+Followers record ``singleflight.<group>.shared`` on their telemetry span;
+usage is only counted once, on the leader's span. Followers wait no longer
+than their own deadline (see ``deadlines``), and a follower whose leader hit
+the leader's deadline runs the call itself. Set
+``PITCHPANDA_SINGLEFLIGHT=0`` to disable coalescing.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .deadlines import DeadlineExceeded, check_deadline, remaining
+from .telemetry import record_event
+
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_ENABLED = os.environ.get("PITCHPANDA_SINGLEFLIGHT", "1") != "0"
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Stable hash of a request description.
+
+    Args:
+        parts: JSON-serializable pieces (non-serializable values use ``str``)
+
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` unless a call with the same key is already in flight.
+
+        Args:
+            key: Request fingerprint
+            fn: The request
+
+        Returns:
+            ``fn``'s result, possibly from another thread's call
+
+        Raises:
+            DeadlineExceeded: The caller's deadline passed while waiting
+            Exception: Whatever the shared call raised
+        """
+        if not SINGLEFLIGHT_ENABLED:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            record_event(f"singleflight.{self.name}.shared")
+            call.done.wait(remaining())
+            check_deadline()
+            if isinstance(call.error, DeadlineExceeded):
+                # The leader ran out of its own time; ours has not
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
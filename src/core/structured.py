@@ -0,0 +1,207 @@
+"""
+Strict JSON-schema structured output for Pydantic models.
+
+OpenAI's strict ``json_schema`` response format guarantees the reply parses
+and matches the schema, but only accepts a subset of JSON Schema: every
+property must be listed in ``required``, objects must set
+``additionalProperties: false`` and free-form maps are not allowed. This
+module converts our Pydantic schemas into that subset and back:
+
+- optional fields (default ``None``) stay required but nullable
+- fields with a non-None default (lists, flags, labels) become required,
+  so the model always fills them in
+- ``Dict[str, X]`` becomes an array of ``{"key": ..., "value": X}`` entries
+  and is folded back into a dict when parsing
+"""
+import json
+import threading
+import types
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+
+# JSON-schema keywords dropped from the generated schema (not allowed or useless in strict mode)
+_DROPPED_KEYWORDS = ("title", "default")
+
+_lock = threading.Lock()
+# Schema name -> model, so offline fakes can answer a response_format request
+_registered: Dict[str, Type[BaseModel]] = {}
+
+
+def _strictify(node: Any) -> Any:
+    if isinstance(node, list):
+        return [_strictify(n) for n in node]
+    if not isinstance(node, dict):
+        return node
+
+    out = {}
+    for key, value in node.items():
+        if key in _DROPPED_KEYWORDS:
+            continue
+        if key in ("properties", "$defs"):
+            # Keys here are field/definition names, not keywords
+            out[key] = {name: _strictify(sub) for name, sub in value.items()}
+        else:
+            out[key] = _strictify(value)
+
+    if out.get("type") == "object":
+        extra = out.get("additionalProperties")
+        if "properties" not in out and isinstance(extra, dict):
+            # Free-form map -> list of key/value entries
+            entries = {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"key": {"type": "string"}, "value": extra},
+                    "required": ["key", "value"],
+                    "additionalProperties": False,
+                },
+            }
+            if "description" in out:
+                entries["description"] = out["description"]
+            return entries
+        out["required"] = list(out.get("properties", {}))
+        out["additionalProperties"] = False
+    return out
+
+
+def _refs(node: Any, found: set) -> None:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            found.add(ref.rsplit("/", 1)[-1])
+        for key, value in node.items():
+            if key != "$defs":
+                _refs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _refs(value, found)
+
+
+def _prune_defs(schema: Dict[str, Any]) -> None:
+    """Drop definitions only used by excluded fields."""
+    defs = schema.get("$defs")
+    if not defs:
+        return
+    used, pending = set(), set()
+    _refs(schema, pending)
+    while pending:
+        name = pending.pop()
+        if name in used or name not in defs:
+            continue
+        used.add(name)
+        _refs(defs[name], pending)
+    schema["$defs"] = {name: d for name, d in defs.items() if name in used}
+    if not schema["$defs"]:
+        del schema["$defs"]
+
+
+@lru_cache(maxsize=None)
+def _response_format(model: Type[BaseModel], exclude: Tuple[str, ...]) -> Dict[str, Any]:
+    schema = model.model_json_schema()
+    for name in exclude:
+        schema.get("properties", {}).pop(name, None)
+    _prune_defs(schema)
+    with _lock:
+        _registered[model.__name__] = model
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "strict": True, "schema": _strictify(schema)},
+    }
+
+
+def strict_response_format(model: Type[BaseModel], exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Build an OpenAI strict ``response_format`` for a Pydantic model.
+
+    Args:
+        model: Schema the reply must match
+        exclude: Top-level fields the model should not produce (filled in by code)
+
+    Returns:
+        ``response_format`` dict for the chat completions API
+    """
+    return _response_format(model, tuple(sorted(exclude)))
+
+
+def registered_model(response_format: Dict[str, Any]) -> Type[BaseModel] | None:
+    """Model a strict response_format was generated from (None if unknown)."""
+    name = ((response_format or {}).get("json_schema") or {}).get("name")
+    with _lock:
+        return _registered.get(name)
+
+
+def _unwrap(annotation, value: Any) -> Any:
+    """Undo the strict-mode encoding for one value of the given annotation."""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        non_null = [a for a in get_args(annotation) if a is not type(None)]
+        return _unwrap(non_null[0], value) if len(non_null) == 1 and value is not None else value
+
+    if origin in (dict, Dict):
+        _, item = get_args(annotation) or (str, Any)
+        if isinstance(value, list):
+            value = {
+                entry["key"]: entry.get("value")
+                for entry in value
+                if isinstance(entry, dict) and "key" in entry
+            }
+        if isinstance(value, dict):
+            return {k: _unwrap(item, v) for k, v in value.items()}
+        return value
+
+    if origin is list:
+        (item,) = get_args(annotation) or (Any,)
+        return [_unwrap(item, v) for v in value] if isinstance(value, list) else value
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and isinstance(value, dict):
+        return from_strict(annotation, value)
+    return value
+
+
+def from_strict(model: Type[BaseModel], data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a strict-mode reply back into the model's native shape (not validated).
+
+    Key/value entry arrays become dicts again. Replies that are already in
+    the native shape pass through unchanged.
+
+    Args:
+        model: Schema the reply was generated for
+        data: Parsed JSON reply
+
+    Returns:
+        Dict ready for ``model.model_validate`` or deck coercion
+    """
+    result = dict(data)
+    for name, info in model.model_fields.items():
+        if name in result:
+            result[name] = _unwrap(info.annotation, result[name])
+    return result
+
+
+def parse_strict_reply(message, model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Decode a chat reply produced with ``strict_response_format``.
+
+    Args:
+        message: AIMessage returned by the chat model
+        model: Schema the reply was generated for
+
+    Returns:
+        Native-shape dict (see ``from_strict``)
+
+    Raises:
+        ValueError: If the model refused or the reply was cut off
+    """
+    refusal = (getattr(message, "additional_kwargs", None) or {}).get("refusal")
+    if refusal:
+        raise ValueError(f"Model refused to produce {model.__name__}: {refusal}")
+    try:
+        data = json.loads(message.content)
+    except (TypeError, ValueError) as e:
+        finish = (getattr(message, "response_metadata", None) or {}).get("finish_reason")
+        raise ValueError(f"Unparseable {model.__name__} reply (finish_reason={finish}): {e}")
+    return from_strict(model, data)
@@ -0,0 +1,549 @@
+"""
+Per-stage tracing, token accounting and run reports.
+
+Every graph node is wrapped with ``traced_node`` which opens a span for the
+duration of the node. LLM clients from the registry carry a
+``TelemetryCallback`` that attributes token usage, image tokens and cost to
+whichever span is currently open. Spans are appended as JSONL to
+``<company_dir>/trace.jsonl`` and aggregated into an end-of-run report.
+"""
+import base64
+import functools
+import json
+import math
+import os
+import struct
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from pydantic import BaseModel, Field
+
+from .deadlines import DeadlineExceeded, check_deadline
+from .prompt_cache import prefix_digest
+
+
+# USD per 1M tokens: (input, cached input, output)
+PRICING: Dict[str, tuple] = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+}
+
+
+class Span(BaseModel):
+    """Timing and usage for one graph node execution."""
+    run_id: str
+    company: Optional[str] = None
+    stage: str
+    node: str
+    started_at: float
+    wall_ms: float = 0.0
+    queue_wait_ms: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    image_tokens: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    cost_usd: float = 0.0
+    events: Dict[str, int] = Field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class CompanyTrace(BaseModel):
+    """Spans collected for one company during a run."""
+    name: str
+    output_dir: Optional[str] = None
+    ready_at: float
+    spans: List[Span] = Field(default_factory=list)
+    timed_out: List[str] = Field(default_factory=list)  # stages cut off by a deadline ("company" for the whole run)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(s.cost_usd for s in self.spans)
+
+    @property
+    def wall_ms(self) -> float:
+        """Time covered by the company's spans; nested and parallel spans count once."""
+        total = 0.0
+        covered_until = None
+        for start, end in sorted((s.started_at, s.started_at + s.wall_ms / 1000) for s in self.spans):
+            if covered_until is None or start > covered_until:
+                total += end - start
+                covered_until = end
+            elif end > covered_until:
+                total += end - covered_until
+                covered_until = end
+        return total * 1000
+
+
+_current_company: ContextVar[Optional[CompanyTrace]] = ContextVar("pp_company", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("pp_span", default=None)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """
+    Estimate dollar cost of one completion.
+
+    Args:
+        model: Model name as reported by the API (dated suffixes are fine)
+        prompt_tokens: Total input tokens including cached ones
+        completion_tokens: Output tokens
+        cached_tokens: Input tokens served from the provider prompt cache
+
+    Returns:
+        Cost in USD (0.0 for unknown models)
+    """
+    # "gpt-4o-mini-2024-07-18" -> longest matching prefix
+    prices = None
+    for name in sorted(PRICING, key=len, reverse=True):
+        if (model or "").startswith(name):
+            prices = PRICING[name]
+            break
+    if prices is None:
+        return 0.0
+    input_price, cached_price, output_price = prices
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+def _png_size(data_url: str) -> Optional[tuple]:
+    """Read width/height from the IHDR chunk of a base64 PNG data URL."""
+    try:
+        b64 = data_url.split(",", 1)[1]
+        head = base64.b64decode(b64[:44])
+        if head[:8] != b"\x89PNG\r\n\x1a\n":
+            return None
+        return struct.unpack(">II", head[16:24])
+    except Exception:
+        return None
+
+
+def estimate_image_tokens(width: int, height: int, detail: str = "high") -> int:
+    """
+    Estimate OpenAI vision input tokens for one image.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        detail: "low" or "high"
+
+    Returns:
+        Estimated token count
+    """
+    if detail == "low":
+        return 85
+    # Fit within 2048x2048, then scale shortest side down to 768
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return 85 + 170 * tiles
+
+
+def _message_image_tokens(messages) -> int:
+    """Sum estimated image tokens over LangChain message content parts."""
+    total = 0
+    for message in messages:
+        content = getattr(message, "content", None)
+        if not isinstance(content, list):
+            continue
+        for part in content:
+            if not isinstance(part, dict) or part.get("type") != "image_url":
+                continue
+            image_url = part.get("image_url") or {}
+            detail = image_url.get("detail", "auto")
+            if detail == "low":
+                total += 85
+                continue
+            size = _png_size(image_url.get("url", ""))
+            total += estimate_image_tokens(*size) if size else 765
+    return total
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Tracer:
+    """Collects spans for a run and writes per-company JSONL and a summary."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.run_id = uuid.uuid4().hex[:12]
+        self.companies: List[CompanyTrace] = []
+        self.orphan_spans: List[Span] = []
+
+    def start_run(self) -> str:
+        """Reset collected data and start a new run id."""
+        with self._lock:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.companies = []
+            self.orphan_spans = []
+        return self.run_id
+
+    @contextmanager
+    def company(self, name: str, output_dir: Optional[str] = None, enqueued_at: Optional[float] = None):
+        """
+        Attribute all spans opened inside the block to a company.
+
+        Args:
+            name: Company name
+            output_dir: Company output directory (trace.jsonl goes here)
+            enqueued_at: When the company was queued, for queue-wait accounting
+        """
+        trace = CompanyTrace(name=name, output_dir=output_dir, ready_at=enqueued_at or time.time())
+        if output_dir:
+            trace_path = os.path.join(output_dir, "trace.jsonl")
+            if os.path.exists(trace_path):
+                os.remove(trace_path)
+        with self._lock:
+            self.companies.append(trace)
+        token = _current_company.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_company.reset(token)
+
+    @contextmanager
+    def span(self, stage: str, node: str):
+        """Time a node and collect usage reported while it runs."""
+        company = _current_company.get()
+        start = time.time()
+        span = Span(
+            run_id=self.run_id,
+            company=company.name if company else None,
+            stage=stage,
+            node=node,
+            started_at=start,
+            queue_wait_ms=max(0.0, (start - company.ready_at) * 1000) if company else 0.0,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            _current_span.reset(token)
+            end = time.time()
+            span.wall_ms = (end - start) * 1000
+            self._finish(span, company, end)
+
+    def _finish(self, span: Span, company: Optional[CompanyTrace], end: float) -> None:
+        with self._lock:
+            if company is None:
+                self.orphan_spans.append(span)
+                return
+            company.spans.append(span)
+            company.ready_at = end
+            if company.output_dir:
+                with open(os.path.join(company.output_dir, "trace.jsonl"), "a", encoding="utf-8") as f:
+                    f.write(span.model_dump_json() + "\n")
+
+    def all_spans(self) -> List[Span]:
+        with self._lock:
+            return [s for c in self.companies for s in c.spans] + list(self.orphan_spans)
+
+    def summary_rows(self) -> List[Dict[str, Any]]:
+        """Aggregate spans per stage/node."""
+        groups: Dict[str, List[Span]] = {}
+        for span in self.all_spans():
+            groups.setdefault(f"{span.stage}.{span.node}", []).append(span)
+        rows = []
+        for key, spans in sorted(groups.items()):
+            walls = [s.wall_ms for s in spans]
+            rows.append({
+                "node": key,
+                "count": len(spans),
+                "p50_ms": _percentile(walls, 50),
+                "p95_ms": _percentile(walls, 95),
+                "queue_wait_ms": sum(s.queue_wait_ms for s in spans) / len(spans),
+                "prompt_tokens": sum(s.prompt_tokens for s in spans),
+                "completion_tokens": sum(s.completion_tokens for s in spans),
+                "image_tokens": sum(s.image_tokens for s in spans),
+                "retries": sum(s.retries for s in spans),
+                "cache_hits": sum(s.cache_hits for s in spans),
+                "errors": sum(1 for s in spans if s.error),
+                "cost_usd": sum(s.cost_usd for s in spans),
+            })
+        return rows
+
+    def cache_rows(self) -> List[Dict[str, Any]]:
+        """Prompt-cache hit ratio per stage."""
+        by_stage: Dict[str, List[Span]] = {}
+        for span in self.all_spans():
+            by_stage.setdefault(span.stage, []).append(span)
+        rows = []
+        for stage, spans in sorted(by_stage.items()):
+            prompt = sum(s.prompt_tokens for s in spans)
+            cached = sum(s.cached_tokens for s in spans)
+            if not prompt:
+                continue
+            rows.append({
+                "stage": stage,
+                "prompt_tokens": prompt,
+                "cached_tokens": cached,
+                "cached_ratio": cached / prompt,
+                "prefix_drifts": sum(s.events.get("prompt_prefix.drift", 0) for s in spans),
+            })
+        return rows
+
+    def render_report(self, top_n: int = 10) -> str:
+        """Render the run summary as markdown."""
+        spans = self.all_spans()
+        lines = [f"# Run Report ({self.run_id})", ""]
+        lines.append(f"**Companies:** {len(self.companies)}  ")
+        lines.append(f"**Spans:** {len(spans)}  ")
+        lines.append(f"**Total cost:** ${sum(s.cost_usd for s in spans):.4f}")
+        lines.append("")
+
+        lines.append("## Per-node latency and usage")
+        lines.append("")
+        lines.append("| Node | Count | p50 (s) | p95 (s) | Avg wait (s) | Prompt tok | Completion tok | Image tok | Retries | Cache hits | Errors | Cost ($) |")
+        lines.append("|---|---|---|---|---|---|---|---|---|---|---|---|")
+        for r in self.summary_rows():
+            lines.append(
+                f"| {r['node']} | {r['count']} | {r['p50_ms'] / 1000:.2f} | {r['p95_ms'] / 1000:.2f} "
+                f"| {r['queue_wait_ms'] / 1000:.2f} | {r['prompt_tokens']} | {r['completion_tokens']} "
+                f"| {r['image_tokens']} | {r['retries']} | {r['cache_hits']} | {r['errors']} | {r['cost_usd']:.4f} |"
+            )
+        lines.append("")
+
+        with self._lock:
+            companies = sorted(self.companies, key=lambda c: c.cost_usd, reverse=True)[:top_n]
+        lines.append(f"## Top {len(companies)} most expensive companies")
+        lines.append("")
+        lines.append("| Company | Cost ($) | Wall (s) | Nodes |")
+        lines.append("|---|---|---|---|")
+        for c in companies:
+            lines.append(f"| {c.name} | {c.cost_usd:.4f} | {c.wall_ms / 1000:.1f} | {len(c.spans)} |")
+        lines.append("")
+
+        with self._lock:
+            timed_out = [c for c in self.companies if c.timed_out]
+        if timed_out:
+            lines.append("## Timeouts")
+            lines.append("")
+            lines.append("| Company | Timed out |")
+            lines.append("|---|---|")
+            for c in timed_out:
+                lines.append(f"| {c.name} | {', '.join(c.timed_out)} |")
+            lines.append("")
+
+        events: Dict[str, int] = {}
+        for span in spans:
+            for name, value in span.events.items():
+                events[name] = events.get(name, 0) + value
+        lines.append("## Prompt caching")
+        lines.append("")
+        lines.append("| Stage | Prompt tok | Cached tok | Cached % | Prefix drifts |")
+        lines.append("|---|---|---|---|---|")
+        for r in self.cache_rows():
+            lines.append(
+                f"| {r['stage']} | {r['prompt_tokens']} | {r['cached_tokens']} "
+                f"| {r['cached_ratio']:.0%} | {r['prefix_drifts']} |"
+            )
+        lines.append("")
+
+        gate = {k.split(".", 1)[1]: v for k, v in events.items() if k.startswith("fetch_gate.")}
+        if gate:
+            total = sum(gate.values())
+            skipped = total - gate.get("ok", 0)
+            lines.append("## Web fetch gate")
+            lines.append("")
+            lines.append(f"**Skip rate:** {skipped}/{total} ({skipped / total:.0%}) of sites skipped full web analysis  ")
+            lines.append(", ".join(f"{name}: {value}" for name, value in sorted(gate.items())))
+            lines.append("")
+
+        baseline = events.get("slide_triage.baseline_image_tokens", 0)
+        if baseline:
+            sent = events.get("slide_triage.sent_image_tokens", 0)
+            decks = events.get("slide_triage.decks", 0)
+            lines.append("## Slide triage")
+            lines.append("")
+            lines.append(
+                f"**Image tokens:** {sent} sent vs {baseline} at all-high detail over {decks} deck(s) "
+                f"({(baseline - sent) / baseline:.0%} saved)"
+            )
+            lines.append("")
+
+        cascades: Dict[str, Dict[str, int]] = {}
+        for name, value in events.items():
+            if name.startswith("cascade."):
+                _, stage, kind = name.split(".", 2)
+                cascades.setdefault(stage, {})[kind] = value
+        if cascades:
+            lines.append("## Model cascade")
+            lines.append("")
+            lines.append("| Stage | Calls | Escalated | Escalation % | Reasons | Accepted by model |")
+            lines.append("|---|---|---|---|---|---|")
+            for stage, counts in sorted(cascades.items()):
+                accepted = {k.split(".", 1)[1]: v for k, v in counts.items() if k.startswith("accepted.")}
+                reasons = {k.split(".", 1)[1]: v for k, v in counts.items() if k.startswith("escalated.")}
+                calls = sum(accepted.values())
+                escalated = sum(reasons.values())
+                lines.append(
+                    f"| {stage} | {calls} | {escalated} | {escalated / calls if calls else 0:.0%} "
+                    f"| {', '.join(f'{k}: {v}' for k, v in sorted(reasons.items())) or '-'} "
+                    f"| {', '.join(f'{k}: {v}' for k, v in sorted(accepted.items()))} |"
+                )
+            lines.append("")
+
+        if events:
+            lines.append("## Events")
+            lines.append("")
+            for name, value in sorted(events.items()):
+                lines.append(f"- **{name}:** {value}")
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def write_report(self, path: str, top_n: int = 10) -> str:
+        """
+        Write the markdown run report.
+
+        Args:
+            path: Destination markdown file
+            top_n: Number of most expensive companies to list
+
+        Returns:
+            The rendered report
+        """
+        report = self.render_report(top_n=top_n)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+        return report
+
+
+# Process-wide tracer
+tracer = Tracer()
+
+
+def traced_node(stage: str, name: Optional[str] = None):
+    """
+    Decorator that wraps a graph node in a telemetry span.
+
+    The node is not started once the stage or company deadline has passed.
+    ``DeadlineExceeded`` raised in or before the node is recorded on the
+    span as a ``deadline.<scope>`` event.
+
+    Args:
+        stage: Pipeline stage ("web", "deck", "merge", "evaluation")
+        name: Node name (defaults to the function name)
+    """
+    def decorator(fn):
+        node_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            with tracer.span(stage, node_name):
+                try:
+                    check_deadline()
+                    return fn(state, *args, **kwargs)
+                except DeadlineExceeded as e:
+                    record_event(f"deadline.{e.scope}")
+                    raise
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Return the span currently open in this context, if any."""
+    return _current_span.get()
+
+
+def record_retry(n: int = 1) -> None:
+    """Count a retried request against the current span."""
+    span = _current_span.get()
+    if span is not None:
+        span.retries += n
+
+
+def record_cache_hit(n: int = 1) -> None:
+    """Count a cache hit against the current span."""
+    span = _current_span.get()
+    if span is not None:
+        span.cache_hits += n
+
+
+def record_timeout(stage: str) -> None:
+    """Note on the current company's trace that a stage (or "company") hit its deadline."""
+    company = _current_company.get()
+    if company is not None:
+        company.timed_out.append(stage)
+
+
+def record_event(name: str, n: int = 1) -> None:
+    """Increment a named counter on the current span."""
+    span = _current_span.get()
+    if span is not None:
+        span.events[name] = span.events.get(name, 0) + n
+
+
+class TelemetryCallback(BaseCallbackHandler):
+    """LangChain callback that attributes LLM usage to the current span."""
+
+    def __init__(self):
+        super().__init__()
+        self._prefix_lock = threading.Lock()
+        self._prefixes: Dict[str, str] = {}
+
+    def _check_prefix(self, span: Span, batch) -> None:
+        """Flag calls without a static prefix, or whose prefix changed for the same node."""
+        digest = prefix_digest(batch)
+        if digest is None:
+            span.events["prompt_prefix.missing"] = span.events.get("prompt_prefix.missing", 0) + 1
+            return
+        key = f"{span.stage}.{span.node}"
+        with self._prefix_lock:
+            previous = self._prefixes.setdefault(key, digest)
+        if previous != digest:
+            print(f"Prompt prefix drift in {key}: {previous} -> {digest} (prompt cache will miss)")
+            span.events["prompt_prefix.drift"] = span.events.get("prompt_prefix.drift", 0) + 1
+
+    def on_chat_model_start(self, serialized, messages, **kwargs) -> None:
+        span = _current_span.get()
+        if span is None:
+            return
+        for batch in messages:
+            span.image_tokens += _message_image_tokens(batch)
+            self._check_prefix(span, batch)
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        span = _current_span.get()
+        if span is None:
+            return
+        llm_output = response.llm_output or {}
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                if not usage:
+                    continue
+                prompt = usage.get("input_tokens", 0)
+                completion = usage.get("output_tokens", 0)
+                cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+                model = (message.response_metadata or {}).get("model_name") or llm_output.get("model_name", "")
+                span.llm_calls += 1
+                span.prompt_tokens += prompt
+                span.completion_tokens += completion
+                span.cached_tokens += cached
+                span.cost_usd += estimate_cost(model, prompt, completion, cached)
+
+    def on_retry(self, retry_state, **kwargs) -> None:
+        record_retry()
+
+
+telemetry_callback = TelemetryCallback()
@@ -0,0 +1,217 @@
+"""
+Schema-compiled coercion of raw vision-model JSON into DeckAnalysis.
+
+The vision model's JSON is close to the schema but routinely off in small
+ways: ``null`` where a list is expected, ``[]`` for an optional string, a
+list where one string is expected, stringified JSON, or a single bad item in
+an otherwise good list. Instead of repeatedly validating the whole document
+and salvaging field by field, a coercion plan is compiled once per model
+from its field annotations (list / optional / nested model / dict of lists)
+with a ``TypeAdapter`` per leaf field. Applying the plan is a single pass:
+every value is visited once, bad list items are dropped individually and a
+bad field falls back to its default.
+"""
+import json
+import types
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class _Invalid(Exception):
+    """Value cannot be coerced to the target shape."""
+
+
+class _Shape:
+    """Compiled description of one annotation."""
+    __slots__ = ("kind", "optional", "item", "plan", "adapter")
+
+    def __init__(self, kind: str, optional: bool = False, item: "_Shape" = None,
+                 plan: "ModelPlan" = None, adapter: TypeAdapter = None):
+        self.kind = kind  # "list" | "dict" | "model" | "str" | "leaf"
+        self.optional = optional
+        self.item = item
+        self.plan = plan
+        self.adapter = adapter
+
+
+def _compile_shape(annotation) -> _Shape:
+    optional = False
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = get_args(annotation)
+        non_null = [a for a in args if a is not type(None)]
+        optional = len(non_null) < len(args)
+        if len(non_null) == 1:
+            annotation = non_null[0]
+            origin = get_origin(annotation)
+
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (Any,)
+        return _Shape("list", optional, item=_compile_shape(item))
+    if origin in (dict, Dict):
+        _, value = get_args(annotation) or (str, Any)
+        return _Shape("dict", optional, item=_compile_shape(value))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _Shape("model", optional, plan=compile_plan(annotation))
+    leaf = Union[annotation, None] if optional else annotation
+    return _Shape("str" if annotation is str else "leaf", optional, adapter=TypeAdapter(leaf))
+
+
+class ModelPlan:
+    """Coercion plan for one pydantic model, compiled from its fields."""
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields: Dict[str, _Shape] = {}
+        self.required: List[str] = []
+        for name, info in model.model_fields.items():
+            self.fields[name] = _compile_shape(info.annotation)
+            if info.is_required():
+                self.required.append(name)
+
+    def build(self, data: Dict[str, Any], issues: List[str], path: str = "") -> BaseModel:
+        """
+        Coerce a dict into the model in one pass.
+
+        Args:
+            data: Raw dict (unknown keys are ignored)
+            issues: Receives the path of every dropped item or defaulted field
+            path: Prefix for issue paths
+
+        Returns:
+            Model instance
+
+        Raises:
+            _Invalid: If a required field is missing or unusable
+        """
+        values = {}
+        for name, value in data.items():
+            shape = self.fields.get(name)
+            if shape is None:
+                continue
+            try:
+                values[name] = _coerce(shape, value, issues, f"{path}{name}")
+            except _Invalid:
+                issues.append(f"{path}{name}")
+        for name in self.required:
+            if name not in values:
+                raise _Invalid(name)
+        # Every value was validated against its field above; construct without re-validating
+        return self.model.model_construct(**values)
+
+
+@lru_cache(maxsize=None)
+def compile_plan(model: Type[BaseModel]) -> ModelPlan:
+    """Compile (once) the coercion plan for a model."""
+    return ModelPlan(model)
+
+
+def _parse_json_string(value: str) -> Any:
+    """Decode stringified JSON (also with single quotes); return the string if it isn't JSON."""
+    text = value.strip()
+    if not text.startswith(("{", "[")):
+        return value
+    for candidate in (text, text.replace("'", '"')):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return value
+
+
+def _to_text(value: Any) -> str:
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {v}" for k, v in value.items() if v not in (None, "", []))
+    return str(value)
+
+
+def _coerce(shape: _Shape, value: Any, issues: List[str], path: str) -> Any:
+    if value is None:
+        if shape.kind == "list":
+            return []
+        if shape.kind == "dict":
+            return {}
+        if shape.optional:
+            return None
+        raise _Invalid(path)
+
+    if shape.kind in ("list", "dict", "model") and isinstance(value, str):
+        value = _parse_json_string(value)
+
+    if shape.kind == "list":
+        if isinstance(value, str):
+            value = [value] if value.strip() else []
+        elif not isinstance(value, (list, tuple)):
+            value = [value]
+        items = []
+        for i, item in enumerate(value):
+            try:
+                items.append(_coerce(shape.item, item, issues, f"{path}[{i}]"))
+            except _Invalid:
+                issues.append(f"{path}[{i}]")
+        return items
+
+    if shape.kind == "dict":
+        if isinstance(value, list):
+            value = {"other": value}
+        if not isinstance(value, dict):
+            raise _Invalid(path)
+        result = {}
+        for key, item in value.items():
+            try:
+                result[str(key)] = _coerce(shape.item, item, issues, f"{path}.{key}")
+            except _Invalid:
+                issues.append(f"{path}.{key}")
+        return result
+
+    if shape.kind == "model":
+        if isinstance(value, list) and len(value) == 1:
+            value = value[0]
+        if not isinstance(value, dict):
+            if shape.optional and value in ([], ""):
+                return None
+            raise _Invalid(path)
+        return shape.plan.build(value, issues, f"{path}.")
+
+    if shape.kind == "str":
+        if isinstance(value, (list, tuple)):
+            parts = [_to_text(v) for v in value if v not in (None, "")]
+            if not parts:
+                if shape.optional:
+                    return None
+                raise _Invalid(path)
+            value = "; ".join(parts)
+        elif isinstance(value, dict):
+            value = _to_text(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+
+    try:
+        return shape.adapter.validate_python(value)
+    except ValidationError:
+        if shape.optional:
+            return None
+        raise _Invalid(path)
+
+
+def coerce_model(model: Type[BaseModel], data: Dict[str, Any]) -> Tuple[BaseModel, List[str]]:
+    """
+    Coerce raw JSON into ``model`` using its compiled plan.
+
+    Args:
+        model: Target pydantic model
+        data: Raw dict from the LLM
+
+    Returns:
+        (instance, issues) where issues lists the paths that were dropped or defaulted
+
+    Raises:
+        ValueError: If a required top-level field is missing or unusable
+    """
+    issues: List[str] = []
+    try:
+        return compile_plan(model).build(data, issues), issues
+    except _Invalid as e:
+        raise ValueError(f"Required field '{e}' missing or invalid for {model.__name__}")
@@ -1,26 +1,47 @@
 """
 LangGraph workflow for pitch deck analysis.
 """
+import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser
 from langgraph.graph import StateGraph, END
 
-from .pdf_utils import pdf_to_images, encode_image_base64
-from .prompts import create_deck_summary_message
-from .schemas import DeckAnalysis, SlideInsight
+from .pdf_utils import pdf_to_images, encode_image_base64, RasterizationError
+from .prompts import (
+    create_deck_summary_message, create_slide_batch_message, create_consolidation_message, create_triage_message,
+)
+from .schemas import DeckAnalysis, SlideInsight, SlideResult, SlideBatch, DeckTriage, Metric
+from .slide_cache import cache_key, slide_cache, slide_hash
+from .text_layer import (
+    extract_page_texts, extract_metric_candidates, format_candidates, number_in_source, source_numbers,
+)
+from .coercion import coerce_model
+from .repair import repair_analysis, REPAIR_MODEL
+from ..core.cascade import run_cascade_with_model
+from ..core.deadlines import cancel_event, check_deadline
+from ..core.degradation import LOW_DETAIL_SLIDES
+from ..core.llm import get_chat_model
+from ..core.structured import strict_response_format, parse_strict_reply
+from ..core.telemetry import traced_node, record_cache_hit, record_event, estimate_image_tokens
 
 
-# Load environment
-load_dotenv()
-
 # Use GPT-4 Vision (gpt-4o has vision capabilities)
-vision_llm = ChatOpenAI(model="gpt-4o", temperature=0.2)
-parser = JsonOutputParser()
+VISION_MODEL = "gpt-4o"
+# Set from the PDF, not by the model
+DECK_EXCLUDE = ("deck_name", "total_slides", "source_numbers")
+# Low-detail slide classification before the analysis call
+TRIAGE_MODEL = "gpt-4o"
+# Categories worth sending at high detail; everything else (and unknown labels) is decided below
+HIGH_DETAIL_CATEGORIES = ("team", "market", "traction", "financials")
+LOW_DETAIL_CATEGORIES = ("cover", "appendix", "filler")
+# Below this many slides the triage call costs more than it saves
+MIN_TRIAGE_SLIDES = 4
+# Text-only model that merges per-slide results when part of the deck came from the slide cache
+CONSOLIDATE_MODEL = "gpt-4o-mini"
+# Assembled from the per-slide results by code, not by the consolidation model
+CONSOLIDATE_EXCLUDE = DECK_EXCLUDE + ("slides", "metrics")
 
 
 class DeckState(BaseModel):
@@ -29,10 +50,20 @@ class DeckState(BaseModel):
     deck_name: str = ""
     image_paths: List[str] = Field(default_factory=list)
     images_base64: List[str] = Field(default_factory=list)
+    metric_candidates: Dict[str, List[Metric]] = Field(default_factory=dict)  # from the PDF text layer
+    source_numbers: List[str] = Field(default_factory=list)  # canonical numbers in the text layer
+    slide_hashes: Dict[int, str] = Field(default_factory=dict)  # slide number -> content hash
+    cached_slides: Dict[int, SlideResult] = Field(default_factory=dict)  # slide cache hits
+    slide_results: Dict[int, SlideResult] = Field(default_factory=dict)  # cached + newly analyzed slides
+    slide_categories: Dict[int, str] = Field(default_factory=dict)  # triage label per slide number
+    slide_details: Dict[int, str] = Field(default_factory=dict)  # "high"/"low" image detail per slide number
+    vision_model: str = VISION_MODEL  # model that produced the newly analyzed slides (the cascade may pick another)
     analysis_json: Dict[str, Any] = Field(default_factory=dict)
     final_analysis: DeckAnalysis | None = None
+    degradations: List[str] = Field(default_factory=list)  # deadline-mode plan (core/degradation.py)
 
 
+@traced_node("deck")
 def convert_pdf_node(state: DeckState) -> dict:
     """Convert PDF to images."""
     print(f"    Converting PDF: {state.pdf_path}")
@@ -41,13 +72,35 @@ def convert_pdf_node(state: DeckState) -> dict:
     from pathlib import Path
     deck_name = Path(state.pdf_path).stem
     
-    # Convert PDF to images
-    image_paths = pdf_to_images(state.pdf_path)
+    # Convert PDF to images (sandboxed; a bad PDF fails this deck, not the batch).
+    # The worker process is killed when the stage or company deadline passes.
+    try:
+        image_paths = pdf_to_images(state.pdf_path, cancel=cancel_event())
+    except RasterizationError as e:
+        record_event(f"rasterize.{e.reason}")
+        print(f"Rasterization failed ({e.reason}): {e}")
+        check_deadline()
+        raise
     print(f"Converted {len(image_paths)} slides to images")
     
     return {"deck_name": deck_name, "image_paths": image_paths}
 
 
+@traced_node("deck")
+def extract_text_layer_node(state: DeckState) -> dict:
+    """Pull candidate metrics out of the PDF text layer (no LLM)."""
+    page_texts = extract_page_texts(state.pdf_path)
+    if not any(text.strip() for text in page_texts):
+        print("No PDF text layer, metrics will be read from the slide images only")
+        return {}
+    candidates = extract_metric_candidates(page_texts)
+    count = sum(len(v) for v in candidates.values())
+    record_event("text_layer.candidates", count)
+    print(f"Text layer: {count} metric candidate(s) on {len(page_texts)} page(s)")
+    return {"metric_candidates": candidates, "source_numbers": source_numbers(page_texts)}
+
+
+@traced_node("deck")
 def encode_images_node(state: DeckState) -> dict:
     """Encode images to base64."""
     print(f"Encoding {len(state.image_paths)} images...")
@@ -61,52 +114,226 @@ def encode_images_node(state: DeckState) -> dict:
     return {"images_base64": images_base64}
 
 
+def _renumbered(result: SlideResult, slide_number: int) -> SlideResult:
+    """Cached result moved to the slide's position in this deck version."""
+    result = result.model_copy(deep=True)
+    result.insight.slide_number = slide_number
+    for metrics in result.metrics.values():
+        for metric in metrics:
+            metric.slide_number = slide_number
+    return result
+
+
+@traced_node("deck")
+def lookup_slide_cache_node(state: DeckState) -> dict:
+    """Hash every slide and load the ones already analyzed at high detail in an earlier deck version."""
+    slide_hashes = {}
+    for slide_number, path in enumerate(state.image_paths, start=1):
+        try:
+            slide_hashes[slide_number] = slide_hash(path)
+        except Exception as e:
+            print(f"  Could not hash slide {slide_number}: {str(e)[:120]}")
+
+    # A high-detail result serves any slide; low-detail ones are looked up after triage
+    hits = slide_cache.get_many({n: cache_key(h, VISION_MODEL, "high") for n, h in slide_hashes.items()})
+    cached = {n: _renumbered(result, n) for n, result in hits.items()}
+    misses = len(state.image_paths) - len(cached)
+    if cached:
+        record_cache_hit(len(cached))
+    if misses:
+        record_event("slide_cache.miss", misses)
+    print(f"Slide cache: {len(cached)} hit(s), {misses} slide(s) to analyze")
+    return {"slide_hashes": slide_hashes, "cached_slides": cached}
+
+
+def _low_detail_hits(state: DeckState, details: Dict[int, str]) -> Dict[int, SlideResult]:
+    """Cached low-detail results for the slides triage sent at low detail."""
+    keys = {
+        n: cache_key(state.slide_hashes[n], VISION_MODEL, "low")
+        for n, detail in details.items()
+        if detail == "low" and n in state.slide_hashes
+    }
+    hits = {n: _renumbered(result, n) for n, result in slide_cache.get_many(keys).items()}
+    if hits:
+        record_cache_hit(len(hits))
+        print(f"Slide cache: {len(hits)} low-detail hit(s)")
+    return hits
+
+
+def _image_size(path: str) -> tuple:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return img.size
+
+
+@traced_node("deck")
+def triage_slides_node(state: DeckState) -> dict:
+    """Classify the slides still to analyze at low detail; only dense categories get high detail."""
+    pending = [
+        (n, img_b64)
+        for n, img_b64 in enumerate(state.images_base64, start=1)
+        if n not in state.cached_slides
+    ]
+    if LOW_DETAIL_SLIDES in state.degradations:
+        # Deadline mode: no triage call, every slide at low detail
+        record_event(f"degraded.{LOW_DETAIL_SLIDES}")
+        print(f"Deadline mode: {len(pending)} slide(s) at low detail, no triage")
+        details = {n: "low" for n, _ in pending}
+        # Stored under the low-detail key, so a later full run never reuses these results
+        hits = _low_detail_hits(state, details)
+        return {"slide_details": details, "cached_slides": {**state.cached_slides, **hits}}
+    if len(pending) < MIN_TRIAGE_SLIDES:
+        return {}
+
+    print(f"Triaging {len(pending)} slide(s) at low detail...")
+    llm = get_chat_model(TRIAGE_MODEL, temperature=0)
+    try:
+        response = llm.invoke(create_triage_message(pending), response_format=strict_response_format(DeckTriage))
+        triage = DeckTriage.model_validate(parse_strict_reply(response, DeckTriage))
+    except Exception as e:
+        # Without a triage every slide stays at high detail, as before
+        print(f"  Triage failed, keeping all slides at high detail: {str(e)[:200]}")
+        record_event("slide_triage.failed")
+        return {}
+
+    pending_numbers = {n for n, _ in pending}
+    categories = {
+        t.slide_number: t.category.strip().lower()
+        for t in triage.slides
+        if t.slide_number in pending_numbers
+    }
+    details = {
+        n: "low" if categories.get(n) in LOW_DETAIL_CATEGORIES else "high"
+        for n, _ in pending
+    }
+
+    # Image tokens: all slides at high detail vs. triage pass + mixed-detail analysis pass
+    baseline = sent = 0
+    for n, _ in pending:
+        width, height = _image_size(state.image_paths[n - 1])
+        baseline += estimate_image_tokens(width, height, "high")
+        sent += estimate_image_tokens(width, height, "low") + estimate_image_tokens(width, height, details[n])
+    record_event("slide_triage.decks")
+    record_event("slide_triage.baseline_image_tokens", baseline)
+    record_event("slide_triage.sent_image_tokens", sent)
+
+    low = sum(1 for d in details.values() if d == "low")
+    print(f"  {low}/{len(pending)} slide(s) at low detail, ~{baseline - sent} image tokens saved")
+    update = {"slide_categories": categories, "slide_details": details}
+    hits = _low_detail_hits(state, details)
+    if hits:
+        update["cached_slides"] = {**state.cached_slides, **hits}
+    return update
+
+
+def route_after_lookup(state: DeckState) -> str:
+    """Full-deck vision call for unseen decks; incremental path when some slides are cached."""
+    return "analyze_slides" if state.cached_slides else "analyze_deck"
+
+
+@traced_node("deck")
 def analyze_deck_node(state: DeckState) -> dict:
     """Analyze the entire deck with GPT-4 Vision using structured output."""
     print(f"Analyzing deck with GPT-4 Vision...")
     
     # Create message with all slides
-    messages = create_deck_summary_message(state.images_base64)
+    messages = create_deck_summary_message(
+        state.images_base64, state.slide_details, format_candidates(state.metric_candidates)
+    )
     
-    # Fallback to manual JSON parsing (structured output has issues with required metadata fields)
-    try:
-        response = vision_llm.invoke(
+    def attempt(model):
+        # Strict JSON-schema output: one request, reply guaranteed to match DeckAnalysis
+        response = get_chat_model(model, temperature=0.2).invoke(
             messages,
-            response_format={"type": "json_object"}
+            response_format=strict_response_format(DeckAnalysis, exclude=DECK_EXCLUDE),
         )
-        print(f"  ✓ Received response from GPT-4 Vision")
-    except Exception as e:
-        print(f"JSON mode failed: {e}, trying without")
-        response = vision_llm.invoke(messages)
+        print(f"  ✓ Received response from {model}")
+        return parse_strict_reply(response, DeckAnalysis)
+    
+    def view(analysis_json):
+        # Cascade checks coverage on the coerced analysis, as validation will see it
+        raw = {**analysis_json, "deck_name": state.deck_name, "total_slides": len(state.image_paths)}
+        return coerce_model(DeckAnalysis, raw)[0]
     
-    # Parse JSON response
-    import json
     try:
-        # Try to extract JSON from response
-        content = response.content
-        if "```json" in content:
-            # Extract JSON from code block
-            json_str = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            json_str = content.split("```")[1].split("```")[0].strip()
-        else:
-            json_str = content
-        
-        analysis_json = json.loads(json_str)
-        print(f"  ✓ Successfully parsed JSON response")
-        print(f"Analysis complete")
-        return {"analysis_json": analysis_json}
-    except Exception as e:
-        print(f"JSON parsing failed: {e}")
-        print(f"  Response preview: {str(response.content)[:500]}...")
-        # Fallback to basic structure
-        analysis_json = {
-            "problem_statement": str(response.content)[:1000],
-            "observations": [f"Analysis parsing failed: {str(e)}"]
-        }
-        return {"analysis_json": analysis_json}
+        analysis_json, model = run_cascade_with_model("deck", VISION_MODEL, attempt, view=view)
+    except ValueError as e:
+        # Refusal or truncated reply; keep the single vision call and let validation fill defaults
+        print(f"Structured reply unusable: {e}")
+        return {"analysis_json": {"observations": [f"Analysis parsing failed: {str(e)[:300]}"]}}
+    print(f"Analysis complete")
+    return {"analysis_json": analysis_json, "vision_model": model}
+
+
+@traced_node("deck")
+def analyze_slides_node(state: DeckState) -> dict:
+    """Analyze only the slides missing from the cache, one result per slide."""
+    new = [
+        (n, img_b64)
+        for n, img_b64 in enumerate(state.images_base64, start=1)
+        if n not in state.cached_slides
+    ]
+    results = dict(state.cached_slides)
+    if not new:
+        print(f"All {len(results)} slides cached, skipping vision call")
+        return {"slide_results": results}
+
+    print(f"Analyzing {len(new)} new/changed slide(s) with GPT-4 Vision...")
+    vision_llm = get_chat_model(VISION_MODEL, temperature=0.2)
+    response = vision_llm.invoke(
+        create_slide_batch_message(
+            new, state.slide_details, format_candidates(state.metric_candidates, {n for n, _ in new})
+        ),
+        response_format=strict_response_format(SlideBatch),
+    )
+    try:
+        batch, issues = coerce_model(SlideBatch, parse_strict_reply(response, SlideBatch))
+        if issues:
+            print(f"  Dropped {len(issues)} malformed slide value(s): {', '.join(issues[:10])}")
+    except ValueError as e:
+        print(f"Slide batch reply unusable: {e}")
+        batch = SlideBatch()
+
+    requested = {n for n, _ in new}
+    for result in batch.slides:
+        n = result.insight.slide_number
+        if n in requested:
+            results[n] = _renumbered(result, n)
+    for n in sorted(requested - set(results)):
+        print(f"  No result returned for slide {n}")
+    return {"slide_results": results}
 
 
+@traced_node("deck")
+def consolidate_node(state: DeckState) -> dict:
+    """Text-only merge of the per-slide results into a deck-level analysis."""
+    ordered = [state.slide_results[n] for n in sorted(state.slide_results)]
+    print(f"Consolidating {len(ordered)} slide result(s) with {CONSOLIDATE_MODEL}...")
+    payload = json.dumps(
+        [r.model_dump(mode="json", exclude_none=True) for r in ordered], ensure_ascii=False
+    )
+    llm = get_chat_model(CONSOLIDATE_MODEL, temperature=0.2)
+    response = llm.invoke(
+        create_consolidation_message(len(state.image_paths), payload),
+        response_format=strict_response_format(DeckAnalysis, exclude=CONSOLIDATE_EXCLUDE),
+    )
+    try:
+        analysis_json = parse_strict_reply(response, DeckAnalysis)
+    except ValueError as e:
+        print(f"Structured reply unusable: {e}")
+        analysis_json = {"observations": [f"Deck consolidation failed: {str(e)[:300]}"]}
+
+    metrics: Dict[str, list] = {}
+    for result in ordered:
+        for category, items in result.metrics.items():
+            metrics.setdefault(category, []).extend(m.model_dump(mode="json") for m in items)
+    analysis_json["slides"] = [r.insight.model_dump(mode="json") for r in ordered]
+    analysis_json["metrics"] = metrics
+    return {"analysis_json": analysis_json}
+
+
+@traced_node("deck")
 def validate_analysis_node(state: DeckState) -> dict:
     """Validate and structure the analysis."""
     print(f"✔️  Validating analysis...")
@@ -116,171 +343,97 @@ def validate_analysis_node(state: DeckState) -> dict:
         print(f"Using structured output (no validation needed)")
         return {"final_analysis": state.final_analysis}
     
-    import json
-    
-    def deep_fix_types(obj):
-        """Recursively fix type issues in nested structures."""
-        if isinstance(obj, dict):
-            fixed = {}
-            for k, v in obj.items():
-                # Fix None to [] for known list fields
-                if v is None and k in ['investors', 'partnerships', 'distribution_channels', 'assumptions_stated', 
-                                        'supporting_evidence', 'flags', 'key_takeaways', 'key_points', 'data_items', 
-                                        'slide_numbers']:
-                    fixed[k] = []
-                # Fix [] to None for known optional string fields (but NOT for 'notes' which can be either)
-                elif v == [] and k in ['context', 'details', 'date', 'valuation', 'status', 'relevance',
-                                         'sales_strategy', 'technical_approach', 'pricing_structure', 'customer_acquisition',
-                                         'sales_cycle', 'expansion_strategy']:
-                    fixed[k] = None
-                # Fix string representation of dict/list back to actual dict/list
-                elif isinstance(v, str) and v.strip().startswith(('{', '[')):
-                    try:
-                        fixed[k] = json.loads(v.replace("'", '"'))
-                    except:
-                        fixed[k] = v
-                # Recursively fix nested structures
-                elif isinstance(v, dict):
-                    fixed[k] = deep_fix_types(v)
-                elif isinstance(v, list):
-                    fixed[k] = [deep_fix_types(item) if isinstance(item, (dict, list)) else item for item in v]
-                else:
-                    fixed[k] = v
-            return fixed
-        elif isinstance(obj, list):
-            return [deep_fix_types(item) if isinstance(item, (dict, list)) else item for item in obj]
-        return obj
-    
+    raw = {
+        **state.analysis_json,
+        "deck_name": state.deck_name,
+        "total_slides": len(state.image_paths),
+        "source_numbers": state.source_numbers,
+    }
     try:
-        # Deep fix type issues
-        fixed_json = deep_fix_types(state.analysis_json)
-        
-        # Create DeckAnalysis object
+        # One pass over the raw JSON with the plan compiled from DeckAnalysis
+        analysis, issues = coerce_model(DeckAnalysis, raw)
+        if issues:
+            # Text-only repair of just the bad values; never re-run the vision call
+            analysis, issues, repaired = repair_analysis(raw, analysis, issues)
+            if repaired:
+                print(f"Repaired {repaired} value(s) with {REPAIR_MODEL}")
+                analysis.observations.append(
+                    f"Validation: {repaired} malformed value(s) corrected by a text-only repair pass"
+                )
+    except ValueError as e:
+        print(f"Validation failed: {str(e)[:200]}")
         analysis = DeckAnalysis(
             deck_name=state.deck_name,
             total_slides=len(state.image_paths),
-            **fixed_json
+            observations=[f"Analysis validation failed: {str(e)[:200]}"],
+            missing_elements=["Full analysis could not be completed - check logs"],
+            data_quality_notes="Validation error occurred - minimal data available"
         )
-        print(f"Validation successful")
         return {"final_analysis": analysis}
-    except Exception as e:
-        print(f"Validation failed: {str(e)[:200]}")
-        print(f"Analysis JSON keys: {list(state.analysis_json.keys())[:20]}")
-        
-        # Try to salvage what we can from the analysis_json
-        salvaged_data = {
-            "deck_name": state.deck_name,
-            "total_slides": len(state.image_paths),
-        }
-        
-        # Copy over any fields that exist in the schema with type coercion
-        schema_fields = DeckAnalysis.model_fields.keys()
-        for key, value in state.analysis_json.items():
-            if key in schema_fields:
-                try:
-                    # Type coercion for common mismatches
-                    field_info = DeckAnalysis.model_fields[key]
-                    
-                    # If field expects Optional[str] but got empty list, convert to None
-                    if value == [] and hasattr(field_info.annotation, '__origin__'):
-                        if field_info.annotation.__origin__ is type(None) or 'str' in str(field_info.annotation):
-                            salvaged_data[key] = None
-                            continue
-                    
-                    # If field expects str but got list, try to join or convert
-                    if isinstance(value, list) and 'str' in str(field_info.annotation):
-                        if len(value) == 0:
-                            salvaged_data[key] = None
-                        elif len(value) == 1:
-                            salvaged_data[key] = str(value[0])
-                        else:
-                            salvaged_data[key] = "; ".join(str(v) for v in value)
-                        continue
-                    
-                    # Fix nested objects with None values in list fields (e.g., FundingDetail.investors)
-                    if isinstance(value, list) and value:
-                        cleaned_list = []
-                        for item in value:
-                            if isinstance(item, dict):
-                                # Fix None values in nested dict fields that expect lists
-                                cleaned_item = {}
-                                for item_key, item_value in item.items():
-                                    if item_value is None and item_key in ['investors', 'partnerships', 'distribution_channels', 'notes', 'assumptions_stated', 'supporting_evidence', 'flags', 'key_takeaways', 'key_points', 'data_items', 'slide_numbers']:
-                                        cleaned_item[item_key] = []
-                                    elif isinstance(item_value, list):
-                                        # Ensure lists don't have None elements
-                                        cleaned_item[item_key] = [v for v in item_value if v is not None]
-                                    else:
-                                        cleaned_item[item_key] = item_value
-                                cleaned_list.append(cleaned_item)
-                            else:
-                                cleaned_list.append(item)
-                        salvaged_data[key] = cleaned_list
-                        continue
-                    
-                    salvaged_data[key] = value
-                except Exception as field_error:
-                    # Skip problematic fields
-                    print(f"  ⚠️  Skipping field '{key}': {str(field_error)[:100]}")
-                    pass
-        
-        # Add error info to observations
-        if "observations" not in salvaged_data:
-            salvaged_data["observations"] = []
-        elif isinstance(salvaged_data["observations"], str):
-            # Convert string to list
-            salvaged_data["observations"] = [salvaged_data["observations"]]
-        
-        if isinstance(salvaged_data["observations"], list):
-            salvaged_data["observations"].append(f"Validation error: {str(e)[:300]}")
-        
-        if "data_quality_notes" not in salvaged_data:
-            salvaged_data["data_quality_notes"] = "Partial data salvaged from failed validation"
-        
+
+    if issues:
+        print(f"Coerced analysis, dropped/defaulted {len(issues)} malformed value(s): {', '.join(issues[:10])}")
+        analysis.observations.append(
+            f"Validation: {len(issues)} malformed value(s) dropped or defaulted ({', '.join(issues[:10])})"
+        )
+        if not analysis.data_quality_notes:
+            analysis.data_quality_notes = "Partial data salvaged from failed validation"
+    else:
+        print(f"Validation successful")
+
+    if analysis.source_numbers:
+        unverified = [
+            m for metrics in analysis.metrics.values() for m in metrics
+            if not number_in_source(m.value, analysis.source_numbers)
+        ]
+        if unverified:
+            record_event("text_layer.unverified_metrics", len(unverified))
+            print(f"{len(unverified)} metric value(s) not found in the PDF text layer")
+    return {"final_analysis": analysis}
+
+
+def _results_from_analysis(analysis: DeckAnalysis) -> Optional[Dict[int, SlideResult]]:
+    """Split a full-deck analysis into per-slide results (None if metrics aren't attributed to slides)."""
+    by_slide: Dict[int, Dict[str, list]] = {}
+    for category, items in analysis.metrics.items():
+        for metric in items:
+            if metric.slide_number is None:
+                return None
+            by_slide.setdefault(metric.slide_number, {}).setdefault(category, []).append(metric)
+    return {
+        insight.slide_number: SlideResult(insight=insight, metrics=by_slide.get(insight.slide_number, {}))
+        for insight in analysis.slides
+    }
+
+
+@traced_node("deck")
+def store_slide_cache_node(state: DeckState) -> dict:
+    """Save per-slide results of newly analyzed slides for the next deck version."""
+    if state.slide_results:
+        results = {n: r for n, r in state.slide_results.items() if n not in state.cached_slides}
+    elif state.final_analysis is not None:
+        results = _results_from_analysis(state.final_analysis)
+        if results is None:
+            print("Slide cache: metrics not attributed to slides, not caching this deck")
+            return {}
+    else:
+        return {}
+
+    stored = 0
+    for n, result in results.items():
+        content_hash = state.slide_hashes.get(n)
+        if content_hash is None:
+            continue
         try:
-            # Try to create analysis with salvaged data
-            print(f"Attempting to create analysis with {len(salvaged_data)} salvaged fields...")
-            analysis = DeckAnalysis(**salvaged_data)
-            print(f"Created analysis with salvaged data")
-            return {"final_analysis": analysis}
-        except Exception as e2:
-            print(f"Salvage failed: {str(e2)[:300]}")
-            print(f"Problematic fields - trying to skip them...")
-            
-            # More aggressive salvage - skip any fields that cause validation errors
-            safe_data = {
-                "deck_name": state.deck_name,
-                "total_slides": len(state.image_paths),
-            }
-            
-            # Try each field individually
-            for key, value in salvaged_data.items():
-                if key in ["deck_name", "total_slides"]:
-                    continue
-                try:
-                    test_data = {**safe_data, key: value}
-                    DeckAnalysis(**test_data)
-                    safe_data[key] = value
-                except:
-                    print(f"Skipping field '{key}' - causes validation error")
-            
-            # Create absolute minimal valid analysis
-            try:
-                analysis = DeckAnalysis(**safe_data)
-                print(f"Created minimal analysis with {len(safe_data)} safe fields")
-                return {"final_analysis": analysis}
-            except Exception as e3:
-                print(f"Even minimal salvage failed: {str(e3)[:200]}")
-                # Last resort - completely minimal
-                analysis = DeckAnalysis(
-                    deck_name=state.deck_name,
-                    total_slides=len(state.image_paths),
-                    problem_statement=state.analysis_json.get("problem_statement", "Analysis could not be completed"),
-                    observations=[f"Analysis validation failed: {str(e)[:200]}"],
-                    missing_elements=["Full analysis could not be completed - check logs"],
-                    data_quality_notes="Validation error occurred - minimal data available"
-                )
-                return {"final_analysis": analysis}
+            # Keyed on the model and detail that actually produced the result
+            slide_cache.put(cache_key(content_hash, state.vision_model, state.slide_details.get(n, "high")), result)
+            stored += 1
+        except OSError as e:
+            print(f"  Could not cache slide {n}: {str(e)[:120]}")
+    if stored:
+        record_event("slide_cache.stored", stored)
+        print(f"Slide cache: stored {stored} slide(s)")
+    return {}
 
 
 # Build the graph
@@ -289,15 +442,30 @@ def build_deck_graph():
     builder = StateGraph(DeckState)
     
     builder.add_node("convert_pdf", convert_pdf_node)
+    builder.add_node("extract_text_layer", extract_text_layer_node)
     builder.add_node("encode_images", encode_images_node)
+    builder.add_node("lookup_slide_cache", lookup_slide_cache_node)
+    builder.add_node("triage_slides", triage_slides_node)
     builder.add_node("analyze_deck", analyze_deck_node)
+    builder.add_node("analyze_slides", analyze_slides_node)
+    builder.add_node("consolidate", consolidate_node)
     builder.add_node("validate", validate_analysis_node)
+    builder.add_node("store_slide_cache", store_slide_cache_node)
     
     builder.set_entry_point("convert_pdf")
-    builder.add_edge("convert_pdf", "encode_images")
-    builder.add_edge("encode_images", "analyze_deck")
+    builder.add_edge("convert_pdf", "extract_text_layer")
+    builder.add_edge("extract_text_layer", "encode_images")
+    builder.add_edge("encode_images", "lookup_slide_cache")
+    builder.add_edge("lookup_slide_cache", "triage_slides")
+    builder.add_conditional_edges("triage_slides", route_after_lookup, {
+        "analyze_deck": "analyze_deck",
+        "analyze_slides": "analyze_slides",
+    })
     builder.add_edge("analyze_deck", "validate")
-    builder.add_edge("validate", END)
+    builder.add_edge("analyze_slides", "consolidate")
+    builder.add_edge("consolidate", "validate")
+    builder.add_edge("validate", "store_slide_cache")
+    builder.add_edge("store_slide_cache", END)
     
     return builder.compile()
 
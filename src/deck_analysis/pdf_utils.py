@@ -3,47 +3,43 @@ Utilities for converting PDF pitch decks to images.
 """
 import os
 import base64
-from typing import List
-from pathlib import Path
+import threading
+from typing import List, Optional
 
+from .rasterizers import RASTER_DPI, get_rasterizer
+from .raster_sandbox import SANDBOX_RASTERIZATION, RasterizationError, sandboxed_render
 
-def pdf_to_images(pdf_path: str, output_dir: str = None) -> List[str]:
+
+def pdf_to_images(
+    pdf_path: str,
+    output_dir: str = None,
+    backend: str = None,
+    cancel: Optional[threading.Event] = None,
+) -> List[str]:
     """
     Convert PDF pages to images.
     
     Args:
         pdf_path: Path to the PDF file
         output_dir: Directory to save images (optional, defaults to temp)
+        backend: Rasterizer backend (see rasterizers.py; defaults to PITCHPANDA_RASTERIZER)
+        cancel: Set to abort a sandboxed rasterization
     
     Returns:
         List of paths to generated image files
-    """
-    try:
-        from pdf2image import convert_from_path
-    except ImportError:
-        raise ImportError(
-            "pdf2image is required for PDF conversion. "
-            "Install with: pip install pdf2image\n"
-            "Also requires poppler-utils: brew install poppler (macOS)"
-        )
     
+    Raises:
+        RasterizationError: Sandboxed rendering timed out, hit a limit or crashed
+    """
     if output_dir is None:
         output_dir = os.path.join(os.path.dirname(pdf_path), "temp_images")
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Convert PDF to images
-    images = convert_from_path(pdf_path, dpi=150)
-    
-    image_paths = []
-    deck_name = Path(pdf_path).stem
-    
-    for i, image in enumerate(images, start=1):
-        img_path = os.path.join(output_dir, f"{deck_name}_slide_{i:03d}.png")
-        image.save(img_path, "PNG")
-        image_paths.append(img_path)
-    
-    return image_paths
+    # Render every page straight to PNG, in a limited worker process unless disabled
+    if SANDBOX_RASTERIZATION:
+        return sandboxed_render(pdf_path, output_dir, backend=backend, dpi=RASTER_DPI, cancel=cancel)
+    return get_rasterizer(backend).render(pdf_path, output_dir, dpi=RASTER_DPI)
 
 
 def encode_image_base64(image_path: str) -> str:
@@ -1,9 +1,9 @@
 """
 Prompts for GPT-4 Vision analysis of pitch deck slides.
 """
-from typing import List
+from typing import Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
 
 SLIDE_ANALYSIS_PROMPT = """You are analyzing a pitch deck slide. Extract key information from this slide.
@@ -196,7 +196,8 @@ Return JSON in this exact structure:
                 "context": "Raised in Q1 2024 from Acme Ventures",
                 "is_projection": false,
                 "confidence": "high",
-                "notes": null
+                "notes": null,
+                "slide_number": 12
             },
             {
                 "label": "Series A Target",
@@ -204,7 +205,8 @@ Return JSON in this exact structure:
                 "context": "Seeking to raise",
                 "is_projection": true,
                 "confidence": "high",
-                "notes": null
+                "notes": null,
+                "slide_number": 14
             }
         ],
         "traction": [...],
@@ -625,12 +627,14 @@ def create_slide_analysis_message(image_base64: str, slide_number: int) -> list:
     Returns:
         List of messages for the vision model
     """
+    # Static instructions first so the provider can cache them across slides
     return [
+        SystemMessage(content=SLIDE_ANALYSIS_PROMPT),
         HumanMessage(
             content=[
                 {
                     "type": "text",
-                    "text": f"Slide {slide_number}:\n\n{SLIDE_ANALYSIS_PROMPT}"
+                    "text": f"Slide {slide_number}:"
                 },
                 {
                     "type": "image_url",
@@ -643,23 +647,52 @@ def create_slide_analysis_message(image_base64: str, slide_number: int) -> list:
     ]
 
 
-def create_deck_summary_message(images_base64: List[str]) -> list:
+def _low_detail_note(slide_numbers: List[int]) -> str:
+    if not slide_numbers:
+        return ""
+    listed = ", ".join(str(n) for n in slide_numbers)
+    return f" Slides {listed} were triaged as low-information and are sent at reduced resolution."
+
+
+def _candidates_part(candidates: str) -> list:
+    if not candidates:
+        return []
+    return [{
+        "type": "text",
+        "text": (
+            "Numbers found in the PDF text layer (slide | category guess | label guess | value | line). "
+            "Confirm each against the slide, fix the label and category, keep the value exactly as shown "
+            "and set slide_number; also add numbers that only appear in images or charts:\n" + candidates
+        ),
+    }]
+
+
+def create_deck_summary_message(
+    images_base64: List[str],
+    details: Optional[Dict[int, str]] = None,
+    candidates: str = "",
+) -> list:
     """
     Create a message for analyzing the entire deck.
     
     Args:
         images_base64: List of base64 encoded images (all slides)
+        details: Image detail per slide number ("high"/"low"); defaults to high
+        candidates: Metric candidates from the PDF text layer (see text_layer.format_candidates)
     
     Returns:
         List of messages for the vision model
     """
-    
+    details = details or {}
+    low = [n for n in range(1, len(images_base64) + 1) if details.get(n) == "low"]
+    # The long static prompt goes first as the system message (cacheable prefix);
+    # the slide count and images vary per deck and come after it
     content = [
         {
             "type": "text",
-            "text": f"Analyze this complete pitch deck ({len(images_base64)} slides):\n\n{DECK_SUMMARY_PROMPT}"
+            "text": f"Analyze this complete pitch deck ({len(images_base64)} slides):{_low_detail_note(low)}"
         }
-    ]
+    ] + _candidates_part(candidates)
     
     # Add all slides as images
     for i, img_b64 in enumerate(images_base64, start=1):
@@ -667,8 +700,115 @@ def create_deck_summary_message(images_base64: List[str]) -> list:
             "type": "image_url",
             "image_url": {
                 "url": f"data:image/png;base64,{img_b64}",
-                "detail": "high"
+                "detail": details.get(i, "high")
+            }
+        })
+    
+    return [SystemMessage(content=DECK_SUMMARY_PROMPT), HumanMessage(content=content)]
+
+
+SLIDE_BATCH_PROMPT = """You are analyzing individual slides from a startup pitch deck. Each slide image is preceded by its slide number.
+
+For EVERY slide shown, return one entry with:
+- insight: slide_number (as given), slide_title, key_points, visual_elements, additional_content and data_items (every number or data point visible)
+- metrics: every number on the slide, grouped by category ("funding", "traction", "market_size", "financials", "lois", "team", "other", ...). Each metric has label, value exactly as shown, context, is_projection, confidence ("high" explicitly labeled, "medium" inferred, "low" vague), notes and slide_number
+
+Rules:
+- Only report what is visible on that slide; do not carry information between slides
+- Never invent labels for unlabeled numbers; use an inferred label with confidence "low" and explain in notes
+- Mark projections, targets and forecasts with is_projection = true
+- Stay neutral and factual"""
+
+
+TRIAGE_PROMPT = """You are sorting the slides of a startup pitch deck before a detailed analysis.
+Each slide image is preceded by its slide number. Classify EVERY slide into exactly one category:
+- cover: title slide, logo, tagline, contact details, "thank you" slide
+- team: founders, employees, advisors, investors' logos
+- market: problem, solution, product, market size, competition, business model, go-to-market
+- traction: customers, users, revenue growth, pilots, LOIs, partnerships, awards
+- financials: financial statements, projections, unit economics, funding ask, use of funds, cap table
+- appendix: backup material not covered by another category
+- filler: section dividers, full-bleed photos, quotes or slogans with no data
+
+When a slide mixes content, pick the category carrying the most numbers or text."""
+
+
+CONSOLIDATE_PROMPT = """You are consolidating per-slide extractions of a pitch deck into one deck analysis.
+You do NOT see the slides; you get, for every slide in order, the insight and metrics already extracted from it.
+Base every statement on these extractions only and keep values exactly as extracted. The "slides" and "metrics"
+fields are assembled from the extractions by code, so leave them out and fill in everything else.
+Apply the same rules as a full-deck analysis:
+
+""" + DECK_SUMMARY_PROMPT
+
+
+def create_slide_batch_message(
+    slides: List[tuple],
+    details: Optional[Dict[int, str]] = None,
+    candidates: str = "",
+) -> list:
+    """
+    Create a message for analyzing a subset of slides individually.
+    
+    Args:
+        slides: (slide_number, base64 image) pairs for the slides to analyze
+        details: Image detail per slide number ("high"/"low"); defaults to high
+        candidates: Metric candidates from the PDF text layer for these slides
+    
+    Returns:
+        List of messages for the vision model
+    """
+    details = details or {}
+    low = [n for n, _ in slides if details.get(n) == "low"]
+    content = [{"type": "text", "text": f"Analyze these {len(slides)} slides, one entry per slide:{_low_detail_note(low)}"}]
+    content += _candidates_part(candidates)
+    for slide_number, img_b64 in slides:
+        content.append({"type": "text", "text": f"Slide {slide_number}:"})
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/png;base64,{img_b64}",
+                "detail": details.get(slide_number, "high")
+            }
+        })
+    return [SystemMessage(content=SLIDE_BATCH_PROMPT), HumanMessage(content=content)]
+
+
+def create_triage_message(slides: List[tuple]) -> list:
+    """
+    Create a low-detail message classifying slides by content type.
+    
+    Args:
+        slides: (slide_number, base64 image) pairs for the slides to classify
+    
+    Returns:
+        List of messages for the vision model
+    """
+    content = [{"type": "text", "text": f"Classify these {len(slides)} slides:"}]
+    for slide_number, img_b64 in slides:
+        content.append({"type": "text", "text": f"Slide {slide_number}:"})
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/png;base64,{img_b64}",
+                "detail": "low"
             }
         })
+    return [SystemMessage(content=TRIAGE_PROMPT), HumanMessage(content=content)]
+
+
+def create_consolidation_message(total_slides: int, slide_results_json: str) -> list:
+    """
+    Create a text-only message consolidating per-slide results into a deck analysis.
+    
+    Args:
+        total_slides: Number of slides in the deck
+        slide_results_json: JSON list of per-slide results, in slide order
     
-    return [HumanMessage(content=content)]
+    Returns:
+        List of messages for the text model
+    """
+    return [
+        SystemMessage(content=CONSOLIDATE_PROMPT),
+        HumanMessage(content=f"Per-slide extractions for a {total_slides}-slide deck:\n\n{slide_results_json}"),
+    ]
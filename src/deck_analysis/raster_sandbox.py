@@ -0,0 +1,161 @@
+"""
+Sandboxed PDF rasterization.
+
+Malformed or huge PDFs can make a renderer hang or balloon memory. Decks are
+therefore rendered in a separate worker process (``rasterizers.py`` run as a
+script) that:
+
+- caps its address space with ``RLIMIT_AS`` (``RASTER_MEMORY_MB``)
+- refuses decks longer than ``RASTER_MAX_PAGES``
+- must finish each page within ``RASTER_PAGE_TIMEOUT_S`` and the whole deck
+  within ``RASTER_DOC_TIMEOUT_S``
+
+On a timeout, limit or cancellation the worker's whole process group
+(including any ``pdftoppm`` children) is killed and ``RasterizationError`` is
+raised, which fails the deck stage for that company instead of stalling the
+batch. Set ``PITCHPANDA_RASTER_SANDBOX=0`` to render in-process.
+"""
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from . import rasterizers
+from .rasterizers import RASTER_DPI, get_rasterizer
+
+
+SANDBOX_RASTERIZATION = os.environ.get("PITCHPANDA_RASTER_SANDBOX", "1") != "0"
+RASTER_MAX_PAGES = 80
+RASTER_PAGE_TIMEOUT_S = 30.0
+RASTER_DOC_TIMEOUT_S = 180.0
+RASTER_MEMORY_MB = 2048
+# How often the parent wakes up to check deadlines and cancellation
+_POLL_S = 0.25
+
+
+class RasterizationError(RuntimeError):
+    """Deck could not be rendered; ``reason`` is a short machine-readable code."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    """Kill the worker and everything it spawned."""
+    if proc.poll() is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    proc.wait()
+
+
+def _read_events(stream, events: queue.Queue) -> None:
+    for line in stream:
+        try:
+            events.put(json.loads(line))
+        except ValueError:
+            continue
+    events.put(None)  # worker closed stdout
+
+
+def sandboxed_render(
+    pdf_path: str,
+    output_dir: str,
+    backend: Optional[str] = None,
+    dpi: int = RASTER_DPI,
+    cancel: Optional[threading.Event] = None,
+) -> List[str]:
+    """
+    Render every page of a PDF in an isolated worker process.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_dir: Directory for the PNG files (must exist)
+        backend: Rasterizer name (defaults to PITCHPANDA_RASTERIZER)
+        dpi: Render resolution
+        cancel: Set to abort rendering (the worker is killed)
+
+    Returns:
+        Paths of the rendered PNGs, in page order
+
+    Raises:
+        RasterizationError: Timeout, page or memory limit, worker crash or cancellation
+    """
+    # Resolve the backend here so a missing dependency fails fast with the usual ImportError
+    backend = get_rasterizer(backend).name
+    cmd = [
+        sys.executable, os.path.abspath(rasterizers.__file__),
+        os.path.abspath(pdf_path), os.path.abspath(output_dir),
+        "--backend", backend,
+        "--dpi", str(dpi),
+        "--max-pages", str(RASTER_MAX_PAGES),
+        "--memory-mb", str(RASTER_MEMORY_MB),
+    ]
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=stderr, text=True, start_new_session=True,
+        )
+        events: queue.Queue = queue.Queue()
+        reader = threading.Thread(target=_read_events, args=(proc.stdout, events), daemon=True)
+        reader.start()
+
+        paths: List[str] = []
+        pages = None
+        started = time.monotonic()
+        page_started = started
+        try:
+            while True:
+                now = time.monotonic()
+                if cancel is not None and cancel.is_set():
+                    raise RasterizationError("cancelled", f"Rasterization of {pdf_path} cancelled")
+                if now - started > RASTER_DOC_TIMEOUT_S:
+                    raise RasterizationError(
+                        "timeout_document",
+                        f"Rasterization exceeded {RASTER_DOC_TIMEOUT_S:.0f}s after {len(paths)} page(s)",
+                    )
+                if now - page_started > RASTER_PAGE_TIMEOUT_S:
+                    raise RasterizationError(
+                        "timeout_page", f"Page {len(paths) + 1} took longer than {RASTER_PAGE_TIMEOUT_S:.0f}s"
+                    )
+                try:
+                    event = events.get(timeout=_POLL_S)
+                except queue.Empty:
+                    continue
+                # A page that arrived is kept even if it landed just past the limit; the check above enforces it
+                if event is None:
+                    proc.wait()
+                    if pages is not None and len(paths) == pages and proc.returncode == 0:
+                        return paths
+                    stderr.seek(0)
+                    tail = stderr.read()[-500:].decode("utf-8", errors="replace").strip()
+                    code = proc.returncode
+                    reason = "memory" if code in (-signal.SIGKILL, -signal.SIGSEGV, -signal.SIGABRT) else "crashed"
+                    raise RasterizationError(
+                        reason,
+                        f"Rasterizer worker exited with code {code} after {len(paths)} page(s)"
+                        + (f" (memory limit {RASTER_MEMORY_MB} MB?)" if reason == "memory" else "")
+                        + (f": {tail}" if tail else ""),
+                    )
+                if "error" in event:
+                    raise RasterizationError(event.get("reason", "failed"), event["error"])
+                if "pages" in event:
+                    pages = event["pages"]
+                elif "page" in event:
+                    paths.append(event["path"])
+                page_started = time.monotonic()
+        finally:
+            _kill(proc)
+            reader.join(timeout=1)
+            proc.stdout.close()
@@ -0,0 +1,286 @@
+"""
+PDF rasterizer backends.
+
+``pdf_to_images`` renders every page to a PNG through one of these backends:
+
+- ``pdfium``: in-process rendering with pypdfium2 (optional dependency, no
+  subprocess or temp files); used by default when installed
+- ``poppler``: ``pdftoppm`` writing PNGs straight into the output directory
+  (no PPM round trip); pdf2image is only used to read the page count
+
+Select a backend with ``PITCHPANDA_RASTERIZER`` (``auto``, ``pdfium`` or
+``poppler``) or the ``backend`` argument of ``pdf_to_images``.
+"""
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Type
+
+
+RASTER_DPI = 150
+DEFAULT_RASTERIZER = os.environ.get("PITCHPANDA_RASTERIZER", "auto")
+
+
+def slide_image_path(output_dir: str, deck_name: str, page: int) -> str:
+    """Path of the PNG for one page (1-based), shared by every backend."""
+    return os.path.join(output_dir, f"{deck_name}_slide_{page:03d}.png")
+
+
+class Rasterizer:
+    """Renders PDF pages to PNG files."""
+
+    name = "base"
+
+    @classmethod
+    def available(cls) -> bool:
+        """True if the backend's dependencies are installed."""
+        raise NotImplementedError
+
+    def page_count(self, pdf_path: str) -> int:
+        """Number of pages in the PDF."""
+        raise NotImplementedError
+
+    def render(
+        self,
+        pdf_path: str,
+        output_dir: str,
+        dpi: int = RASTER_DPI,
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+        on_page: Optional[Callable[[int, str], None]] = None,
+    ) -> List[str]:
+        """
+        Render a page range to PNG files.
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Directory for the PNG files (must exist)
+            dpi: Render resolution
+            first_page: First page to render (1-based)
+            last_page: Last page to render, inclusive (None = last page of the PDF)
+            on_page: Called with (page, path) as soon as each page is written
+
+        Returns:
+            Paths of the rendered PNGs, in page order
+        """
+        raise NotImplementedError
+
+
+class PopplerRasterizer(Rasterizer):
+    """poppler's ``pdftoppm``; one subprocess per call, whatever the page range."""
+
+    name = "poppler"
+    # How often a render with progress reporting checks for newly written pages
+    _POLL_S = 0.05
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import pdf2image  # noqa: F401
+        except ImportError:
+            return False
+        return shutil.which("pdftoppm") is not None
+
+    def page_count(self, pdf_path: str) -> int:
+        from pdf2image import pdfinfo_from_path
+
+        return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+    def render(self, pdf_path, output_dir, dpi=RASTER_DPI, first_page=1, last_page=None, on_page=None):
+        deck_name = Path(pdf_path).stem
+        # pdftoppm writes PNGs directly as <prefix>-<page>.png (zero padded); they are renamed once complete.
+        # Called directly rather than through pdf2image, which spawns pdfinfo and `pdftoppm -v` on every call.
+        prefix = f".{deck_name}_raster"
+        written = re.compile(rf"^{re.escape(prefix)}-(\d+)\.png$")
+        cmd = ["pdftoppm", "-r", str(dpi), "-png", "-f", str(first_page)]
+        if last_page is not None:
+            cmd += ["-l", str(last_page)]
+        cmd += [pdf_path, os.path.join(output_dir, prefix)]
+        paths: Dict[int, str] = {}
+
+        def collect(finished: bool) -> None:
+            pages = sorted(
+                (int(m.group(1)), m.group(0)) for m in map(written.match, os.listdir(output_dir)) if m
+            )
+            # Pages are rendered in order, so every file but the newest is complete while pdftoppm runs
+            for page, name in pages if finished else pages[:-1]:
+                if page in paths:
+                    continue
+                path = slide_image_path(output_dir, deck_name, page)
+                os.replace(os.path.join(output_dir, name), path)
+                paths[page] = path
+                if on_page is not None:
+                    on_page(page, path)
+
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=stderr)
+            try:
+                while True:
+                    try:
+                        proc.wait(timeout=self._POLL_S if on_page is not None else None)
+                        break
+                    except subprocess.TimeoutExpired:
+                        collect(finished=False)
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+            if proc.returncode != 0:
+                stderr.seek(0)
+                tail = stderr.read()[-300:].decode("utf-8", errors="replace").strip()
+                raise RuntimeError(f"pdftoppm exited with code {proc.returncode}: {tail}")
+        collect(finished=True)
+        return [paths[page] for page in sorted(paths)]
+
+
+class PdfiumRasterizer(Rasterizer):
+    """pypdfium2, rendered in-process."""
+
+    name = "pdfium"
+    # PDFium is not thread-safe; workers render one document at a time
+    _lock = threading.Lock()
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def page_count(self, pdf_path: str) -> int:
+        import pypdfium2 as pdfium
+
+        with self._lock:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    def render(self, pdf_path, output_dir, dpi=RASTER_DPI, first_page=1, last_page=None, on_page=None):
+        import pypdfium2 as pdfium
+
+        deck_name = Path(pdf_path).stem
+        paths = []
+        with self._lock:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                last_page = min(last_page or len(pdf), len(pdf))
+                for page_number in range(first_page, last_page + 1):
+                    page = pdf[page_number - 1]
+                    try:
+                        image = page.render(scale=dpi / 72).to_pil()
+                    finally:
+                        page.close()
+                    path = slide_image_path(output_dir, deck_name, page_number)
+                    image.save(path, "PNG")
+                    paths.append(path)
+                    if on_page is not None:
+                        on_page(page_number, path)
+            finally:
+                pdf.close()
+        return paths
+
+
+RASTERIZERS: Dict[str, Type[Rasterizer]] = {
+    PdfiumRasterizer.name: PdfiumRasterizer,
+    PopplerRasterizer.name: PopplerRasterizer,
+}
+
+
+def get_rasterizer(name: Optional[str] = None) -> Rasterizer:
+    """
+    Resolve a rasterizer backend.
+
+    Args:
+        name: Backend name, or "auto" for the first available one (default from PITCHPANDA_RASTERIZER)
+
+    Returns:
+        Rasterizer instance
+
+    Raises:
+        ValueError: Unknown backend name
+        ImportError: Requested backend (or, for "auto", every backend) is not installed
+    """
+    name = (name or DEFAULT_RASTERIZER).lower()
+    if name == "auto":
+        for backend in RASTERIZERS.values():
+            if backend.available():
+                return backend()
+        raise ImportError(
+            "No PDF rasterizer installed. Install pypdfium2 (pip install pypdfium2) "
+            "or pdf2image with poppler (pip install pdf2image; brew install poppler)"
+        )
+    if name not in RASTERIZERS:
+        raise ValueError(f"Unknown rasterizer '{name}' (choose from auto, {', '.join(RASTERIZERS)})")
+    backend = RASTERIZERS[name]
+    if not backend.available():
+        raise ImportError(f"Rasterizer '{name}' is not installed")
+    return backend()
+
+
+def _worker_main(argv: Optional[List[str]] = None) -> int:
+    """
+    Sandboxed worker entry point (see raster_sandbox.py).
+
+    Runs as ``python rasterizers.py`` so it only imports the standard library
+    and the chosen backend. Emits one JSON line per event on stdout:
+    ``{"pages": n}``, then ``{"page": i, "path": ...}`` per rendered page, or
+    ``{"error": ..., "reason": ...}``.
+    """
+    import argparse
+    import json
+    import resource
+    import sys
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf_path")
+    parser.add_argument("output_dir")
+    parser.add_argument("--backend", default=DEFAULT_RASTERIZER)
+    parser.add_argument("--dpi", type=int, default=RASTER_DPI)
+    parser.add_argument("--max-pages", type=int, default=0)
+    parser.add_argument("--memory-mb", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    def emit(**event):
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+
+    if args.memory_mb:
+        limit = args.memory_mb * 1024 * 1024
+        try:
+            # Inherited by pdftoppm children too
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass  # not enforceable on this platform (e.g. macOS)
+
+    try:
+        rasterizer = get_rasterizer(args.backend)
+        pages = rasterizer.page_count(args.pdf_path)
+        emit(pages=pages)
+        if args.max_pages and pages > args.max_pages:
+            emit(error=f"{pages} pages exceeds the limit of {args.max_pages}", reason="too_many_pages")
+            return 1
+        # One render call for the whole deck (one pdftoppm under poppler); pages are reported as they land
+        rasterizer.render(
+            args.pdf_path, args.output_dir, dpi=args.dpi, last_page=pages,
+            on_page=lambda page, path: emit(page=page, path=path),
+        )
+    except MemoryError:
+        emit(error=f"memory limit of {args.memory_mb} MB exceeded", reason="memory")
+        return 1
+    except Exception as e:
+        # Allocation failures under RLIMIT_AS often surface as mmap/loader errors
+        out_of_memory = any(m in str(e) for m in ("failed to map segment", "Cannot allocate memory", "out of memory"))
+        emit(error=f"{type(e).__name__}: {str(e)[:300]}", reason="memory" if out_of_memory else "failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_worker_main())
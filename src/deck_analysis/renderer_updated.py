@@ -1,7 +1,15 @@
 """
 Render pitch deck analysis to markdown with confidence levels.
 """
-from .schemas import DeckAnalysis
+from .schemas import DeckAnalysis, Metric
+from .text_layer import number_in_source
+
+
+def _source_flag(analysis: DeckAnalysis, metric: Metric) -> str:
+    """Warn when a number read from the slide images is not in the PDF text layer."""
+    if not analysis.source_numbers or number_in_source(metric.value, analysis.source_numbers):
+        return ""
+    return " ⚠️ *not found in PDF text*"
 
 
 def render_deck_markdown(analysis: DeckAnalysis) -> str:
@@ -88,7 +96,7 @@ def render_deck_markdown(analysis: DeckAnalysis) -> str:
                 
                 ctx = f" ({' - '.join(parts)})" if parts else ""
                 note = f"\n  > *Note: {metric.notes}*" if metric.notes else ""
-                lines.append(f"- **{metric.label}**: {metric.value}{ctx}{note}")
+                lines.append(f"- **{metric.label}**: {metric.value}{_source_flag(analysis, metric)}{ctx}{note}")
             lines.append("")
         
         # Traction
@@ -105,7 +113,7 @@ def render_deck_markdown(analysis: DeckAnalysis) -> str:
                 
                 ctx = f" ({' - '.join(parts)})" if parts else ""
                 note = f"\n  > *Note: {metric.notes}*" if metric.notes else ""
-                lines.append(f"- **{metric.label}**: {metric.value}{ctx}{note}")
+                lines.append(f"- **{metric.label}**: {metric.value}{_source_flag(analysis, metric)}{ctx}{note}")
             lines.append("")
         
         # Market Size
@@ -122,7 +130,7 @@ def render_deck_markdown(analysis: DeckAnalysis) -> str:
                 
                 ctx = f" ({' - '.join(parts)})" if parts else ""
                 note = f"\n  > *Note: {metric.notes}*" if metric.notes else ""
-                lines.append(f"- **{metric.label}**: {metric.value}{ctx}{note}")
+                lines.append(f"- **{metric.label}**: {metric.value}{_source_flag(analysis, metric)}{ctx}{note}")
             lines.append("")
         
         # Financials
@@ -139,7 +147,7 @@ def render_deck_markdown(analysis: DeckAnalysis) -> str:
                 
                 ctx = f" ({' - '.join(parts)})" if parts else ""
                 note = f"\n  > *Note: {metric.notes}*" if metric.notes else ""
-                lines.append(f"- **{metric.label}**: {metric.value}{ctx}{note}")
+                lines.append(f"- **{metric.label}**: {metric.value}{_source_flag(analysis, metric)}{ctx}{note}")
             lines.append("")
         
         # LOIs
@@ -156,7 +164,7 @@ def render_deck_markdown(analysis: DeckAnalysis) -> str:
                 
                 ctx = f" ({' - '.join(parts)})" if parts else ""
                 note = f"\n  > *Note: {metric.notes}*" if metric.notes else ""
-                lines.append(f"- **{metric.label}**: {metric.value}{ctx}{note}")
+                lines.append(f"- **{metric.label}**: {metric.value}{_source_flag(analysis, metric)}{ctx}{note}")
             lines.append("")
         
         # Other metrics
@@ -174,7 +182,7 @@ def render_deck_markdown(analysis: DeckAnalysis) -> str:
                     
                     ctx = f" ({' - '.join(parts)})" if parts else ""
                     note = f"\n  > *Note: {metric.notes}*" if metric.notes else ""
-                    lines.append(f"- **{metric.label}**: {metric.value}{ctx}{note}")
+                    lines.append(f"- **{metric.label}**: {metric.value}{_source_flag(analysis, metric)}{ctx}{note}")
                 lines.append("")
     
     # Team
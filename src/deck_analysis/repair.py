@@ -0,0 +1,180 @@
+"""
+Field-level repair of deck analysis JSON.
+
+When coercion has to drop a list item or default a field, the offending
+sub-tree is sent, together with its validation error, to a cheap text model
+and the corrected value is merged back in. No slide images are sent, so the
+multi-image vision call stays at exactly one per deck. Repairs run for at
+most ``MAX_REPAIR_ROUNDS`` rounds of at most ``MAX_REPAIRS_PER_ROUND`` fields.
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+import types
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union, get_args, get_origin
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+
+from .coercion import coerce_model
+from .schemas import DeckAnalysis
+from ..core.llm import get_structured_model
+from ..core.telemetry import record_event
+
+
+REPAIR_MODEL = "gpt-4o-mini"
+MAX_REPAIR_ROUNDS = int(os.environ.get("PITCHPANDA_REPAIR_ROUNDS", "2"))
+MAX_REPAIRS_PER_ROUND = 8
+
+REPAIR_PROMPT = """You fix one malformed value extracted from a startup pitch deck.
+
+You get the JSON path of the value, the validation error it produced and the value itself.
+Return the same information in the required schema:
+- keep every fact, number and wording from the original value; do not invent new facts
+- convert types where needed (e.g. a list of strings into one string, a number into a string)
+- use null for optional fields that are genuinely absent
+"""
+
+_PATH_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+_MISSING = object()
+
+
+def _parse_path(path: str) -> List[Any]:
+    return [int(index) if index else key for key, index in _PATH_TOKEN.findall(path)]
+
+
+def _get(data: Any, tokens: List[Any]) -> Any:
+    for token in tokens:
+        try:
+            data = data[token]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return data
+
+
+def _set(data: Any, tokens: List[Any], value: Any) -> None:
+    parent = _get(data, tokens[:-1])
+    parent[tokens[-1]] = value
+
+
+def _strip_optional(annotation):
+    if get_origin(annotation) in (Union, types.UnionType):
+        non_null = [a for a in get_args(annotation) if a is not type(None)]
+        if len(non_null) == 1:
+            return non_null[0]
+    return annotation
+
+
+def _annotation_at(model, tokens: List[Any]):
+    """Field annotation addressed by a coercion path (None if it can't be resolved)."""
+    annotation = model
+    for token in tokens:
+        annotation = _strip_optional(annotation)
+        origin = get_origin(annotation)
+        if isinstance(token, int):
+            if origin is not list:
+                return None
+            annotation = get_args(annotation)[0]
+        elif origin is dict:
+            annotation = get_args(annotation)[1]
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            field = annotation.model_fields.get(token)
+            if field is None:
+                return None
+            annotation = field.annotation
+        else:
+            return None
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _wrapper(annotation) -> type:
+    """Single-field model so any sub-schema can be requested as a strict object."""
+    # Schema names are capped at 64 characters; the hash keeps long annotations that share a prefix apart
+    full = repr(annotation)
+    digest = hashlib.sha1(full.encode()).hexdigest()[:12]
+    name = f"Repair_{re.sub(r'[^A-Za-z0-9]+', '_', full).strip('_')[:40]}_{digest}"
+    return create_model(name, value=(annotation, ...))
+
+
+def _outermost(paths: List[str]) -> List[str]:
+    """Drop paths nested under another path in the list (the parent gets repaired whole)."""
+    ordered = sorted(set(paths), key=len)
+    kept: List[str] = []
+    for path in ordered:
+        if not any(path.startswith(parent + ".") or path.startswith(parent + "[") for parent in kept):
+            kept.append(path)
+    return kept
+
+
+def _repair_value(path: str, annotation, value: Any) -> Any:
+    """Ask the text model to correct one value; returns plain JSON data."""
+    try:
+        TypeAdapter(annotation).validate_python(value)
+        error = "value was dropped during coercion"
+    except ValidationError as e:
+        error = str(e)[:1500]
+    llm = get_structured_model(_wrapper(annotation), REPAIR_MODEL, temperature=0)
+    result = llm.invoke([
+        SystemMessage(content=REPAIR_PROMPT),
+        HumanMessage(content=(
+            f"Path: {path}\n\nValidation error:\n{error}\n\n"
+            f"Value:\n{json.dumps(value, ensure_ascii=False, default=str)[:6000]}"
+        )),
+    ])
+    return result.model_dump(mode="json")["value"]
+
+
+def repair_analysis(
+    raw: Dict[str, Any],
+    analysis: DeckAnalysis,
+    issues: List[str],
+    max_rounds: int = MAX_REPAIR_ROUNDS,
+) -> Tuple[DeckAnalysis, List[str], int]:
+    """
+    Repair the values coercion could not keep, then re-coerce.
+
+    Args:
+        raw: Raw analysis JSON (including deck_name/total_slides)
+        analysis: Result of the first coercion pass
+        issues: Paths reported by that pass
+        max_rounds: Maximum repair rounds
+
+    Returns:
+        (analysis, remaining issues, number of values repaired)
+    """
+    raw = copy.deepcopy(raw)
+    repaired = 0
+    for round_number in range(max_rounds):
+        targets = []
+        for path in _outermost(issues):
+            tokens = _parse_path(path)
+            value = _get(raw, tokens)
+            annotation = _annotation_at(DeckAnalysis, tokens)
+            if value is _MISSING or value is None or annotation is None:
+                continue
+            targets.append((path, tokens, annotation, value))
+        if not targets:
+            break
+
+        record_event("deck_repair.rounds")
+        for path, tokens, annotation, value in targets[:MAX_REPAIRS_PER_ROUND]:
+            try:
+                _set(raw, tokens, _repair_value(path, annotation, value))
+                repaired += 1
+            except Exception as e:
+                print(f"  Repair of '{path}' failed: {str(e)[:200]}")
+
+        analysis, remaining = coerce_model(DeckAnalysis, raw)
+        print(f"  Repair round {round_number + 1}: {len(issues)} -> {len(remaining)} malformed value(s)")
+        if set(remaining) == set(issues):
+            issues = remaining
+            break
+        issues = remaining
+
+    if repaired:
+        record_event("deck_repair.fields", repaired)
+    return analysis, issues, repaired
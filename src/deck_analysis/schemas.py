@@ -13,6 +13,7 @@ class Metric(BaseModel):
     is_projection: bool = False  # True if this is a future projection
     confidence: str = "high"  # "high" (explicitly labeled), "medium" (inferred), "low" (vague/uncertain)
     notes: Optional[str] = None  # e.g., "Seems unrealistic", "Label unclear", "Inferred from context"
+    slide_number: Optional[int] = None  # Slide the number was read from
 
 
 class TeamMember(BaseModel):
@@ -117,6 +118,28 @@ class SlideInsight(BaseModel):
     data_items: List[str] = Field(default_factory=list)  # Specific data points or numbers mentioned
     
 
+class SlideResult(BaseModel):
+    """Everything extracted from one slide; the unit cached across deck versions."""
+    insight: SlideInsight
+    metrics: Dict[str, List[Metric]] = Field(default_factory=dict)  # Same categories as DeckAnalysis.metrics
+
+
+class SlideBatch(BaseModel):
+    """Vision reply for a subset of slides."""
+    slides: List[SlideResult] = Field(default_factory=list)
+
+
+class SlideTriage(BaseModel):
+    """Low-detail classification of one slide."""
+    slide_number: int
+    category: str  # "cover", "team", "market", "traction", "financials", "appendix", "filler"
+
+
+class DeckTriage(BaseModel):
+    """Triage reply covering every slide sent."""
+    slides: List[SlideTriage] = Field(default_factory=list)
+
+
 class DeckAnalysis(BaseModel):
     """Complete pitch deck analysis - factual and unbiased."""
     deck_name: str
@@ -203,6 +226,7 @@ class DeckAnalysis(BaseModel):
     present_elements: List[str] = Field(default_factory=list)  # What IS in the deck
     missing_elements: List[str] = Field(default_factory=list)  # Standard elements NOT in deck
     data_quality_notes: Optional[str] = None  # Notes on explicit vs vague labeling
+    source_numbers: List[str] = Field(default_factory=list)  # Numbers in the PDF text layer (set by code, empty for image-only decks)
     
     # Overall assessment notes
     deck_quality_assessment: Optional[str] = None  # Overall impression of deck quality, completeness
@@ -0,0 +1,122 @@
+"""
+Per-slide analysis cache shared across versions of the same deck.
+
+Each rendered slide is keyed by a content hash of a normalised thumbnail
+(grayscale, fixed width, quantised), so re-exports of an unchanged slide
+from PowerPoint/Keynote/Google Slides hit the cache even if the PNG bytes
+differ slightly. A hit stores the ``SlideResult`` (insight plus metrics) the
+vision model produced for that slide; only new or changed slides are sent to
+the vision model again.
+
+Results are stored under ``cache_key(content_hash, model, detail)``, so an
+analysis made from a low-detail image (a triaged cover or filler slide) is
+never served where a high-detail one is needed.
+
+Entries are one JSON file per slide under ``SLIDE_CACHE_DIR``. Bump
+``SLIDE_CACHE_VERSION`` whenever the deck prompt or schema changes in a way
+that invalidates earlier extractions.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from pydantic import ValidationError
+
+from .schemas import SlideResult
+
+
+SLIDE_CACHE_VERSION = "1"
+SLIDE_CACHE_DIR = os.environ.get(
+    "PITCHPANDA_SLIDE_CACHE",
+    os.path.join(os.path.dirname(__file__), "..", "..", "output", "slide_cache"),
+)
+
+# Thumbnail used for hashing: small enough to ignore encoder noise, large enough to see edits
+HASH_WIDTH = 512
+HASH_LEVELS = 32
+
+
+def slide_hash(image_path: str, namespace: str = "") -> str:
+    """
+    Content hash of a rendered slide.
+
+    Args:
+        image_path: Path to the slide PNG
+        namespace: Extra key material (e.g. vision model name)
+
+    Returns:
+        Hex digest identifying the slide content
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        gray = img.convert("L")
+        height = max(1, round(gray.height * HASH_WIDTH / max(1, gray.width)))
+        thumb = gray.resize((HASH_WIDTH, height), Image.Resampling.BILINEAR)
+        step = 256 // HASH_LEVELS
+        pixels = bytes(p // step for p in thumb.tobytes())
+
+    digest = hashlib.sha1(f"{SLIDE_CACHE_VERSION}|{namespace}|{thumb.size}|".encode())
+    digest.update(pixels)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str, model: str, detail: str = "high") -> str:
+    """
+    Cache key for a slide analyzed by ``model`` at image ``detail``.
+
+    Args:
+        content_hash: ``slide_hash`` of the rendered slide
+        model: Vision model that produced the result
+        detail: Image detail the slide was sent at ("high" or "low")
+
+    Returns:
+        Hex digest
+    """
+    return hashlib.sha1(f"{content_hash}|{model}|{detail}".encode()).hexdigest()
+
+
+class SlideCache:
+    """Directory of cached ``SlideResult`` objects keyed by slide hash."""
+
+    def __init__(self, directory: str = SLIDE_CACHE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[SlideResult]:
+        """Cached result for a slide hash (None on miss or unreadable entry)."""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return SlideResult.model_validate(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, ValidationError) as e:
+            print(f"  Ignoring unreadable slide cache entry {key[:10]}: {str(e)[:120]}")
+            return None
+
+    def get_many(self, keys: Dict[int, str]) -> Dict[int, SlideResult]:
+        """Look up several slides at once; returns only the hits, by slide number."""
+        hits = {}
+        for slide_number, key in keys.items():
+            result = self.get(key)
+            if result is not None:
+                hits[slide_number] = result
+        return hits
+
+    def put(self, key: str, result: SlideResult) -> None:
+        """Store a slide result (written atomically; concurrent writers are fine)."""
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(result.model_dump(mode="json"), f, ensure_ascii=False)
+            os.replace(tmp, path)
+
+
+slide_cache = SlideCache()
@@ -0,0 +1,248 @@
+"""
+Local number extraction from the PDF text layer.
+
+Most decks exported from PowerPoint, Keynote or Google Slides keep their text
+layer, so funding amounts, percentages and table figures can be read without
+the vision model. ``pdftotext`` (part of poppler, already required by
+pdf2image) dumps each page with its layout preserved; numeric tokens are
+picked out of every line and turned into candidate ``Metric`` objects with
+the slide they came from. The vision prompt then only has to confirm and
+label them, and numbers reported by the model can be checked against the
+source (``number_in_source``).
+
+Scanned or image-only decks have no text layer; every function here then
+returns empty results and the pipeline behaves as before.
+"""
+import re
+import shutil
+import subprocess
+from typing import Dict, Iterable, List, Optional, Set
+
+from .schemas import Metric
+from ..core.deadlines import remaining
+
+
+PDFTOTEXT_TIMEOUT = 30
+# Candidates are hints for the vision call; keep the prompt small on number-heavy decks
+MAX_CANDIDATES = 120
+
+_SCALES = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mn": 1e6, "mio": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+    "t": 1e12, "tn": 1e12, "trillion": 1e12,
+}
+_CURRENCY = r"(?:[$€£¥]|usd|eur|gbp|chf)"
+# Thousands separators: comma, dot, no-break space, thin space, narrow no-break space (never a plain space,
+# which would join "Q3 2025" into 32025)
+_NUMBER = re.compile(
+    rf"(?<![^\W\d_])(?P<currency>{_CURRENCY})?\s?"
+    r"(?P<number>\d{1,3}(?:[,.\u00a0\u2009\u202f]\d{3})+(?!\d)(?:\.\d+)?|\d+(?:[.,]\d+)?)"
+    r"\s?(?P<scale>thousand|million|billion|trillion|mio|mn|mm|bn|tn|[kmbt](?![a-z]))?"
+    rf"\s?(?P<suffix>%|x(?![a-z])|{_CURRENCY})?",
+    re.IGNORECASE,
+)
+_YEAR = re.compile(r"^(?:19|20)\d{2}$")
+_COLUMNS = re.compile(r"\s{2,}")
+
+# Keyword -> metric category (first match on the line wins)
+_CATEGORY_KEYWORDS = [
+    ("funding", ("raise", "raising", "seed", "series", "round", "funding", "invest", "valuation", "safe", "grant")),
+    ("market_size", ("tam", "sam", "som", "market size", "addressable", "market")),
+    ("lois", ("loi", "letter of intent", "letters of intent")),
+    ("traction", ("user", "customer", "client", "mrr", "arr", "growth", "pilot", "download", "subscriber", "retention")),
+    ("financials", ("revenue", "ebitda", "margin", "burn", "cost", "profit", "cac", "ltv", "runway", "gmv", "price")),
+]
+
+
+def extract_page_texts(pdf_path: str) -> List[str]:
+    """
+    Text layer of every page, layout preserved.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        One string per page (empty list if pdftotext is unavailable or fails)
+    """
+    if shutil.which("pdftotext") is None:
+        print("  pdftotext not found, skipping text layer extraction")
+        return []
+    try:
+        result = subprocess.run(
+            ["pdftotext", "-layout", "-enc", "UTF-8", pdf_path, "-"],
+            capture_output=True, timeout=min(PDFTOTEXT_TIMEOUT, remaining(PDFTOTEXT_TIMEOUT)), check=True,
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"  Text layer extraction failed: {str(e)[:200]}")
+        return []
+    pages = result.stdout.decode("utf-8", errors="replace").split("\f")
+    # pdftotext ends the last page with a form feed too
+    if pages and not pages[-1].strip():
+        pages.pop()
+    return pages
+
+
+def _to_float(number: str) -> Optional[float]:
+    digits = re.sub(r"\s", "", number)
+    if re.fullmatch(r"\d{1,3}(?:[,.]\d{3})+", digits) and len(set(re.findall(r"[,.]", digits))) == 1:
+        digits = re.sub(r"[,.]", "", digits)  # thousands separators only
+    else:
+        digits = digits.replace(",", "") if "." in digits else digits.replace(",", ".")
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def _canonical(value: float) -> str:
+    return f"{value:.6g}"
+
+
+def parse_numbers(text: str) -> Set[str]:
+    """
+    Canonical forms of every number in a string.
+
+    Both the plain and the scaled value are included ("$1.5M" gives "1.5"
+    and "1.5e+06"), so "1.5" in a table headed "($M)" still matches.
+
+    Args:
+        text: Any text (a metric value, a PDF line)
+
+    Returns:
+        Set of canonical number strings
+    """
+    found = set()
+    for match in _NUMBER.finditer(text or ""):
+        value = _to_float(match.group("number"))
+        if value is None:
+            continue
+        found.add(_canonical(value))
+        scale = (match.group("scale") or "").lower()
+        if scale in _SCALES:
+            found.add(_canonical(value * _SCALES[scale]))
+    return found
+
+
+def number_in_source(value: str, source_numbers: Iterable[str]) -> bool:
+    """True if any number in ``value`` appears in the PDF text layer (or value has no numbers)."""
+    numbers = {n for n in parse_numbers(value) if not _YEAR.match(n)} or parse_numbers(value)
+    return not numbers or bool(numbers & set(source_numbers))
+
+
+def _category(line: str) -> str:
+    lowered = line.lower()
+    for category, keywords in _CATEGORY_KEYWORDS:
+        if any(re.search(rf"\b{re.escape(k)}", lowered) for k in keywords):
+            return category
+    return "other"
+
+
+def _is_table_row(cells: List[str]) -> bool:
+    """A label cell followed by at least two number cells."""
+    return len(cells) >= 3 and not _NUMBER.search(cells[0]) and all(_NUMBER.search(c) for c in cells[1:])
+
+
+def _is_interesting(match: re.Match, in_table: bool) -> bool:
+    """Skip bare small integers, years and page numbers unless they carry a unit or sit in a table."""
+    if match.group("currency") or match.group("scale") or match.group("suffix"):
+        return True
+    value = _to_float(match.group("number"))
+    if value is None or _YEAR.match(match.group("number")):
+        return False
+    return in_table or value >= 1000
+
+
+def _label(cells: List[str], line: str, match: re.Match, start: int) -> str:
+    """Row label for table lines, else the words between the previous number and this one."""
+    if _is_table_row(cells):
+        return cells[0].strip()[:80]
+    before = line[start: match.start()].strip(" :-–|")
+    words = re.findall(r"[A-Za-z][\w&/+-]*", before)[-5:]
+    return " ".join(words) if words else "Unlabeled number"
+
+
+def _header(lines: List[str], index: int) -> Optional[str]:
+    """Column header above a table row: the first preceding line that is not itself a table row."""
+    for previous in reversed(lines[max(0, index - 12): index]):
+        cells = [c for c in _COLUMNS.split(previous.strip()) if c]
+        if _is_table_row(cells):
+            continue
+        if len(cells) >= 2 and all(len(c) <= 20 for c in cells):
+            return " | ".join(cells)
+        return None
+    return None
+
+
+def extract_metric_candidates(page_texts: List[str]) -> Dict[str, List[Metric]]:
+    """
+    Candidate metrics from the text layer, grouped by category.
+
+    Args:
+        page_texts: Output of ``extract_page_texts`` (one string per slide)
+
+    Returns:
+        Category -> candidate ``Metric`` list with ``slide_number`` set
+    """
+    candidates: Dict[str, List[Metric]] = {}
+    seen = set()
+    total = 0
+    for slide_number, text in enumerate(page_texts, start=1):
+        lines = text.splitlines()
+        for index, line in enumerate(lines):
+            cells = [c for c in _COLUMNS.split(line.strip()) if c]
+            in_table = _is_table_row(cells)
+            previous_end = 0
+            for match in _NUMBER.finditer(line):
+                start, previous_end = previous_end, match.end()
+                if not _is_interesting(match, in_table):
+                    continue
+                value = match.group(0).strip()
+                label = _label(cells, line, match, start)
+                key = (slide_number, label, value)
+                if key in seen:
+                    continue
+                seen.add(key)
+                header = _header(lines, index) if in_table else None
+                context = line.strip()[:160] if header is None else f"{header} :: {line.strip()}"[:200]
+                candidates.setdefault(_category(line), []).append(Metric(
+                    label=label,
+                    value=value,
+                    context=context,
+                    is_projection=bool(re.search(r"\b(?:target|forecast|projected|expected|plan|by 20\d\d)\b", line, re.I)),
+                    confidence="medium",
+                    notes="Text layer candidate",
+                    slide_number=slide_number,
+                ))
+                total += 1
+                if total >= MAX_CANDIDATES:
+                    return candidates
+    return candidates
+
+
+def source_numbers(page_texts: List[str]) -> List[str]:
+    """Sorted canonical numbers present anywhere in the text layer."""
+    numbers = set()
+    for text in page_texts:
+        numbers |= parse_numbers(text)
+    return sorted(numbers)
+
+
+def format_candidates(candidates: Dict[str, List[Metric]], slide_numbers: Optional[Set[int]] = None) -> str:
+    """
+    Compact one-line-per-candidate listing for the vision prompt.
+
+    Args:
+        candidates: Output of ``extract_metric_candidates``
+        slide_numbers: Only list candidates from these slides (all if None)
+
+    Returns:
+        Text block (empty if there are no candidates)
+    """
+    lines = []
+    for category, metrics in candidates.items():
+        for metric in metrics:
+            if slide_numbers is not None and metric.slide_number not in slide_numbers:
+                continue
+            lines.append(f"- slide {metric.slide_number} | {category} | {metric.label} | {metric.value} | {metric.context}")
+    return "\n".join(lines)
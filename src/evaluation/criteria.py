@@ -0,0 +1,199 @@
+"""
+Scoring criteria and section-targeted context for the evaluation stage.
+
+Each of the six criteria has its own rubric block and the list of merged
+analysis sections (``## ...`` headings written by the merge renderer) it
+needs. ``criterion_context`` cuts the merged markdown down to those
+sections, so the per-criterion calls in ``graph.py`` only read what is
+relevant to them. The single-call rubric (``EVALUATION_SYSTEM_PROMPT``) is
+assembled from the same blocks.
+"""
+import re
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+
+class CriterionSpec(NamedTuple):
+    """A scoring criterion: ``CompanyEvaluation`` field, display name, rubric and context sections."""
+    field: str
+    title: str
+    rubric: str
+    sections: Tuple[str, ...]
+
+
+EVALUATOR_PREAMBLE = """You are a CRITICAL venture capital analyst evaluating startups for a high-growth VC fund seeking 3-5x returns and potential unicorns.
+
+**BE TOUGH**: You're investing millions seeking billion-dollar exits. Most startups will fail. Be objective but demanding."""
+
+SCORING_REMINDER = """**Remember**: You're protecting LP money and seeking exceptional returns. A "3" is average. Most companies are 2-3. Only truly exceptional companies deserve 4-5."""
+
+GROWTH_GUIDANCE = """**GROWTH METRICS - BE CRITICAL**:
+- **MRR/ARR**: Anything <$100K MRR after 2+ years is concerning. $50K MRR after 4 years is a RED FLAG.
+- **Growth rate**: Need >3x YoY. <50% YoY is weak. Flat is failing.
+- **Unit economics**: Need clear path to profitability. CAC payback >24 months is concerning.
+- **Burn rate**: Runway <12 months without clear revenue ramp is risky.
+
+**PROJECTIONS**:
+- Most projections are overly optimistic. Haircut aggressive forecasts by 50-70%.
+- Question assumptions: customer acquisition, pricing, market penetration, competition.
+- Red flag: Hockey stick projections without historical validation."""
+
+COMPETITOR_GUIDANCE = """**COMPETITOR ANALYSIS**:
+- Group competitors intelligently (e.g., "Enterprise SaaS competitors", "Direct B2C rivals", "Indirect alternatives")
+- Don't list features - focus on competitive positioning and defensibility
+- Be honest about threats from well-funded or established players"""
+
+COMMENTS_GUIDANCE = """**FINAL COMMENTS** - Include critical observations:
+- Revenue metrics (MRR, ARR, growth rate) - be specific and critical
+- Financial health (burn rate, runway, unit economics)
+- Red flags (team gaps, market risks, competitive threats, unrealistic projections)
+- Unique strengths (proprietary tech, exclusive partnerships, viral growth)
+- VC fit: Is this a potential unicorn or just a nice lifestyle business?
+- Deal concerns: valuation expectations, dilution, governance"""
+
+# Section headings are matched case-insensitively on their words ("## 👥 Team" -> "team")
+CRITERIA: List[CriterionSpec] = [
+    CriterionSpec(
+        field="team",
+        title="Team",
+        rubric="""**Team** (1-5)
+   - 1: Solo founder, no relevant experience, or weak team
+   - 2: Small team with limited track record or domain expertise
+   - 3: Competent team with relevant experience but no proven exits
+   - 4: Strong team with domain expertise, prior startup experience, or 1 exit
+   - 5: Exceptional team with multiple successful exits, deep expertise, complementary skills
+
+   **Red flags**: First-time founders without advisors, missing key roles (tech/business/sales), team imbalances""",
+        sections=("company overview", "team", "awards recognition"),
+    ),
+    CriterionSpec(
+        field="technology",
+        title="Technology",
+        rubric="""**Technology** (1-5)
+   - 1: Just an idea or concept, no code/product
+   - 2: Early MVP or prototype, not market-tested
+   - 3: Working product with early users but limited scalability or technical depth
+   - 4: Production product with proven scalability, some technical moat
+   - 5: Market-leading technology with strong IP, proprietary data, or significant technical barriers
+
+   **Red flags**: Non-proprietary tech, easily replicable, outdated tech stack, technical debt""",
+        sections=("company overview", "problem solution", "technology", "competitive advantages ip"),
+    ),
+    CriterionSpec(
+        field="market",
+        title="Market",
+        rubric="""**Market** (1-5) - **CRITICAL FOR VCs**
+   - 1: TAM <$1B (too small for VC scale) or unclear/unproven market
+   - 2: TAM $1-5B (small for venture scale, niche play)
+   - 3: TAM $5-20B (acceptable but needs dominant market share for unicorn status)
+   - 4: TAM $20-50B (large market with clear growth trajectory)
+   - 5: TAM >$50B (massive market with secular tailwinds and rapid growth)
+
+   **Be ruthless**: Anything under $1B TAM is an automatic concern. We need billion-dollar outcomes. Question inflated TAM calculations.""",
+        sections=("company overview", "market information", "financial data traction", "go to market strategy"),
+    ),
+    CriterionSpec(
+        field="value_proposition",
+        title="Value Proposition",
+        rubric="""**Value Proposition** (1-5)
+   - 1: Weak problem-solution fit, "vitamin" not "painkiller"
+   - 2: Addresses minor pain point, unclear willingness to pay
+   - 3: Solves real problem but competitive or incremental improvement
+   - 4: Clear painkiller with strong differentiation and pricing power
+   - 5: 10x better solution, creates new category, customers desperately need it
+
+   **Red flags**: "Nice to have" products, unclear ROI, long sales cycles with weak value prop""",
+        sections=("company overview", "problem solution", "business model", "customer evidence validation"),
+    ),
+    CriterionSpec(
+        field="competitive_advantage",
+        title="Competitive Advantage / MOAT",
+        rubric="""**Competitive Advantage / MOAT** (1-5)
+   - 1: No moat, commodity product, easily copied
+   - 2: Weak defensibility, first-mover advantage only
+   - 3: Some moat (brand, switching costs) but vulnerable
+   - 4: Strong moat (network effects, data moat, high switching costs, IP)
+   - 5: Multiple compounding moats, near-impossible to replicate (e.g., regulatory, exclusive data, strong network effects)
+
+   **Critical**: Without a moat, even great execution gets competed away. Look for sustainable advantages.""",
+        sections=("company overview", "competitive advantages ip", "competitive landscape", "technology"),
+    ),
+    CriterionSpec(
+        field="social_impact",
+        title="Social Impact",
+        rubric="""**Social Impact** (1-5)
+   - 1: No social impact or potentially negative
+   - 2: Minor positive impact, limited scope
+   - 3: Moderate impact in specific area (sustainability, access, health)
+   - 4: Significant impact addressing important societal challenge
+   - 5: Transformative impact on critical global problem (climate, health, inequality)
+
+   **Note**: Important for ESG funds but secondary to returns for most VCs""",
+        sections=("company overview", "problem solution", "awards recognition", "additional insights"),
+    ),
+]
+CRITERIA_BY_FIELD: Dict[str, CriterionSpec] = {c.field: c for c in CRITERIA}
+
+# Context for the aggregation call (competitor groups and final comments)
+SUMMARY_SECTIONS = (
+    "company overview", "business model", "financial data traction",
+    "competitive landscape", "analysis notes",
+)
+
+_HEADING = re.compile(r"^##(?!#)\s*(.+?)\s*$", re.MULTILINE)
+
+
+def _heading_key(heading: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", heading.lower()))
+
+
+def split_sections(markdown: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Split a merged analysis into its top-level sections.
+
+    Args:
+        markdown: merged_analysis.md content
+
+    Returns:
+        (text before the first ``##`` heading, normalized heading -> section text)
+    """
+    matches = list(_HEADING.finditer(markdown))
+    if not matches:
+        return markdown, {}
+    preamble = markdown[: matches[0].start()]
+    sections: Dict[str, str] = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(markdown)
+        key = _heading_key(match.group(1))
+        sections[key] = sections.get(key, "") + markdown[match.start(): end]
+    return preamble, sections
+
+
+def select_sections(markdown: str, wanted: Sequence[str]) -> str:
+    """
+    Keep only the given sections (plus the title block) of a merged analysis.
+
+    Falls back to the full text when none of the sections are present, e.g.
+    for hand-written or legacy analyses with different headings.
+
+    Args:
+        markdown: merged_analysis.md content
+        wanted: Normalized section headings, in output order
+
+    Returns:
+        Reduced markdown
+    """
+    preamble, sections = split_sections(markdown)
+    picked = [sections[key].rstrip() for key in wanted if key in sections]
+    if not picked:
+        return markdown
+    return "\n\n".join([preamble.rstrip()] + picked).strip() + "\n"
+
+
+def criterion_context(markdown: str, field: str) -> str:
+    """Sections of the merged analysis relevant to one criterion."""
+    return select_sections(markdown, CRITERIA_BY_FIELD[field].sections)
+
+
+def full_rubric() -> str:
+    """All six rubric blocks, numbered, as used by the single-call prompt."""
+    return "\n\n".join(f"{i}. {c.rubric}" for i, c in enumerate(CRITERIA, start=1))
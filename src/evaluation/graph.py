@@ -1,14 +1,45 @@
 """
 LangGraph pipeline for company evaluation and scoring.
+
+Two modes (``PITCHPANDA_EVAL_MODE``):
+
+- ``parallel`` (default): the six criteria are scored by concurrent calls,
+  each reading only the merged sections relevant to it (see ``criteria.py``),
+  then one small call groups competitors and writes the final comments.
+  Latency is roughly the slowest criterion plus the aggregation call.
+- ``single``: one call with the full rubric and the full merged analysis.
+
+Setting ``rubrics`` in the state to anything other than ``["vc"]`` evaluates
+each named rubric (see ``rubrics.py``) instead, concurrently, over the merged
+analysis sent as a shared cached prefix; ``evaluations`` then holds one
+``CompanyEvaluation`` per rubric.
 """
+import contextvars
 import os
-from typing import TypedDict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, TypedDict, Optional
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
 
-from .schemas import CompanyEvaluation
+from .criteria import (
+    COMMENTS_GUIDANCE,
+    COMPETITOR_GUIDANCE,
+    CRITERIA,
+    EVALUATOR_PREAMBLE,
+    GROWTH_GUIDANCE,
+    SCORING_REMINDER,
+    SUMMARY_SECTIONS,
+    CriterionSpec,
+    criterion_context,
+    full_rubric,
+    select_sections,
+)
+from .rubrics import DEFAULT_RUBRIC, Rubric, get_rubric, rubric_instructions, weighted_overall
+from .schemas import CompanyEvaluation, Criterion, EvaluationSummary
+from ..core.cascade import run_cascade
+from ..core.llm import get_structured_model
+from ..core.prompt_cache import cacheable_prompt, shared_prefix_prompt
+from ..core.telemetry import record_event, traced_node, tracer
 
 # Load environment variables
 load_dotenv()
@@ -19,9 +50,134 @@ class EvaluationState(TypedDict):
     company_name: str
     merged_analysis_path: Optional[str]
     merged_content: Optional[str]
+    rubrics: Optional[List[str]]
+    criteria: Optional[dict]
     evaluation: Optional[dict]
+    evaluations: Optional[Dict[str, dict]]
+
+
+EVALUATION_MODE = os.environ.get("PITCHPANDA_EVAL_MODE", "parallel").lower()
+EVALUATION_MODEL = "gpt-4o"
+# Fields a cheap-model reply must fill before the cascade accepts it
+EVALUATION_REQUIRED = tuple(f"{spec.field}.reasoning" for spec in CRITERIA) + ("comments",)
+# Multi-rubric runs: send the first rubric alone so the shared analysis prefix is
+# cached before the others fan out (concurrent first requests all miss the cache)
+WARM_SHARED_PREFIX = True
+
+
+# Static rubric is the system message so the provider can cache it;
+# the company-specific analysis follows in the human message
+EVALUATION_SYSTEM_PROMPT = f"""{EVALUATOR_PREAMBLE}
+
+The company analysis to evaluate is provided in the user message.
+
+SCORING CRITERIA (1-5 scale) - **VC PERSPECTIVE**:
+
+{full_rubric()}
+
+---
+
+{GROWTH_GUIDANCE}
+
+{COMPETITOR_GUIDANCE}
+
+{COMMENTS_GUIDANCE}
+
+{SCORING_REMINDER}
+"""
+
+EVALUATION_INPUT_PROMPT = """Company: {company_name}
+
+# COMPANY ANALYSIS:
+
+{merged_content}
+
+---
+
+Provide your CRITICAL evaluation with scores, detailed reasoning for each score, competitor grouping, and brutally honest final comments about investment potential.
+"""
+
+# Per-criterion mode: one static system prompt per criterion (its own cache prefix)
+CRITERION_SYSTEM_PROMPT = """{preamble}
+
+The sections of the company analysis relevant to this criterion are provided in the user message. Score ONLY this criterion.
+
+SCORING CRITERION (1-5 scale) - **VC PERSPECTIVE**:
+
+{rubric}
+
+{reminder}
+"""
+
+CRITERION_INPUT_PROMPT = """Company: {company_name}
+
+# COMPANY ANALYSIS ({criterion_title} sections):
+
+{context}
+
+---
+
+Provide your CRITICAL {criterion_title} score with detailed reasoning grounded in the analysis above.
+"""
+
+SUMMARY_SYSTEM_PROMPT = f"""{EVALUATOR_PREAMBLE}
+
+The criterion scores have already been decided by your colleagues; do not re-score. The user message contains their scores and reasoning, followed by the business, financial and competitive sections of the company analysis. Group the competitors and write the final comments.
+
+{GROWTH_GUIDANCE}
+
+{COMPETITOR_GUIDANCE}
+
+{COMMENTS_GUIDANCE}
+
+{SCORING_REMINDER}
+"""
+
+SUMMARY_INPUT_PROMPT = """Company: {company_name}
+
+# CRITERION SCORES:
+
+{scores}
+
+# COMPANY ANALYSIS (business, financial and competitive sections):
+
+{context}
+
+---
+
+Provide the competitor grouping and brutally honest final comments about investment potential.
+"""
+
+
+# Multi-rubric mode: [static system, company analysis (shared), rubric]
+RUBRIC_SYSTEM_PROMPT = """You are a venture capital analyst evaluating startups on behalf of a specific fund.
+
+The user message first provides the company analysis, then the scoring rubric of the fund you are evaluating for. Apply that rubric strictly: its perspective, criterion scales, guidance and weights replace any general view. Score all six criteria with detailed reasoning, group the competitors, and write brutally honest final comments from that fund's point of view.
+"""
+
+RUBRIC_CONTEXT_PROMPT = """Company: {company_name}
+
+# COMPANY ANALYSIS:
 
+{merged_content}
+"""
+
+RUBRIC_TASK_PROMPT = """# RUBRIC: {rubric_title}
+
+{rubric}
+
+Provide your CRITICAL evaluation under this rubric.
+"""
+
+
+def criterion_system_prompt(spec: CriterionSpec) -> str:
+    """Static system prompt for one criterion."""
+    return CRITERION_SYSTEM_PROMPT.format(
+        preamble=EVALUATOR_PREAMBLE, rubric=spec.rubric, reminder=SCORING_REMINDER,
+    )
 
+
+@traced_node("evaluation")
 def load_merged_analysis(state: EvaluationState) -> dict:
     """Load merged analysis content from file."""
     print("  📖 Loading merged analysis...")
@@ -38,133 +194,182 @@ def load_merged_analysis(state: EvaluationState) -> dict:
     return {"merged_content": merged_content}
 
 
+@traced_node("evaluation")
 def evaluate_company(state: EvaluationState) -> dict:
     """Evaluate company with LLM scoring."""
     print(" Evaluating company...")
     
-    # Initialize LLM with structured output
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    structured_llm = llm.with_structured_output(CompanyEvaluation)
-    
     company_name = state.get("company_name", "Unknown")
     merged_content = state.get("merged_content")
     
     if not merged_content:
         raise ValueError("No merged analysis content available to evaluate")
     
-    # Create evaluation prompt
-    prompt_template = """You are a CRITICAL venture capital analyst evaluating startups for a high-growth VC fund seeking 3-5x returns and potential unicorns.
-
-**BE TOUGH**: You're investing millions seeking billion-dollar exits. Most startups will fail. Be objective but demanding.
-
-Company: {company_name}
-
-SCORING CRITERIA (1-5 scale) - **VC PERSPECTIVE**:
-
-1. **Team** (1-5)
-   - 1: Solo founder, no relevant experience, or weak team
-   - 2: Small team with limited track record or domain expertise
-   - 3: Competent team with relevant experience but no proven exits
-   - 4: Strong team with domain expertise, prior startup experience, or 1 exit
-   - 5: Exceptional team with multiple successful exits, deep expertise, complementary skills
-   
-   **Red flags**: First-time founders without advisors, missing key roles (tech/business/sales), team imbalances
-
-2. **Technology** (1-5)
-   - 1: Just an idea or concept, no code/product
-   - 2: Early MVP or prototype, not market-tested
-   - 3: Working product with early users but limited scalability or technical depth
-   - 4: Production product with proven scalability, some technical moat
-   - 5: Market-leading technology with strong IP, proprietary data, or significant technical barriers
-   
-   **Red flags**: Non-proprietary tech, easily replicable, outdated tech stack, technical debt
-
-3. **Market** (1-5) - **CRITICAL FOR VCs**
-   - 1: TAM <$1B (too small for VC scale) or unclear/unproven market
-   - 2: TAM $1-5B (small for venture scale, niche play)
-   - 3: TAM $5-20B (acceptable but needs dominant market share for unicorn status)
-   - 4: TAM $20-50B (large market with clear growth trajectory)
-   - 5: TAM >$50B (massive market with secular tailwinds and rapid growth)
-   
-   **Be ruthless**: Anything under $1B TAM is an automatic concern. We need billion-dollar outcomes. Question inflated TAM calculations.
-
-4. **Value Proposition** (1-5)
-   - 1: Weak problem-solution fit, "vitamin" not "painkiller"
-   - 2: Addresses minor pain point, unclear willingness to pay
-   - 3: Solves real problem but competitive or incremental improvement
-   - 4: Clear painkiller with strong differentiation and pricing power
-   - 5: 10x better solution, creates new category, customers desperately need it
-   
-   **Red flags**: "Nice to have" products, unclear ROI, long sales cycles with weak value prop
-
-5. **Competitive Advantage / MOAT** (1-5)
-   - 1: No moat, commodity product, easily copied
-   - 2: Weak defensibility, first-mover advantage only
-   - 3: Some moat (brand, switching costs) but vulnerable
-   - 4: Strong moat (network effects, data moat, high switching costs, IP)
-   - 5: Multiple compounding moats, near-impossible to replicate (e.g., regulatory, exclusive data, strong network effects)
-   
-   **Critical**: Without a moat, even great execution gets competed away. Look for sustainable advantages.
-
-6. **Social Impact** (1-5)
-   - 1: No social impact or potentially negative
-   - 2: Minor positive impact, limited scope
-   - 3: Moderate impact in specific area (sustainability, access, health)
-   - 4: Significant impact addressing important societal challenge
-   - 5: Transformative impact on critical global problem (climate, health, inequality)
-   
-   **Note**: Important for ESG funds but secondary to returns for most VCs
-
----
-
-**GROWTH METRICS - BE CRITICAL**:
-- **MRR/ARR**: Anything <$100K MRR after 2+ years is concerning. $50K MRR after 4 years is a RED FLAG.
-- **Growth rate**: Need >3x YoY. <50% YoY is weak. Flat is failing.
-- **Unit economics**: Need clear path to profitability. CAC payback >24 months is concerning.
-- **Burn rate**: Runway <12 months without clear revenue ramp is risky.
-
-**PROJECTIONS**:
-- Most projections are overly optimistic. Haircut aggressive forecasts by 50-70%.
-- Question assumptions: customer acquisition, pricing, market penetration, competition.
-- Red flag: Hockey stick projections without historical validation.
-
-**COMPETITOR ANALYSIS**:
-- Group competitors intelligently (e.g., "Enterprise SaaS competitors", "Direct B2C rivals", "Indirect alternatives")
-- Don't list features - focus on competitive positioning and defensibility
-- Be honest about threats from well-funded or established players
-
-**FINAL COMMENTS** - Include critical observations:
-- Revenue metrics (MRR, ARR, growth rate) - be specific and critical
-- Financial health (burn rate, runway, unit economics)
-- Red flags (team gaps, market risks, competitive threats, unrealistic projections)
-- Unique strengths (proprietary tech, exclusive partnerships, viral growth)
-- VC fit: Is this a potential unicorn or just a nice lifestyle business?
-- Deal concerns: valuation expectations, dilution, governance
-
-**Remember**: You're protecting LP money and seeking exceptional returns. A "3" is average. Most companies are 2-3. Only truly exceptional companies deserve 4-5.
-
----
+    prompt = cacheable_prompt(EVALUATION_SYSTEM_PROMPT, EVALUATION_INPUT_PROMPT)
+    payload = {
+        "company_name": company_name,
+        "merged_content": merged_content,
+    }
+    
+    def attempt(model):
+        # Pooled LLM with cached structured output
+        return (prompt | get_structured_model(CompanyEvaluation, model=model, temperature=0)).invoke(payload)
+    
+    result = run_cascade("evaluation", EVALUATION_MODEL, attempt, required=EVALUATION_REQUIRED)
+    
+    print("    ✓ Evaluation complete")
+    
+    return {"evaluation": result.model_dump()}
 
-# COMPANY ANALYSIS:
 
-{merged_content}
+def _score_criterion(spec: CriterionSpec, company_name: str, context: str) -> Criterion:
+    """Score one criterion in its own span so usage and latency are attributed per criterion."""
+    with tracer.span("evaluation", f"score_{spec.field}"):
+        # Doubled braces: the system prompt is a template too
+        system = criterion_system_prompt(spec).replace("{", "{{").replace("}", "}}")
+        prompt = cacheable_prompt(system, CRITERION_INPUT_PROMPT)
+        payload = {
+            "company_name": company_name,
+            "criterion_title": spec.title,
+            "context": context,
+        }
+        result = run_cascade(
+            "evaluation", EVALUATION_MODEL,
+            lambda model: (prompt | get_structured_model(Criterion, model=model, temperature=0)).invoke(payload),
+        )
+        return result.model_copy(update={"name": spec.title})
+
+
+@traced_node("evaluation")
+def score_criteria(state: EvaluationState) -> dict:
+    """Score every criterion concurrently, each on its own slice of the merged analysis."""
+    print(f" Scoring {len(CRITERIA)} criteria in parallel...")
+    
+    company_name = state.get("company_name", "Unknown")
+    merged_content = state.get("merged_content")
+    
+    if not merged_content:
+        raise ValueError("No merged analysis content available to evaluate")
+    
+    contexts = {spec.field: criterion_context(merged_content, spec.field) for spec in CRITERIA}
+    record_event("evaluation.context_chars", sum(len(c) for c in contexts.values()))
+    record_event("evaluation.full_context_chars", len(merged_content) * len(CRITERIA))
+    
+    # Worker threads need this context to attribute spans to the company
+    with ThreadPoolExecutor(max_workers=len(CRITERIA), thread_name_prefix="criterion") as pool:
+        futures = {
+            spec.field: pool.submit(
+                contextvars.copy_context().run, _score_criterion, spec, company_name, contexts[spec.field],
+            )
+            for spec in CRITERIA
+        }
+        criteria = {field: future.result().model_dump() for field, future in futures.items()}
+    
+    print("    ✓ " + ", ".join(f"{CRITERIA[i].title}: {c['score']}" for i, c in enumerate(criteria.values())))
+    
+    return {"criteria": criteria}
 
----
 
-Provide your CRITICAL evaluation with scores, detailed reasoning for each score, competitor grouping, and brutally honest final comments about investment potential.
-"""
-    prompt = ChatPromptTemplate.from_template(prompt_template)
-    chain = prompt | structured_llm
+@traced_node("evaluation")
+def summarize_evaluation(state: EvaluationState) -> dict:
+    """Aggregate criterion scores, group competitors and write the final comments."""
+    print(" Summarizing evaluation...")
+    
+    company_name = state.get("company_name", "Unknown")
+    criteria = state["criteria"]
+    scores = "\n".join(
+        f"- **{c['name']}**: {c['score']}/5 - {c['reasoning']}" for c in criteria.values()
+    )
     
-    # Invoke the chain
-    result = chain.invoke({
+    prompt = cacheable_prompt(SUMMARY_SYSTEM_PROMPT, SUMMARY_INPUT_PROMPT)
+    payload = {
         "company_name": company_name,
-        "merged_content": merged_content,
-    })
+        "scores": scores,
+        "context": select_sections(state["merged_content"], SUMMARY_SECTIONS),
+    }
+    summary = run_cascade(
+        "evaluation", EVALUATION_MODEL,
+        lambda model: (prompt | get_structured_model(EvaluationSummary, model=model, temperature=0)).invoke(payload),
+        required=("comments",),
+    )
+    
+    # The overall score is the plain average, no need to ask the model for it
+    overall_score = round(sum(c["score"] for c in criteria.values()) / len(criteria), 2)
+    evaluation = CompanyEvaluation(
+        company_name=company_name,
+        overall_score=overall_score,
+        competitor_groups=summary.competitor_groups,
+        comments=summary.comments,
+        **{field: Criterion(**c) for field, c in criteria.items()},
+    )
     
     print("    ✓ Evaluation complete")
     
-    return {"evaluation": result.model_dump()}
+    return {"evaluation": evaluation.model_dump()}
+
+
+def _evaluate_rubric(rubric: Rubric, company_name: str, merged_content: str) -> CompanyEvaluation:
+    """Evaluate one rubric in its own span; the analysis prefix is shared with the other rubrics."""
+    with tracer.span("evaluation", f"rubric_{rubric.name}"):
+        prompt = shared_prefix_prompt(RUBRIC_SYSTEM_PROMPT, RUBRIC_CONTEXT_PROMPT, RUBRIC_TASK_PROMPT)
+        payload = {
+            "company_name": company_name,
+            "merged_content": merged_content,
+            "rubric_title": rubric.title,
+            "rubric": rubric_instructions(rubric),
+        }
+        result = run_cascade(
+            "evaluation", EVALUATION_MODEL,
+            lambda model: (prompt | get_structured_model(CompanyEvaluation, model=model, temperature=0)).invoke(payload),
+            required=EVALUATION_REQUIRED,
+        )
+        scores = {spec.field: getattr(result, spec.field).score for spec in CRITERIA}
+        return result.model_copy(update={
+            "company_name": company_name,
+            "overall_score": weighted_overall(rubric, scores),
+        })
+
+
+@traced_node("evaluation")
+def evaluate_rubrics(state: EvaluationState) -> dict:
+    """Evaluate the company under every requested rubric over one shared context."""
+    rubrics = [get_rubric(name) for name in state["rubrics"]]
+    print(f" Evaluating {len(rubrics)} rubric(s): {', '.join(r.name for r in rubrics)}...")
+    
+    company_name = state.get("company_name", "Unknown")
+    merged_content = state.get("merged_content")
+    
+    if not merged_content:
+        raise ValueError("No merged analysis content available to evaluate")
+    
+    def run(rubric: Rubric):
+        # Worker threads need this context to attribute spans to the company
+        return contextvars.copy_context().run(_evaluate_rubric, rubric, company_name, merged_content)
+    
+    evaluations: Dict[str, dict] = {}
+    pending = list(rubrics)
+    if WARM_SHARED_PREFIX and len(pending) > 1:
+        first = pending.pop(0)
+        evaluations[first.name] = run(first).model_dump()
+    with ThreadPoolExecutor(max_workers=max(1, len(pending)), thread_name_prefix="rubric") as pool:
+        futures = {rubric.name: pool.submit(run, rubric) for rubric in pending}
+        for name, future in futures.items():
+            evaluations[name] = future.result().model_dump()
+    # Keep the requested order
+    evaluations = {r.name: evaluations[r.name] for r in rubrics}
+    
+    record_event("evaluation.rubrics", len(rubrics))
+    print("    ✓ " + ", ".join(f"{name}: {e['overall_score']:.1f}" for name, e in evaluations.items()))
+    
+    # The first rubric doubles as the primary evaluation
+    return {"evaluations": evaluations, "evaluation": evaluations[rubrics[0].name]}
+
+
+def route_evaluation(state: EvaluationState) -> str:
+    """Multi-rubric pass when rubrics are requested, else per-criterion or single-call scoring."""
+    if state.get("rubrics") and list(state["rubrics"]) != [DEFAULT_RUBRIC]:
+        return "evaluate_rubrics"
+    return "evaluate" if EVALUATION_MODE == "single" else "score_criteria"
 
 
 # Build the graph
@@ -175,11 +380,21 @@ def build_evaluation_graph():
     # Add nodes
     workflow.add_node("load_analysis", load_merged_analysis)
     workflow.add_node("evaluate", evaluate_company)
+    workflow.add_node("score_criteria", score_criteria)
+    workflow.add_node("summarize", summarize_evaluation)
+    workflow.add_node("evaluate_rubrics", evaluate_rubrics)
     
     # Define edges
     workflow.set_entry_point("load_analysis")
-    workflow.add_edge("load_analysis", "evaluate")
+    workflow.add_conditional_edges(
+        "load_analysis",
+        route_evaluation,
+        {"evaluate": "evaluate", "score_criteria": "score_criteria", "evaluate_rubrics": "evaluate_rubrics"},
+    )
     workflow.add_edge("evaluate", END)
+    workflow.add_edge("evaluate_rubrics", END)
+    workflow.add_edge("score_criteria", "summarize")
+    workflow.add_edge("summarize", END)
     
     return workflow.compile()
 
@@ -26,12 +26,14 @@ def extract_competitive_landscape(merged_content: str) -> str:
     return None
 
 
-def render_evaluation(evaluation: CompanyEvaluation, merged_content: str = None) -> str:
+def render_evaluation(evaluation: CompanyEvaluation, merged_content: str = None, rubric_title: str = None) -> str:
     """
     Render the evaluation to markdown format.
     
     Args:
         evaluation: CompanyEvaluation object
+        merged_content: Merged analysis, for the competitive landscape section
+        rubric_title: Rubric the scores were given under (shown when several rubrics are run)
         
     Returns:
         Markdown formatted string
@@ -41,6 +43,9 @@ def render_evaluation(evaluation: CompanyEvaluation, merged_content: str = None)
     # Header
     lines.append(f"# Investment Evaluation: {evaluation.company_name}")
     lines.append("")
+    if rubric_title:
+        lines.append(f"*Rubric: {rubric_title}*")
+        lines.append("")
     lines.append(f"**Overall Score: {evaluation.overall_score:.1f}/5.0**")
     lines.append("")
     lines.append("---")
@@ -0,0 +1,234 @@
+"""
+Named evaluation rubrics.
+
+A rubric is a fund's view on the six ``CompanyEvaluation`` criteria: its own
+analyst persona, scale for each criterion, extra guidance and criterion
+weights for the overall score. The graph can evaluate several rubrics over
+the same merged analysis in one pass (``EvaluationState.rubrics``); the
+analysis is sent as a shared prompt prefix and only the rubric differs
+between calls.
+
+Built-in rubrics: ``vc`` (generalist VC, the default single-call prompt),
+``impact`` (impact fund) and ``deeptech`` (deep-tech fund). Add more with
+``register_rubric``.
+"""
+from typing import Dict, List, NamedTuple, Optional
+
+from .criteria import (
+    COMMENTS_GUIDANCE,
+    COMPETITOR_GUIDANCE,
+    CRITERIA,
+    CRITERIA_BY_FIELD,
+    EVALUATOR_PREAMBLE,
+    GROWTH_GUIDANCE,
+    SCORING_REMINDER,
+)
+
+
+DEFAULT_RUBRIC = "vc"
+
+
+class Rubric(NamedTuple):
+    """A named scoring rubric over the six evaluation criteria."""
+    name: str
+    title: str
+    preamble: str
+    # Criterion field -> rubric block; criteria not listed use the generalist VC block
+    criteria: Dict[str, str]
+    guidance: str
+    reminder: str
+    # Criterion field -> weight in the overall score (default 1)
+    weights: Dict[str, float]
+
+
+def rubric_instructions(rubric: Rubric) -> str:
+    """
+    Full scoring instructions for a rubric.
+
+    Args:
+        rubric: Rubric to render
+
+    Returns:
+        Prompt text: persona, numbered criteria, guidance and reminder
+    """
+    blocks = "\n\n".join(
+        f"{i}. {rubric.criteria.get(c.field, c.rubric)}" for i, c in enumerate(CRITERIA, start=1)
+    )
+    weighted = [
+        f"{CRITERIA_BY_FIELD[field].title} x{weight:g}"
+        for field, weight in rubric.weights.items() if weight != 1
+    ]
+    weights_note = f"\n\nOverall score weights: {', '.join(weighted)} (others x1)." if weighted else ""
+    return f"""{rubric.preamble}
+
+SCORING CRITERIA (1-5 scale) - **{rubric.title.upper()} PERSPECTIVE**:
+
+{blocks}{weights_note}
+
+---
+
+{rubric.guidance}
+
+{rubric.reminder}
+"""
+
+
+def weighted_overall(rubric: Rubric, scores: Dict[str, int]) -> float:
+    """Weighted average of the criterion scores under a rubric's weights."""
+    total = sum(rubric.weights.get(field, 1.0) for field in scores)
+    return round(sum(score * rubric.weights.get(field, 1.0) for field, score in scores.items()) / total, 2)
+
+
+RUBRICS: Dict[str, Rubric] = {}
+
+
+def register_rubric(rubric: Rubric) -> Rubric:
+    """
+    Add (or replace) a rubric in the registry.
+
+    Args:
+        rubric: Rubric to register; ``rubric.name`` is its key
+
+    Returns:
+        The rubric, so it can be used as a module-level constant
+
+    Raises:
+        ValueError: Unknown criterion in ``criteria`` or ``weights``
+    """
+    unknown = (set(rubric.criteria) | set(rubric.weights)) - set(CRITERIA_BY_FIELD)
+    if unknown:
+        raise ValueError(f"Rubric '{rubric.name}' has unknown criteria: {', '.join(sorted(unknown))}")
+    RUBRICS[rubric.name] = rubric
+    return rubric
+
+
+def get_rubric(name: str) -> Rubric:
+    """
+    Look up a registered rubric.
+
+    Args:
+        name: Rubric name
+
+    Returns:
+        Rubric
+
+    Raises:
+        ValueError: Unknown rubric name
+    """
+    if name not in RUBRICS:
+        raise ValueError(f"Unknown rubric '{name}' (choose from {', '.join(RUBRICS)})")
+    return RUBRICS[name]
+
+
+def parse_rubrics(value: Optional[str]) -> List[str]:
+    """
+    Validate a comma-separated rubric list (e.g. from ``--rubrics``).
+
+    Args:
+        value: "vc,impact" style list (None or empty = default rubric)
+
+    Returns:
+        Rubric names, de-duplicated, in the given order
+
+    Raises:
+        ValueError: Unknown rubric name
+    """
+    names = [n.strip() for n in (value or DEFAULT_RUBRIC).split(",") if n.strip()]
+    for name in names:
+        get_rubric(name)
+    return list(dict.fromkeys(names))
+
+
+VC_RUBRIC = register_rubric(Rubric(
+    name="vc",
+    title="VC",
+    preamble=EVALUATOR_PREAMBLE,
+    criteria={},
+    guidance=f"{GROWTH_GUIDANCE}\n\n{COMPETITOR_GUIDANCE}\n\n{COMMENTS_GUIDANCE}",
+    reminder=SCORING_REMINDER,
+    weights={},
+))
+
+IMPACT_RUBRIC = register_rubric(Rubric(
+    name="impact",
+    title="Impact Fund",
+    preamble="""You are a CRITICAL analyst at an impact fund that backs companies delivering measurable social or environmental outcomes AND venture-scale returns.
+
+**BE TOUGH ON BOTH**: Impact claims without evidence are marketing; a great mission without a business is a grant. Most startups fail one of the two tests.""",
+    criteria={
+        "market": """**Market** (1-5)
+   - 1: TAM <$500M or the people who benefit cannot or will not pay
+   - 2: TAM $500M-2B, or a market that depends on subsidies
+   - 3: TAM $2-10B with paying customers
+   - 4: TAM $10-50B with policy or regulatory tailwinds
+   - 5: TAM >$50B where the impact is the reason customers buy
+
+   **Be ruthless**: A large problem is not a large market. Question who pays and why.""",
+        "social_impact": """**Social Impact** (1-5) - **CRITICAL FOR THIS FUND**
+   - 1: No impact, impact-washing, or potentially negative outcomes
+   - 2: Indirect or unmeasured impact, a side effect of the product
+   - 3: Clear positive impact but no metrics or theory of change
+   - 4: Impact is core to the product, with a theory of change and tracked outcomes (e.g. IRIS+, tCO2e avoided, people reached)
+   - 5: Impact scales linearly with revenue, is independently verified, and targets a critical global problem
+
+   **Red flags**: Impact that depends on donor money, outcomes that cannot be measured, mission drift as the company grows""",
+    },
+    guidance=f"""{GROWTH_GUIDANCE}
+
+**IMPACT**:
+- Impact must be measurable and attributable to the company, not to the sector.
+- Check for additionality: would the outcome have happened anyway?
+- Beware of trade-offs between impact depth and commercial scale.
+
+{COMPETITOR_GUIDANCE}
+
+{COMMENTS_GUIDANCE}
+- Impact thesis: what changes in the world if this company succeeds, and how will we know?""",
+    reminder="""**Remember**: A "3" is average. Only companies strong on BOTH impact and returns deserve 4-5.""",
+    weights={"social_impact": 3.0},
+))
+
+DEEPTECH_RUBRIC = register_rubric(Rubric(
+    name="deeptech",
+    title="Deep Tech",
+    preamble="""You are a CRITICAL analyst at a deep-tech fund investing in science-based companies (hardware, biotech, AI research, energy, materials) with long development cycles and large exits.
+
+**BE TOUGH**: Hard science is necessary, not sufficient. Most deep-tech startups die between lab result and product.""",
+    criteria={
+        "team": """**Team** (1-5)
+   - 1: No technical founder, or science outsourced to a university lab
+   - 2: Strong researchers without any commercial or product experience
+   - 3: Scientific founders plus some commercial experience
+   - 4: World-class technical team with industry experience and a commercial lead
+   - 5: Leading experts in the field with prior deep-tech company building or exits
+
+   **Red flags**: Founders who cannot explain the path from lab to product, key IP held by a professor outside the company""",
+        "technology": """**Technology** (1-5) - **CRITICAL FOR THIS FUND**
+   - 1: Hypothesis or paper only (TRL 1-2)
+   - 2: Lab proof of concept (TRL 3-4)
+   - 3: Working prototype in a relevant environment (TRL 5-6)
+   - 4: System demonstrated in operational conditions, with patents filed (TRL 7-8)
+   - 5: Proven at scale with granted patents and a lead years ahead of competitors (TRL 9)
+
+   **Red flags**: Claims without data, no patents or freedom to operate, performance claims far beyond the state of the art""",
+        "competitive_advantage": """**Competitive Advantage / MOAT** (1-5)
+   - 1: No IP, technology could be reproduced from published papers
+   - 2: Know-how only, no patents
+   - 3: Patents filed, but narrow or easy to design around
+   - 4: Strong patent portfolio or proprietary data/process that takes years to replicate
+   - 5: Fundamental IP plus manufacturing or data advantages that compound
+
+   **Critical**: In deep tech the moat is usually IP and time to replicate. Be specific about both.""",
+    },
+    guidance=f"""**TECHNICAL AND CAPITAL RISK**:
+- Name the biggest unsolved technical risk and what it costs to retire it.
+- Capital intensity: how much is needed to reach the first commercial product?
+- Time to market: regulatory approvals, manufacturing scale-up, certification.
+- Revenue this early is rare; judge milestones, pilots and partnerships instead.
+
+{COMPETITOR_GUIDANCE}
+
+{COMMENTS_GUIDANCE}""",
+    reminder=SCORING_REMINDER,
+    weights={"technology": 2.0, "competitive_advantage": 1.5},
+))
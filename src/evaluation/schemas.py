@@ -42,3 +42,12 @@ class CompanyEvaluation(BaseModel):
     
     # Final comments - be brutally honest about investment potential
     comments: str = Field(description="CRITICAL remarks: revenue metrics, red flags, VC fit, deal concerns, unicorn potential")
+
+
+class EvaluationSummary(BaseModel):
+    """Aggregation step of the per-criterion evaluation: everything except the scores."""
+    competitor_groups: List[CompetitorGroup] = Field(
+        default_factory=list,
+        description="Competitors grouped by similar characteristics"
+    )
+    comments: str = Field(description="CRITICAL remarks: revenue metrics, red flags, VC fit, deal concerns, unicorn potential")
@@ -9,10 +9,26 @@ Usage:
     
 Or with a custom CSV path:
     python -m src.main path/to/pitches.csv
+
+Options:
+    --workers N     analyze N companies concurrently
+    --queue PATH    persistent work queue (append with: python -m src.orchestration.intake add more.csv)
+    --follow        keep consuming startups appended to the queue after it drains
+    --shard i/N     only analyze shard i of N (merge with: python -m src.orchestration.sharding merge ...)
+    --worker-only   consume an existing shared queue without reading the CSV
+    --output DIR    write company folders, report and ledger to DIR
+    --plan          print projected tokens, cost and wall time without calling any model
+    --budget-usd X  stop admitting companies before the run spends more than X dollars
+    --deadline T    finish within T (e.g. 90m, 1.5h): companies get degraded plans, then stop being admitted
+    --rpm N         request-per-minute limit used by --plan
+    --priority P    priority for every row (urgent, high, normal, low or an integer; default: priority column)
+    --evaluate-deferred  run the evaluations a deadline-mode run deferred
 """
 import os
-import sys
-import csv
+import time
+import argparse
+import functools
+import threading
 from pathlib import Path
 
 from .web_analysis.graph import analysis_graph, AnalysisState
@@ -28,9 +44,23 @@ from .merge_analysis.schemas import MergedAnalysis
 
 from .evaluation.graph import evaluation_graph, EvaluationState
 from .evaluation.renderer import render_evaluation
+from .evaluation.rubrics import DEFAULT_RUBRIC, get_rubric, parse_rubrics
 from .evaluation.schemas import CompanyEvaluation
 
 from .core.utils import slugify, ensure_dir
+from .core.telemetry import tracer, record_event, record_timeout
+from .core.deadlines import DeadlineExceeded, company_deadline, stage_deadline
+from .core.degradation import (
+    DEFER_EVALUATION, EXECUTION_PLAN_FILE, degradation_note, mark_completed, read_execution_plan,
+    write_execution_plan,
+)
+
+from .orchestration.intake import iter_rows, iter_jobs, parse_priority
+from .orchestration.work_queue import JobQueue, FAILED, DECK_KIND, WEB_KIND, MAX_TIMEOUT_ATTEMPTS
+from .orchestration.sharding import parse_shard, in_shard, shard_suffix, write_ledger
+from .orchestration.planner import (
+    STOP, BudgetGuard, estimate_company, parse_duration, plan_run, render_plan,
+)
 
 
 # Default paths
@@ -44,6 +74,72 @@ OUTPUT_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "output")
 )
 
+# Rubrics scored by the evaluation stage; the first one is written to evaluation.md
+EVALUATION_RUBRICS = [DEFAULT_RUBRIC]
+
+# Seconds an idle worker waits before polling the queue again
+QUEUE_POLL_INTERVAL = 1.0
+
+
+class DeckIndex:
+    """
+    Slug -> PDF index of a decks directory, built with one directory scan.
+
+    Lookups used to glob the directory for every intake row and every claim,
+    which is O(rows x decks) filesystem work on a large backfill. The index
+    is rebuilt when the directory changes (decks added during a ``--follow``
+    run) and a lookup misses or hits a deck that was removed.
+    """
+
+    def __init__(self, decks_dir: str):
+        self.decks_dir = decks_dir
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._by_slug: dict = {}
+        self._stems: list = []  # (slugified stem, path) for partial matches
+
+    def _scan(self) -> None:
+        try:
+            mtime = os.stat(self.decks_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime and self._mtime is not None:
+            return
+        by_slug, stems = {}, []
+        if mtime is not None:
+            for file in sorted(Path(self.decks_dir).glob("*.pdf")):
+                stem = slugify(file.stem)
+                stems.append((stem, str(file)))
+                # An exactly named file wins over one that only slugifies to the same name
+                if file.stem == stem or stem not in by_slug:
+                    by_slug[stem] = str(file)
+        self._mtime, self._by_slug, self._stems = mtime, by_slug, stems
+
+    def _lookup(self, slug: str) -> str | None:
+        if slug in self._by_slug:
+            return self._by_slug[slug]
+        # Partial match (company name in filename)
+        for stem, path in self._stems:
+            if slug in stem:
+                return path
+        return None
+
+    def find(self, company_name: str) -> str | None:
+        """PDF for a company (exact slug, then case-insensitive, then partial match), or None."""
+        slug = slugify(company_name)
+        with self._lock:
+            if self._mtime is None:
+                self._scan()
+            path = self._lookup(slug)
+            if path is None or not os.path.exists(path):
+                self._scan()
+                path = self._lookup(slug)
+        return path
+
+
+_deck_indexes: dict = {}
+_deck_indexes_lock = threading.Lock()
+
 
 def find_deck_pdf(company_name: str, decks_dir: str) -> str | None:
     """
@@ -56,29 +152,41 @@ def find_deck_pdf(company_name: str, decks_dir: str) -> str | None:
     Returns:
         Path to PDF file if found, None otherwise
     """
-    # Try exact match first
-    slug = slugify(company_name)
-    exact_path = os.path.join(decks_dir, f"{slug}.pdf")
-    if os.path.exists(exact_path):
-        return exact_path
-    
-    # Try case-insensitive match
-    if not os.path.exists(decks_dir):
-        return None
-        
-    for file in Path(decks_dir).glob("*.pdf"):
-        if slugify(file.stem) == slug:
-            return str(file)
-    
-    # Try partial match (company name in filename)
-    for file in Path(decks_dir).glob("*.pdf"):
-        if slug in slugify(file.stem):
-            return str(file)
-    
-    return None
+    with _deck_indexes_lock:
+        index = _deck_indexes.get(decks_dir)
+        if index is None:
+            index = _deck_indexes[decks_dir] = DeckIndex(decks_dir)
+    return index.find(company_name)
 
 
-def run_web_analysis(company_name: str, company_url: str, output_dir: str) -> bool:
+def _stage(stage: str):
+    """
+    Decorator running a stage under its deadline (core/deadlines.py).
+
+    A stage that times out is recorded on the company trace and counts as
+    failed, so the remaining stages still run; a company timeout propagates.
+
+    Args:
+        stage: Pipeline stage ("web", "deck", "merge", "evaluation")
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                with stage_deadline(stage):
+                    return fn(*args, **kwargs)
+            except DeadlineExceeded as e:
+                if e.scope == "company":
+                    raise
+                print(f"⏱️  {e} - continuing without it")
+                record_timeout(stage)
+                return False
+        return wrapper
+    return decorator
+
+
+@_stage("web")
+def run_web_analysis(company_name: str, company_url: str, output_dir: str, degradations=()) -> bool:
     """
     Run web analysis for a company and save to output directory.
     
@@ -86,6 +194,7 @@ def run_web_analysis(company_name: str, company_url: str, output_dir: str) -> bo
         company_name: Name of the company
         company_url: URL of the company website
         output_dir: Directory to save the analysis
+        degradations: Deadline-mode degradations (core/degradation.py)
         
     Returns:
         True if successful, False otherwise
@@ -94,7 +203,7 @@ def run_web_analysis(company_name: str, company_url: str, output_dir: str) -> bo
         print(f"Running web analysis...")
         
         # Run the analysis graph
-        state = AnalysisState(startup_name=company_name, startup_url=company_url)
+        state = AnalysisState(startup_name=company_name, startup_url=company_url, degradations=list(degradations))
         result = analysis_graph.invoke(state)
         
         # Extract the analysis
@@ -105,16 +214,20 @@ def run_web_analysis(company_name: str, company_url: str, output_dir: str) -> bo
         
         # Render to markdown
         analysis = Analysis(**analysis_data)
-        md_content = render_markdown(company_name, company_url, analysis)
+        md_content = degradation_note(degradations, ["web"]) + render_markdown(company_name, company_url, analysis)
         
-        # Save to output directory
+        # Save to output directory (JSON sidecar lets the merge stage map fields without an LLM)
         output_path = os.path.join(output_dir, "web_analysis.md")
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(md_content)
+        with open(os.path.join(output_dir, "web_analysis.json"), "w", encoding="utf-8") as f:
+            f.write(analysis.model_dump_json(indent=2))
         
         print(f"Web analysis saved to: {output_path}")
         return True
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"Web analysis failed: {e}")
         import traceback
@@ -122,7 +235,8 @@ def run_web_analysis(company_name: str, company_url: str, output_dir: str) -> bo
         return False
 
 
-def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str) -> bool:
+@_stage("deck")
+def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str, degradations=()) -> bool:
     """
     Run pitch deck analysis for a company and save to output directory.
     
@@ -130,6 +244,7 @@ def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str) -> bool
         company_name: Name of the company
         pdf_path: Path to the PDF file
         output_dir: Directory to save the analysis
+        degradations: Deadline-mode degradations (core/degradation.py)
         
     Returns:
         True if successful, False otherwise
@@ -138,7 +253,7 @@ def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str) -> bool
         print(f"Running deck analysis on: {Path(pdf_path).name}")
         
         # Create initial state
-        state = DeckState(pdf_path=pdf_path)
+        state = DeckState(pdf_path=pdf_path, degradations=list(degradations))
         
         # Run the graph
         result = deck_graph.invoke(state)
@@ -151,12 +266,14 @@ def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str) -> bool
         
         if final_analysis:
             # Render to markdown
-            md_content = render_deck_markdown(final_analysis)
+            md_content = degradation_note(degradations, ["deck"]) + render_deck_markdown(final_analysis)
             
             # Save to output directory
             output_path = os.path.join(output_dir, "deck_analysis.md")
             with open(output_path, "w", encoding="utf-8") as f:
                 f.write(md_content)
+            with open(os.path.join(output_dir, "deck_analysis.json"), "w", encoding="utf-8") as f:
+                f.write(final_analysis.model_dump_json(indent=2))
             
             print(f"Deck analysis saved to: {output_path}")
             return True
@@ -164,6 +281,8 @@ def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str) -> bool
             print(f"Deck analysis failed - no result")
             return False
             
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"Deck analysis failed: {e}")
         import traceback
@@ -171,13 +290,15 @@ def run_deck_analysis(company_name: str, pdf_path: str, output_dir: str) -> bool
         return False
 
 
-def run_merge_analysis(company_name: str, output_dir: str) -> bool:
+@_stage("merge")
+def run_merge_analysis(company_name: str, output_dir: str, degradations=()) -> bool:
     """
     Run merge analysis combining deck and web analysis.
     
     Args:
         company_name: Name of the company
         output_dir: Directory containing deck_analysis.md and web_analysis.md
+        degradations: Deadline-mode degradations (core/degradation.py)
         
     Returns:
         True if successful, False otherwise
@@ -201,6 +322,7 @@ def run_merge_analysis(company_name: str, output_dir: str) -> bool:
             company_name=company_name,
             deck_analysis_path=deck_path if deck_exists else None,
             web_analysis_path=web_path if web_exists else None,
+            degradations=list(degradations),
         )
         
         # Run the merge graph
@@ -220,7 +342,7 @@ def run_merge_analysis(company_name: str, output_dir: str) -> bool:
         merged_analysis = MergedAnalysis(**merged_data)
         
         # Render to markdown
-        md_content = render_merged_markdown(merged_analysis)
+        md_content = degradation_note(degradations, ["web", "deck", "merge"]) + render_merged_markdown(merged_analysis)
         
         # Save to output directory
         output_path = os.path.join(output_dir, "merged_analysis.md")
@@ -230,6 +352,8 @@ def run_merge_analysis(company_name: str, output_dir: str) -> bool:
         print(f"Merged analysis saved to: {output_path}")
         return True
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"Merge analysis failed: {e}")
         import traceback
@@ -237,6 +361,7 @@ def run_merge_analysis(company_name: str, output_dir: str) -> bool:
         return False
 
 
+@_stage("evaluation")
 def run_evaluation(company_name: str, output_dir: str) -> bool:
     """
     Run evaluation scoring based on merged analysis.
@@ -262,36 +387,48 @@ def run_evaluation(company_name: str, output_dir: str) -> bool:
         state = EvaluationState(
             company_name=company_name,
             merged_analysis_path=merged_path,
+            rubrics=EVALUATION_RUBRICS,
         )
         
         # Run the evaluation graph
         result = evaluation_graph.invoke(state)
         
-        # Extract the evaluation
+        # Extract the evaluation(s); single-rubric runs only fill "evaluation"
         if isinstance(result, dict):
             evaluation_data = result.get("evaluation")
+            evaluations = result.get("evaluations")
         else:
             evaluation_data = result.evaluation
+            evaluations = result.evaluations
         
         if not evaluation_data:
             print("Evaluation failed - no result")
             return False
         
-        # Convert to schema object
-        evaluation = CompanyEvaluation(**evaluation_data)
-        
-        # Render to markdown
-        md_content = render_evaluation(evaluation)
-        
-        # Save to output directory
-        output_path = os.path.join(output_dir, "evaluation.md")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(md_content)
+        evaluations = evaluations or {EVALUATION_RUBRICS[0]: evaluation_data}
+        for i, (rubric_name, data) in enumerate(evaluations.items()):
+            # Convert to schema object
+            evaluation = CompanyEvaluation(**data)
+            
+            # Render to markdown
+            rubric = get_rubric(rubric_name)
+            md_content = render_evaluation(
+                evaluation, rubric_title=rubric.title if list(evaluations) != [DEFAULT_RUBRIC] else None,
+            )
+            
+            # Save to output directory (primary rubric keeps the usual file name)
+            filename = "evaluation.md" if i == 0 else f"evaluation.{rubric_name}.md"
+            output_path = os.path.join(output_dir, filename)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(md_content)
+            
+            print(f"Evaluation saved to: {output_path}")
+            print(f"Score ({rubric.title}): {evaluation.overall_score:.1f}/5.0")
         
-        print(f"Evaluation saved to: {output_path}")
-        print(f"Score: {evaluation.overall_score:.1f}/5.0")
         return True
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"Evaluation failed: {e}")
         import traceback
@@ -299,7 +436,13 @@ def run_evaluation(company_name: str, output_dir: str) -> bool:
         return False
 
 
-def analyze_company(company_name: str, company_url: str, csv_path: str = INPUT_CSV):
+def analyze_company(
+    company_name: str,
+    company_url: str,
+    csv_path: str = INPUT_CSV,
+    enqueued_at: float | None = None,
+    degradations=(),
+):
     """
     Run complete analysis pipeline for a company.
     
@@ -307,6 +450,14 @@ def analyze_company(company_name: str, company_url: str, csv_path: str = INPUT_C
         company_name: Name of the company
         company_url: URL of the company website
         csv_path: Path to the CSV file (used to locate decks directory)
+        enqueued_at: When the company was queued (for queue-wait telemetry)
+        degradations: Deadline-mode execution plan chosen by the budget guard
+            (core/degradation.py); recorded in execution_plan.json
+
+    Returns:
+        CompanyTrace with the company's spans, cost, wall time and the
+        stages cut off by a deadline (the whole company runs under
+        COMPANY_TIMEOUT, each stage under STAGE_TIMEOUTS; see core/deadlines.py)
     """
     print(f"\n{'='*60}")
     print(f"Analyzing: {company_name}")
@@ -316,58 +467,143 @@ def analyze_company(company_name: str, company_url: str, csv_path: str = INPUT_C
     company_slug = slugify(company_name)
     company_output_dir = os.path.join(OUTPUT_DIR, company_slug)
     ensure_dir(company_output_dir)
+    plan_path = os.path.join(company_output_dir, EXECUTION_PLAN_FILE)
+    if degradations:
+        print(f"Deadline mode: {', '.join(degradations)}")
+        write_execution_plan(company_output_dir, company_name, degradations, reason="budget guard")
+    elif os.path.exists(plan_path):
+        # A full rerun supersedes an earlier degraded one
+        os.remove(plan_path)
+    
+    with tracer.company(company_name, company_output_dir, enqueued_at=enqueued_at) as trace:
+        # Track success
+        web_success = False
+        deck_success = False
+        merge_success = False
+        eval_success = False
     
-    # Track success
-    web_success = False
-    deck_success = False
-    merge_success = False
-    eval_success = False
+        try:
+            with company_deadline(company_name):
+                # Run web analysis
+                if company_url:
+                    web_success = run_web_analysis(company_name, company_url, company_output_dir, degradations)
+                else:
+                    print(f"No URL provided - skipping web analysis")
     
-    # Run web analysis
-    if company_url:
-        web_success = run_web_analysis(company_name, company_url, company_output_dir)
-    else:
-        print(f"No URL provided - skipping web analysis")
+                # Find and run deck analysis
+                pdf_path = find_deck_pdf(company_name, INPUT_DECKS_DIR)
+                if pdf_path:
+                    deck_success = run_deck_analysis(company_name, pdf_path, company_output_dir, degradations)
+                else:
+                    print(f"No PDF found for {company_name} - skipping deck analysis")
+                    print(f"Expected location: {INPUT_DECKS_DIR}/{company_slug}.pdf")
     
-    # Find and run deck analysis
-    pdf_path = find_deck_pdf(company_name, INPUT_DECKS_DIR)
-    if pdf_path:
-        deck_success = run_deck_analysis(company_name, pdf_path, company_output_dir)
-    else:
-        print(f"No PDF found for {company_name} - skipping deck analysis")
-        print(f"Expected location: {INPUT_DECKS_DIR}/{company_slug}.pdf")
+                # Run merge analysis if we have at least one analysis
+                if web_success or deck_success:
+                    merge_success = run_merge_analysis(company_name, company_output_dir, degradations)
     
-    # Run merge analysis if we have at least one analysis
-    if web_success or deck_success:
-        merge_success = run_merge_analysis(company_name, company_output_dir)
+                # Run evaluation if merge was successful
+                if merge_success and DEFER_EVALUATION in degradations:
+                    # No graph node runs, so open a span of its own for the event
+                    with tracer.span("evaluation", "deferred"):
+                        record_event(f"degraded.{DEFER_EVALUATION}")
+                    print(f"Evaluation deferred (run later with --evaluate-deferred)")
+                elif merge_success:
+                    eval_success = run_evaluation(company_name, company_output_dir)
     
-    # Run evaluation if merge was successful
-    if merge_success:
-        eval_success = run_evaluation(company_name, company_output_dir)
+        except DeadlineExceeded as e:
+            # Stages that did finish keep their outputs; the worker re-queues the company
+            print(f"⏱️  {e} - stopping {company_name}")
+            record_timeout("company")
     
-    # Summary
-    print(f"\n Results saved to: {company_output_dir}")
-    if web_success:
-        print(f"web_analysis.md")
-    if deck_success:
-        print(f"deck_analysis.md")
-    if merge_success:
-        print(f"merged_analysis.md")
-    if eval_success:
-        print(f"evaluation.md")
+        # Summary
+        print(f"\n Results saved to: {company_output_dir}")
+        if web_success:
+            print(f"web_analysis.md")
+        if deck_success:
+            print(f"deck_analysis.md")
+        if merge_success:
+            print(f"merged_analysis.md")
+        if eval_success:
+            print(f"evaluation.md")
     
-    if not web_success and not deck_success:
-        print(f"  ⚠️  No analyses completed for {company_name}")
+        if not web_success and not deck_success:
+            print(f"  ⚠️  No analyses completed for {company_name}")
+        if trace.timed_out:
+            print(f"  ⏱️  Timed out: {', '.join(trace.timed_out)}")
+    return trace
+
+
+def _company_estimate(job, estimates: dict | None):
+    """Planned estimate of a job, or a fresh one for jobs added after planning."""
+    if estimates and job.slug in estimates:
+        return estimates[job.slug]
+    return estimate_company(
+        job.startup_name, job.startup_url, find_deck_pdf(job.startup_name, INPUT_DECKS_DIR),
+        rubrics=EVALUATION_RUBRICS,
+    )
+
 
+def _job_kind(job) -> str:
+    """Fair-queuing kind: full pipeline when a deck is found, otherwise web only."""
+    return DECK_KIND if find_deck_pdf(job.startup_name, INPUT_DECKS_DIR) else WEB_KIND
 
-def run_all_companies(csv_path: str = INPUT_CSV):
+
+def run_evaluate_deferred() -> int:
+    """
+    Run the evaluations deferred by deadline-mode runs.
+
+    Returns:
+        Number of companies evaluated
+    """
+    evaluated = 0
+    for plan_path in sorted(Path(OUTPUT_DIR).glob(f"*/{EXECUTION_PLAN_FILE}")):
+        company_dir = str(plan_path.parent)
+        plan = read_execution_plan(company_dir)
+        if not plan or "evaluation" not in plan.get("deferred", []):
+            continue
+        print(f"\nDeferred evaluation: {plan['company']}")
+        with tracer.company(plan["company"], company_dir):
+            if run_evaluation(plan["company"], company_dir):
+                mark_completed(company_dir, "evaluation")
+                evaluated += 1
+    print(f"\nEvaluated {evaluated} deferred companies")
+    return evaluated
+
+
+def run_all_companies(
+    csv_path: str = INPUT_CSV,
+    workers: int = 1,
+    queue_path: str | None = None,
+    follow: bool = False,
+    shard: tuple | None = None,
+    worker_only: bool = False,
+    guard: BudgetGuard | None = None,
+    estimates: dict | None = None,
+    priority: int | None = None,
+):
     """
     Run analysis on all companies in the CSV file.
     
+    Rows are streamed into a persistent work queue while workers consume it,
+    so startups appended to the queue during the run are picked up too.
+    
     Args:
-        csv_path: Path to CSV file with columns: startup_name, startup_url
+        csv_path: Path to CSV/JSONL file with columns: startup_name, startup_url ("-" for stdin)
+        workers: Number of companies analyzed concurrently
+        queue_path: SQLite queue file shared with ``src.orchestration.intake add``
+            (defaults to one queue per shard under OUTPUT_DIR)
+        follow: Keep waiting for new jobs after the queue drains
+        shard: (index, count) - only analyze companies whose slug hashes to this shard
+        worker_only: Don't read the CSV, just consume an existing (shared) queue
+        guard: Budget guard deciding whether (and how degraded) workers run each company
+        estimates: Slug -> CompanyEstimate from the run plan, used by the guard
+        priority: Priority for every row (default: the input's priority column)
     """
-    if not os.path.exists(csv_path):
+    if queue_path is None:
+        queue_path = os.path.join(OUTPUT_DIR, f"queue{shard_suffix(shard)}.sqlite")
+
+    if not worker_only and csv_path != "-" and not os.path.exists(csv_path):
         raise SystemExit(
             f"Missing input CSV at {csv_path}\n"
             f"Expected columns: startup_name,startup_url"
@@ -378,44 +614,111 @@ def run_all_companies(csv_path: str = INPUT_CSV):
     print(f"{'='*60}")
     print(f"Reading from: {csv_path}")
     print(f"Output to: {OUTPUT_DIR}")
+    print(f"Queue: {queue_path}")
+    if shard:
+        print(f"Shard: {shard[0]}/{shard[1]}")
     print(f"\nPipeline: Web Analysis → Deck Analysis → Merge Analysis")
     print(f"{'='*60}\n")
 
-    # Read CSV and process each company
-    companies_processed = 0
+    queue = JobQueue(queue_path)
+    requeued = queue.requeue_stale()
+    if requeued:
+        print(f"Re-queued {requeued} interrupted jobs from a previous run")
+    retried = queue.requeue_timed_out()
+    if retried:
+        print(f"Retrying {retried} jobs that timed out in a previous run")
     
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-
-        # Normalize headers in case of BOM / stray spaces
-        if reader.fieldnames:
-            reader.fieldnames = [
-                (fn or "").lstrip("\ufeff").strip() 
-                for fn in reader.fieldnames
-            ]
-
-        for row in reader:
-            # Normalize keys coming from DictReader just in case
-            row = {
-                (k or "").lstrip("\ufeff").strip(): (v or "").strip() 
-                for k, v in row.items()
-            }
-
-            company_name = row.get("startup_name", "")
-            company_url = row.get("startup_url", "")
-            
-            if not company_name:
-                print(f"Skipping row (missing company name): {row}")
+    guard = guard or BudgetGuard()
+    tracer.start_run()
+    intake_done = threading.Event()
+    job_added = threading.Event()
+    processed = []
+    
+    def worker(worker_id: str):
+        while True:
+            job_added.clear()
+            job = queue.claim(worker_id)
+            if job is None:
+                if intake_done.is_set() and not follow:
+                    return
+                # Woken early by intake; jobs appended by other processes are polled
+                job_added.wait(QUEUE_POLL_INTERVAL)
                 continue
-
-            analyze_company(company_name, company_url, csv_path)
-            companies_processed += 1
+            if job.priority:
+                print(f"{worker_id}: claimed {job.startup_name} (priority {job.priority})")
+            admission = guard.admit(
+                _company_estimate(job, estimates) if guard.active else None,
+                backlog=queue.pending() if guard.active else 0,
+            )
+            if admission.decision == STOP:
+                queue.release(job.slug)
+                print(f"{worker_id}: budget or deadline reached, leaving remaining jobs queued")
+                return
+            started = time.time()
+            trace = None
+            try:
+                trace = analyze_company(
+                    job.startup_name, job.startup_url, csv_path,
+                    enqueued_at=job.enqueued_at, degradations=admission.degradations,
+                )
+                if trace.timed_out:
+                    # Retry behind the rest of the batch instead of holding this worker
+                    if queue.time_out(job.slug, error=f"timed out: {', '.join(trace.timed_out)}"):
+                        print(f"{worker_id}: {job.startup_name} timed out, re-queued "
+                              f"(attempt {job.attempts}/{MAX_TIMEOUT_ATTEMPTS})")
+                        job_added.set()
+                    else:
+                        print(f"{worker_id}: {job.startup_name} timed out again, left for the next run")
+                else:
+                    queue.complete(job.slug)
+            except Exception as e:
+                print(f"Company {job.startup_name} failed: {e}")
+                queue.complete(job.slug, status=FAILED, error=str(e)[:500])
+            guard.finished(admission, trace.cost_usd if trace else 0.0, time.time() - started)
+            processed.append(job.slug)
+    
+    threads = [
+        threading.Thread(target=worker, args=(f"worker-{i}",), daemon=True)
+        for i in range(max(1, workers))
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Stream rows into the queue while workers consume it
+    added = 0
+    try:
+        rows = [] if worker_only else iter_rows(csv_path)
+        for job in iter_jobs(rows, priority=priority):
+            if not in_shard(job.slug, shard):
+                continue
+            # Deck lookup only for this shard's rows
+            job.kind = _job_kind(job)
+            if queue.put(job):
+                added += 1
+                job_added.set()
+        print(f"Queued {added} companies")
+    finally:
+        intake_done.set()
+        job_added.set()
+
+    for thread in threads:
+        thread.join()
+
+    # Per-node latency / token / cost summary, plus the job ledger for shard merging
+    ensure_dir(OUTPUT_DIR)
+    report_path = os.path.join(OUTPUT_DIR, f"run_report{shard_suffix(shard)}.md")
+    print(tracer.write_report(report_path))
+    if guard.active:
+        print(guard.summary())
+    ledger_path = write_ledger(queue, OUTPUT_DIR, shard)
 
     print(f"\n{'='*60}")
     print(f"Complete Analysis Finished!")
     print(f"{'='*60}")
-    print(f"Processed {companies_processed} companies")
+    print(f"Processed {len(processed)} companies")
     print(f"Results in: {OUTPUT_DIR}")
+    print(f"Run report: {report_path}")
+    print(f"Ledger: {ledger_path}")
     print(f"\n Generated files per company:")
     print(f"-web_analysis.md - Web scraping & analysis")
     print(f"-deck_analysis.md - Pitch deck analysis")
@@ -425,8 +728,75 @@ def run_all_companies(csv_path: str = INPUT_CSV):
 
 def main():
     """Main entry point."""
-    csv_path = sys.argv[1] if len(sys.argv) > 1 else INPUT_CSV
-    run_all_companies(csv_path)
+    global OUTPUT_DIR, EVALUATION_RUBRICS
+    parser = argparse.ArgumentParser(description="PitchPanda - complete startup analysis")
+    parser.add_argument("csv_path", nargs="?", default=INPUT_CSV,
+                        help="CSV or JSONL of startups, or - for stdin")
+    parser.add_argument("--workers", type=int, default=1, help="Companies analyzed concurrently")
+    parser.add_argument("--queue", help="Persistent work queue file (default: output/queue.sqlite)")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep waiting for startups appended to the queue")
+    parser.add_argument("--shard", help="Only analyze shard i of N (0-based), e.g. --shard 0/4")
+    parser.add_argument("--worker-only", action="store_true",
+                        help="Skip intake and consume an existing shared queue")
+    parser.add_argument("--output", help="Output directory (default: output/)")
+    parser.add_argument("--rubrics", default=DEFAULT_RUBRIC,
+                        help="Comma-separated evaluation rubrics, e.g. vc,impact,deeptech")
+    parser.add_argument("--plan", action="store_true",
+                        help="Print projected tokens, cost and wall time, then exit")
+    parser.add_argument("--budget-usd", type=float, help="Spend cap for the run in USD")
+    parser.add_argument("--deadline", help="Finish within this time, e.g. 90m or 1.5h (plain number = minutes)")
+    parser.add_argument("--rpm", type=int, help="API request-per-minute limit (for --plan)")
+    parser.add_argument("--priority", help="Priority for every row: urgent, high, normal, low or an integer")
+    parser.add_argument("--evaluate-deferred", action="store_true",
+                        help="Run evaluations deferred by an earlier deadline-mode run, then exit")
+    args = parser.parse_args()
+
+    if args.output:
+        OUTPUT_DIR = os.path.abspath(args.output)
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+        EVALUATION_RUBRICS = parse_rubrics(args.rubrics)
+        deadline = time.time() + parse_duration(args.deadline) if args.deadline else None
+        priority = parse_priority(args.priority) if args.priority else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    plan = None
+    if args.plan or args.budget_usd is not None or deadline is not None:
+        if args.csv_path == "-" or args.worker_only:
+            if args.plan:
+                parser.error("--plan needs an input file")
+        else:
+            jobs = [j for j in iter_jobs(iter_rows(args.csv_path)) if in_shard(j.slug, shard)]
+            print(f"Planning {len(jobs)} companies...")
+            plan = plan_run(
+                jobs, lambda name: find_deck_pdf(name, INPUT_DECKS_DIR),
+                workers=args.workers, rpm=args.rpm, rubrics=EVALUATION_RUBRICS,
+            )
+    if args.plan:
+        print(render_plan(plan))
+        return
+    if args.evaluate_deferred:
+        tracer.start_run()
+        run_evaluate_deferred()
+        return
+
+    # Until real costs come in, the guard assumes the priciest planned company
+    typical = None
+    if plan and plan.companies:
+        typical = max(plan.companies, key=lambda c: c.cost_usd())
+    run_all_companies(
+        args.csv_path,
+        workers=args.workers,
+        queue_path=args.queue,
+        follow=args.follow,
+        shard=shard,
+        worker_only=args.worker_only,
+        guard=BudgetGuard(args.budget_usd, deadline, estimate=typical, workers=args.workers),
+        estimates={c.slug: c for c in plan.companies} if plan else None,
+        priority=priority,
+    )
 
 
 if __name__ == "__main__":
@@ -1,14 +1,21 @@
 """
 LangGraph pipeline for merging deck and web analysis.
 """
+import json
 import os
-from typing import TypedDict, Optional
+from typing import List, TypedDict, Optional
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
 
-from .schemas import MergedAnalysis
+from .premerge import MergeTask, apply_resolutions, premerge
+from .schemas import MergedAnalysis, MergeResolution
+from ..core.cascade import run_cascade
+from ..core.degradation import MINI_MERGE
+from ..core.llm import get_structured_model
+from ..core.prompt_cache import cacheable_prompt
+from ..core.telemetry import traced_node, record_event
+from ..deck_analysis.schemas import DeckAnalysis
+from ..web_analysis.schemas import Analysis
 
 # Load environment variables
 load_dotenv()
@@ -21,9 +28,88 @@ class MergeState(TypedDict):
     web_analysis_path: Optional[str]
     deck_content: Optional[str]
     web_content: Optional[str]
+    deck_data: Optional[dict]  # JSON sidecar of deck_analysis.md
+    web_data: Optional[dict]  # JSON sidecar of web_analysis.md
+    merge_tasks: Optional[list]  # Fields the rule-based pre-merge left for the LLM
     merged_analysis: Optional[dict]
+    degradations: Optional[List[str]]  # deadline-mode plan (core/degradation.py)
 
 
+# Static instructions are the system message so the provider can cache them;
+# company name and analyses follow in the human message
+MERGE_SYSTEM_PROMPT = """You are an expert analyst tasked with creating a comprehensive company overview by merging information from two sources:
+1. Pitch deck analysis (if available)
+2. Web analysis (if available)
+
+Both are provided in the user message. Your task is to create a comprehensive merged analysis that:
+
+1. **Combines all available information** - Include everything relevant from both sources
+2. **Attributes sources clearly** - Use source field to indicate "pitch deck", "web analysis", or "both"
+3. **Handles conflicts** - When information conflicts between sources, use ConflictingInfo to show both versions
+4. **Marks missing information** - If information is not available from either source, leave it as None/null
+5. **Preserves details** - Don't summarize away important details; keep specifics like numbers, names, dates
+
+Guidelines:
+- For SourcedInfo fields: set source to "pitch deck", "web analysis", or "both" depending on where the info came from
+- For ConflictingInfo: use when pitch deck and web have different values (e.g., different market sizes)
+- For team members: include everyone mentioned in either source
+- For competitors: merge lists from both sources
+- For metrics: preserve both current state and projections
+- **For Problem/Solution**: Extract web analysis problem/solution/examples separately from pitch deck details
+  - problem_web: General problem from web analysis
+  - problem_example_web: Example scenario from web analysis
+  - problem_deck: More specific problem details from pitch deck
+  - solution_web: Product/solution description from web analysis
+  - solution_example_web: Example usage from web analysis
+  - solution_deck: More detailed solution information from pitch deck
+- Be thorough - this is the definitive overview of the company"""
+
+MERGE_INPUT_PROMPT = """Company: {company_name}
+
+{deck_section}
+
+{web_section}
+
+Extract and structure all available information into the MergedAnalysis schema."""
+
+
+# Only the fields the rule-based pre-merge could not settle go to this (small) prompt
+RESOLVE_MODEL = "gpt-4o-mini"
+# Legacy full-document merge (no structured sidecars available)
+MERGE_MODEL = "gpt-4o"
+
+RESOLVE_SYSTEM_PROMPT = """You finish a merged company overview built from a pitch deck analysis and a web analysis.
+All other fields are already filled in; you only get the fields below, each with what the pitch deck and the web analysis say.
+
+For each field return one resolution with the field path exactly as given:
+- synthesis on company_overview.tagline: one short line (max ~12 words) describing what the company does
+- synthesis on company_overview.description: 2-3 neutral sentences combining both sources
+- conflict: one or two sentences explaining how the two values differ and why (e.g. the deck states a top-down figure,
+  the web estimate is bottom-up), without picking a winner
+
+Use only the information given. Keep numbers exactly as written."""
+
+RESOLVE_INPUT_PROMPT = """Company: {company_name}
+
+Fields:
+{tasks}"""
+
+
+def _sidecar(path: Optional[str]) -> Optional[dict]:
+    """Structured JSON written next to an analysis markdown file (None if missing or stale)."""
+    if not path:
+        return None
+    json_path = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(json_path) or os.path.getmtime(json_path) < os.path.getmtime(path) - 1:
+        return None
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@traced_node("merge")
 def load_analyses(state: MergeState) -> MergeState:
     """Load deck and web analysis content from files."""
     print("  📖 Loading analysis files...")
@@ -51,17 +137,68 @@ def load_analyses(state: MergeState) -> MergeState:
         **state,
         "deck_content": deck_content,
         "web_content": web_content,
+        "deck_data": _sidecar(state.get("deck_analysis_path")) if deck_content else None,
+        "web_data": _sidecar(state.get("web_analysis_path")) if web_content else None,
     }
 
 
+def route_after_load(state: MergeState) -> str:
+    """Rule-based merge when every available analysis has its structured sidecar."""
+    complete = (
+        (not state.get("deck_content") or state.get("deck_data") is not None)
+        and (not state.get("web_content") or state.get("web_data") is not None)
+    )
+    return "premerge" if complete and (state.get("deck_data") or state.get("web_data")) else "merge_analyses"
+
+
+@traced_node("merge")
+def premerge_node(state: MergeState) -> MergeState:
+    """Map structured web/deck fields onto MergedAnalysis locally."""
+    print("  🧩 Pre-merging structured analyses...")
+    deck = DeckAnalysis.model_validate(state["deck_data"]) if state.get("deck_data") else None
+    web = Analysis.model_validate(state["web_data"]) if state.get("web_data") else None
+    merged, tasks = premerge(state.get("company_name", "Unknown"), web, deck)
+    record_event("merge.rule_based")
+    conflicts = sum(1 for t in tasks if t.kind == "conflict")
+    print(f"    ✓ {len(tasks)} field(s) left for the LLM ({conflicts} conflict(s))")
+    return {
+        **state,
+        "merged_analysis": merged.model_dump(),
+        "merge_tasks": [t.model_dump() for t in tasks],
+    }
+
+
+@traced_node("merge")
+def resolve_conflicts(state: MergeState) -> MergeState:
+    """Ask the LLM only for conflict notes and short synthesized texts."""
+    tasks = [MergeTask(**t) for t in state.get("merge_tasks") or []]
+    if not tasks:
+        return state
+    print(f"  ⚖️  Resolving {len(tasks)} field(s) with {RESOLVE_MODEL}...")
+    record_event("merge.llm_fields", len(tasks))
+    listing = "\n\n".join(
+        f"- field: {t.field} ({t.kind})\n  pitch deck: {t.pitch_deck_info or 'n/a'}\n  web analysis: {t.web_info or 'n/a'}"
+        for t in tasks
+    )
+    chain = cacheable_prompt(RESOLVE_SYSTEM_PROMPT, RESOLVE_INPUT_PROMPT) | get_structured_model(
+        MergeResolution, model=RESOLVE_MODEL, temperature=0
+    )
+    merged = MergedAnalysis(**state["merged_analysis"])
+    try:
+        result = chain.invoke({"company_name": state.get("company_name", "Unknown"), "tasks": listing})
+        merged = apply_resolutions(merged, tasks, {r.field: r.text for r in result.resolutions})
+    except Exception as e:
+        # The rule-based merge is complete on its own; only the notes are missing
+        print(f"    ⚠️  Resolution failed, keeping rule-based merge: {str(e)[:200]}")
+    print("    ✓ Merge complete")
+    return {**state, "merged_analysis": merged.model_dump()}
+
+
+@traced_node("merge")
 def merge_analyses(state: MergeState) -> MergeState:
     """Merge deck and web analyses using LLM."""
     print("  🔄 Merging analyses with LLM...")
     
-    # Initialize LLM with structured output
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    structured_llm = llm.with_structured_output(MergedAnalysis)
-    
     # Build the prompt based on what's available
     deck_content = state.get("deck_content")
     web_content = state.get("web_content")
@@ -70,42 +207,6 @@ def merge_analyses(state: MergeState) -> MergeState:
     if not deck_content and not web_content:
         raise ValueError("No analysis content available to merge")
     
-    # Create prompt template
-    prompt_template = """You are an expert analyst tasked with creating a comprehensive company overview by merging information from two sources:
-1. Pitch deck analysis (if available)
-2. Web analysis (if available)
-
-Company: {company_name}
-
-{deck_section}
-
-{web_section}
-
-Your task is to create a comprehensive merged analysis that:
-
-1. **Combines all available information** - Include everything relevant from both sources
-2. **Attributes sources clearly** - Use source field to indicate "pitch deck", "web analysis", or "both"
-3. **Handles conflicts** - When information conflicts between sources, use ConflictingInfo to show both versions
-4. **Marks missing information** - If information is not available from either source, leave it as None/null
-5. **Preserves details** - Don't summarize away important details; keep specifics like numbers, names, dates
-
-Guidelines:
-- For SourcedInfo fields: set source to "pitch deck", "web analysis", or "both" depending on where the info came from
-- For ConflictingInfo: use when pitch deck and web have different values (e.g., different market sizes)
-- For team members: include everyone mentioned in either source
-- For competitors: merge lists from both sources
-- For metrics: preserve both current state and projections
-- **For Problem/Solution**: Extract web analysis problem/solution/examples separately from pitch deck details
-  - problem_web: General problem from web analysis
-  - problem_example_web: Example scenario from web analysis
-  - problem_deck: More specific problem details from pitch deck
-  - solution_web: Product/solution description from web analysis
-  - solution_example_web: Example usage from web analysis
-  - solution_deck: More detailed solution information from pitch deck
-- Be thorough - this is the definitive overview of the company
-
-Extract and structure all available information into the MergedAnalysis schema."""
-
     # Build deck section
     deck_section = ""
     if deck_content:
@@ -130,15 +231,24 @@ Extract and structure all available information into the MergedAnalysis schema."
     else:
         web_section = "\n# WEB ANALYSIS: Not available\n"
     
-    prompt = ChatPromptTemplate.from_template(prompt_template)
-    chain = prompt | structured_llm
-    
-    # Invoke the chain
-    result = chain.invoke({
+    prompt = cacheable_prompt(MERGE_SYSTEM_PROMPT, MERGE_INPUT_PROMPT)
+    payload = {
         "company_name": company_name,
         "deck_section": deck_section,
         "web_section": web_section,
-    })
+    }
+    
+    def attempt(model):
+        # Pooled LLM with cached structured output
+        return (prompt | get_structured_model(MergedAnalysis, model=model, temperature=0)).invoke(payload)
+    
+    model = MERGE_MODEL
+    mini = MINI_MERGE in (state.get("degradations") or ())
+    if mini:
+        record_event(f"degraded.{MINI_MERGE}")
+        model = RESOLVE_MODEL
+    # A cascade would otherwise escalate past the deadline plan's mini model
+    result = run_cascade("merge", model, attempt, pinned=mini)
     
     print("    ✓ Merge complete")
     
@@ -156,10 +266,17 @@ def build_merge_graph():
     # Add nodes
     workflow.add_node("load_analyses", load_analyses)
     workflow.add_node("merge_analyses", merge_analyses)
+    workflow.add_node("premerge", premerge_node)
+    workflow.add_node("resolve_conflicts", resolve_conflicts)
     
     # Define edges
     workflow.set_entry_point("load_analyses")
-    workflow.add_edge("load_analyses", "merge_analyses")
+    workflow.add_conditional_edges("load_analyses", route_after_load, {
+        "premerge": "premerge",
+        "merge_analyses": "merge_analyses",
+    })
+    workflow.add_edge("premerge", "resolve_conflicts")
+    workflow.add_edge("resolve_conflicts", END)
     workflow.add_edge("merge_analyses", END)
     
     return workflow.compile()
@@ -0,0 +1,290 @@
+"""
+Rule-based pre-merge of web and deck analyses.
+
+Most ``MergedAnalysis`` fields exist in only one source and map one-to-one
+(team and funding come from the deck, problem/solution wording and
+competitors from the web), so they are filled in here from the structured
+``Analysis`` / ``DeckAnalysis`` JSON sidecars with ``source`` set
+automatically. Only what needs judgement is left for the LLM and returned as
+``MergeTask`` items:
+
+- ``conflict``: both sources state a market size (TAM, SAM, SOM) and the
+  numbers differ; the LLM writes the note explaining the gap
+- ``synthesis``: short text that has to be written from both sources
+  (tagline, description)
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .schemas import (
+    BusinessModel, CompanyOverview, CompetitiveAdvantage, Competitor, ConflictingInfo, FinancialData,
+    MarketInfo, MergedAnalysis, ProblemSolution, SourcedInfo, TeamMember,
+)
+from ..deck_analysis.schemas import DeckAnalysis, Metric
+from ..deck_analysis.text_layer import parse_numbers
+from ..web_analysis.schemas import Analysis
+
+
+DECK = "pitch deck"
+WEB = "web analysis"
+BOTH = "both"
+
+
+class MergeTask(BaseModel):
+    """A field the rule-based merge could not settle."""
+    field: str  # Dotted MergedAnalysis path, e.g. "market.tam"
+    kind: str  # "conflict" or "synthesis"
+    pitch_deck_info: Optional[str] = None
+    web_info: Optional[str] = None
+
+
+def _sourced(content: Optional[str], source: str) -> Optional[SourcedInfo]:
+    content = (content or "").strip()
+    return SourcedInfo(content=content, source=source) if content else None
+
+
+def _joined(items: List[str]) -> Optional[str]:
+    items = [i.strip() for i in items if i and i.strip()]
+    return ", ".join(items) if items else None
+
+
+def _metric_text(metric: Metric) -> str:
+    text = f"{metric.label}: {metric.value}"
+    return f"{text} ({metric.context})" if metric.context else text
+
+
+def _deck_metrics(deck: DeckAnalysis, category: str, pattern: str = "") -> List[Metric]:
+    metrics = deck.metrics.get(category, [])
+    if pattern:
+        metrics = [m for m in metrics if re.search(pattern, m.label, re.IGNORECASE)]
+    return metrics
+
+
+def _numbers_differ(a: str, b: str) -> bool:
+    """True when both texts carry numbers and none of them match."""
+    na, nb = parse_numbers(a), parse_numbers(b)
+    return bool(na and nb and not (na & nb))
+
+
+def _market_size(
+    deck: Optional[DeckAnalysis], web: Optional[Analysis], key: str, tasks: List[MergeTask]
+) -> Tuple[Optional[str], Optional[str]]:
+    """(deck value, web value) for TAM/SAM/SOM; records a conflict task when they disagree."""
+    deck_info = None
+    if deck:
+        metrics = _deck_metrics(deck, "market_size", rf"\b{key}\b")
+        deck_info = "; ".join(_metric_text(m) for m in metrics) or None
+    web_info = None
+    if web and web.market_size:
+        estimate = getattr(web.market_size, key.lower())
+        web_info = f"{estimate.value} ({estimate.formula})"
+    if deck_info and web_info and _numbers_differ(deck_info, web_info.split(" (", 1)[0]):
+        tasks.append(MergeTask(field=f"market.{key.lower()}", kind="conflict",
+                               pitch_deck_info=deck_info, web_info=web_info))
+    return deck_info, web_info
+
+
+def _pair_sourced(deck_info: Optional[str], web_info: Optional[str]) -> Optional[SourcedInfo]:
+    if deck_info and web_info:
+        return SourcedInfo(content=f"Pitch deck: {deck_info} | Web estimate: {web_info}", source=BOTH)
+    return _sourced(deck_info, DECK) or _sourced(web_info, WEB)
+
+
+def _competitors(deck: Optional[DeckAnalysis], web: Optional[Analysis]) -> List[Competitor]:
+    merged: Dict[str, Competitor] = {}
+    for c in (web.competition if web else []):
+        merged[c.name.strip().lower()] = Competitor(
+            name=c.name,
+            website=c.website,
+            similarities="; ".join(c.similarities) or c.problem_similarity,
+            differences="; ".join(c.differences) or None,
+            source=WEB,
+        )
+    for name in (deck.competition_mentioned if deck else []):
+        key = name.strip().lower()
+        if key in merged:
+            merged[key].source = BOTH
+        elif key:
+            merged[key] = Competitor(name=name.strip(), source=DECK)
+    return list(merged.values())
+
+
+def premerge(
+    company_name: str,
+    web: Optional[Analysis],
+    deck: Optional[DeckAnalysis],
+) -> Tuple[MergedAnalysis, List[MergeTask]]:
+    """
+    Map web and deck analyses onto ``MergedAnalysis`` without an LLM.
+
+    Args:
+        company_name: Company name
+        web: Web analysis (None if unavailable)
+        deck: Deck analysis (None if unavailable)
+
+    Returns:
+        (merged analysis, fields left for the LLM)
+    """
+    tasks: List[MergeTask] = []
+    bm = deck.business_model_details if deck else None
+
+    # Short texts written from both sources
+    web_summary = web.company_summary if web else None
+    deck_summary = _joined([deck.value_proposition, deck.solution_overview]) if deck else None
+    description = _sourced(web_summary, WEB) or _sourced(deck_summary, DECK)
+    if web_summary or deck_summary:
+        tasks.append(MergeTask(field="company_overview.tagline", kind="synthesis",
+                               pitch_deck_info=deck_summary, web_info=web_summary))
+    if web_summary and deck_summary:
+        tasks.append(MergeTask(field="company_overview.description", kind="synthesis",
+                               pitch_deck_info=deck_summary, web_info=web_summary))
+
+    overview = CompanyOverview(
+        name=company_name,
+        website=next((s for s in (web.sources if web else []) if s.startswith("http")), None),
+        description=description,
+        sector=_sourced(_joined([web.sector, web.subsector]) if web else None, WEB),
+        locations=_sourced(_joined(web.active_locations) if web else None, WEB),
+    )
+
+    problem_solution = ProblemSolution(
+        problem_web=web.problem.general if web else None,
+        problem_example_web=web.problem.example if web else None,
+        problem_deck=deck.problem_statement if deck else None,
+        solution_web=f"{web.solution.what_it_is}: {web.solution.how_it_works}" if web else None,
+        solution_example_web=web.solution.example if web else None,
+        solution_deck=deck.solution_overview if deck else None,
+        value_proposition=_sourced(deck.value_proposition if deck else None, DECK),
+        product_type=_sourced(web.product_type if web else None, WEB),
+        how_it_works=_sourced(web.solution.how_it_works if web else None, WEB)
+        or _sourced(deck.technical_approach if deck else None, DECK),
+    )
+
+    tam_deck, tam_web = _market_size(deck, web, "TAM", tasks)
+    sam_deck, sam_web = _market_size(deck, web, "SAM", tasks)
+    som_deck, som_web = _market_size(deck, web, "SOM", tasks)
+    market = MarketInfo(
+        target_market=_sourced(deck.target_market if deck else None, DECK),
+        tam=ConflictingInfo(pitch_deck_info=tam_deck, web_info=tam_web) if tam_deck or tam_web else None,
+        sam=_pair_sourced(sam_deck, sam_web),
+        som=_pair_sourced(som_deck, som_web),
+        market_insights=[
+            SourcedInfo(content=i, source=DECK)
+            for i in ((deck.market_insights + deck.industry_statistics) if deck else [])
+        ],
+    )
+
+    business_model = BusinessModel(
+        overview=_sourced(deck.business_model if deck else None, DECK),
+        revenue_model=_sourced(bm.revenue_model if bm else None, DECK),
+        pricing=_sourced(bm.pricing_structure if bm else None, DECK),
+        customer_acquisition=_sourced(bm.customer_acquisition if bm else None, DECK),
+        partnerships=_sourced(_joined(bm.partnerships) if bm else None, DECK),
+        distribution=_sourced(_joined(bm.distribution_channels) if bm else None, DECK),
+    )
+
+    team = [
+        TeamMember(name=m.name or "Unnamed", role=m.role or "Unknown", background=m.background, source=DECK)
+        for m in (deck.team if deck else [])
+        if m.name or m.role
+    ]
+
+    financial_data = FinancialData()
+    if deck:
+        funding = [
+            " ".join(filter(None, [f"{f.type}: {f.amount}", f"({f.date})" if f.date else None,
+                                   f"from {', '.join(f.investors)}" if f.investors else None,
+                                   "[non-dilutive]" if f.is_non_dilutive else None]))
+            for f in deck.funding_details
+        ]
+        seeking = [m for m in _deck_metrics(deck, "funding") if m.is_projection or
+                   re.search(r"rais|seek|ask|target|round", m.label, re.IGNORECASE)]
+        revenue = [m for m in _deck_metrics(deck, "financials", r"revenue|arr|mrr|sales") if not m.is_projection]
+        projections = [m for metrics in deck.metrics.values() for m in metrics if m.is_projection and m not in seeking]
+        financial_data = FinancialData(
+            funding_raised=[SourcedInfo(content=f, source=DECK) for f in funding],
+            funding_seeking=_sourced("; ".join(_metric_text(m) for m in seeking), DECK),
+            revenue=ConflictingInfo(pitch_deck_info="; ".join(_metric_text(m) for m in revenue)) if revenue else None,
+            traction_metrics=[
+                SourcedInfo(content=_metric_text(m), source=DECK)
+                for m in _deck_metrics(deck, "traction") + _deck_metrics(deck, "lois")
+                if not m.is_projection
+            ],
+            projections=[SourcedInfo(content=_metric_text(m), source=DECK) for m in projections]
+            + [
+                SourcedInfo(content=f"{p.metric_name}: {p.projected_value}"
+                            + (f" by {p.timeframe}" if p.timeframe else "")
+                            + (f" — {p.realism_assessment}" if p.realism_assessment else ""), source=DECK)
+                for p in deck.projection_analysis
+            ],
+        )
+
+    merged = MergedAnalysis(
+        company_overview=overview,
+        problem_solution=problem_solution,
+        market=market,
+        business_model=business_model,
+        team=team,
+        financial_data=financial_data,
+        competitors=_competitors(deck, web),
+        competitive_advantages=[
+            CompetitiveAdvantage(
+                type=a.category, description=a.description, status=a.status, source=DECK
+            )
+            for a in (deck.competitive_advantages if deck else [])
+        ],
+        technology=_sourced(deck.technical_approach or _joined(deck.technology_stack), DECK) if deck else None,
+        go_to_market=_sourced(deck.gtm_strategy_details or deck.sales_strategy, DECK) if deck else None,
+        awards_recognition=[
+            SourcedInfo(content=" ".join(filter(None, [a.name, f"({a.type})", a.amount, a.year, a.organization])),
+                        source=DECK)
+            for a in (deck.awards_and_grants if deck else [])
+        ],
+        customer_evidence=[
+            SourcedInfo(content=c, source=DECK)
+            for c in ((deck.customer_testimonials + deck.case_studies + deck.pilot_programs) if deck else [])
+        ],
+        additional_insights=[
+            SourcedInfo(content=f"{i.title}: {i.description}", source=DECK)
+            for i in (deck.additional_insights if deck else [])
+        ],
+        deck_completeness_notes=_joined(
+            [deck.deck_quality_assessment]
+            + ([f"Missing: {', '.join(deck.missing_elements)}"] if deck.missing_elements else [])
+        ) if deck else None,
+    )
+    return merged, tasks
+
+
+def apply_resolutions(merged: MergedAnalysis, tasks: List[MergeTask], resolutions: Dict[str, str]) -> MergedAnalysis:
+    """
+    Write LLM answers for merge tasks back into the pre-merged analysis.
+
+    Args:
+        merged: Result of ``premerge``
+        tasks: Tasks returned by ``premerge``
+        resolutions: Task field -> text written by the LLM
+
+    Returns:
+        Updated analysis (copy)
+    """
+    merged = merged.model_copy(deep=True)
+    for task in tasks:
+        text = (resolutions.get(task.field) or "").strip()
+        if not text:
+            continue
+        section, name = task.field.split(".", 1)
+        target = getattr(merged, section)
+        if task.kind == "synthesis":
+            setattr(target, name, SourcedInfo(content=text, source=BOTH if task.pitch_deck_info and task.web_info
+                                              else DECK if task.pitch_deck_info else WEB))
+        elif name == "tam":
+            target.tam = ConflictingInfo(pitch_deck_info=task.pitch_deck_info, web_info=task.web_info, note=text)
+        else:
+            # SAM/SOM are plain SourcedInfo: keep both values and add the note
+            current = getattr(target, name)
+            content = current.content if current else f"{task.pitch_deck_info} | {task.web_info}"
+            setattr(target, name, SourcedInfo(content=f"{content} — {text}", source=BOTH))
+    return merged
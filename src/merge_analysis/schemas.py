@@ -112,3 +112,14 @@ class MergedAnalysis(BaseModel):
     customer_evidence: List[SourcedInfo] = Field(default_factory=list, description="Customer testimonials and evidence")
     additional_insights: List[SourcedInfo] = Field(default_factory=list, description="Any other relevant information")
     deck_completeness_notes: Optional[str] = Field(default=None, description="Notes about deck completeness (from pitch deck analysis)")
+
+
+class FieldResolution(BaseModel):
+    """LLM answer for one field the rule-based pre-merge left open."""
+    field: str = Field(description="Field path exactly as given, e.g. 'market.tam'")
+    text: str = Field(description="Synthesized text or conflict note")
+
+
+class MergeResolution(BaseModel):
+    """Reply shape of the conflict/synthesis prompt."""
+    resolutions: List[FieldResolution] = Field(default_factory=list, description="One entry per requested field")
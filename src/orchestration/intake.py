@@ -0,0 +1,244 @@
+"""
+Job intake: stream startups from CSV, JSONL or stdin into the work queue.
+
+Every entry point (``src.main``, ``src.web_analysis.main``,
+``scripts/prepare_pdfs.py``) reads rows through here, so header
+normalization, URL validation and slug de-duplication live in one place.
+
+An optional ``priority`` column (``urgent``, ``high``, ``normal``, ``low``
+or an integer) decides which companies workers claim first; ``--priority``
+overrides it for every row of a source.
+
+Usage (append to a queue while a run is in progress):
+    python -m src.orchestration.intake add new_startups.csv
+    python -m src.orchestration.intake add partner_meeting.csv --priority urgent
+    cat more.jsonl | python -m src.orchestration.intake add - --format jsonl
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+from urllib.parse import urlparse
+
+from ..core.utils import slugify
+from .work_queue import Job, JobQueue, DEFAULT_QUEUE_PATH
+
+
+PRIORITY_LEVELS: Dict[str, int] = {"low": -1, "normal": 0, "high": 1, "urgent": 2}
+
+
+def parse_priority(value: str) -> int:
+    """
+    Parse a priority label or integer.
+
+    Args:
+        value: "urgent", "high", "normal", "low", an integer, or "" (normal)
+
+    Returns:
+        Priority (higher is claimed first)
+
+    Raises:
+        ValueError: Unknown label
+    """
+    value = (value or "").strip().lower()
+    if not value:
+        return PRIORITY_LEVELS["normal"]
+    if value in PRIORITY_LEVELS:
+        return PRIORITY_LEVELS[value]
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid priority '{value}' (use {', '.join(PRIORITY_LEVELS)} or an integer)"
+        ) from None
+
+
+def normalize_row(row: Dict) -> Dict[str, str]:
+    """Strip BOMs and whitespace from keys and values."""
+    return {
+        (k or "").lstrip("\ufeff").strip(): ("" if v is None else str(v)).strip()
+        for k, v in row.items()
+    }
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Validate and normalize a startup URL.
+
+    Args:
+        url: Raw URL from the input (scheme optional)
+
+    Returns:
+        Normalized URL, "" for an empty input, or None if the URL is invalid
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    host = parsed.hostname or ""
+    if " " in url or not host:
+        return None
+    if "." not in host and host != "localhost":
+        return None
+    return url
+
+
+def iter_csv_rows(f: TextIO) -> Iterator[Dict[str, str]]:
+    """Stream normalized rows from an open CSV file."""
+    reader = csv.DictReader(f)
+    # Normalize headers in case of BOM / stray spaces
+    if reader.fieldnames:
+        reader.fieldnames = [(fn or "").lstrip("\ufeff").strip() for fn in reader.fieldnames]
+    for row in reader:
+        yield normalize_row(row)
+
+
+def iter_jsonl_rows(f: TextIO) -> Iterator[Dict[str, str]]:
+    """Stream normalized rows from an open JSONL file (one object per line)."""
+    for line_number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping JSONL line {line_number}: {e}")
+            continue
+        if isinstance(obj, dict):
+            yield normalize_row(obj)
+
+
+def _detect_format(source: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    if source.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def iter_rows(source: str, fmt: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream normalized rows from a file path or ``-`` for stdin.
+
+    Args:
+        source: Path to a CSV/JSONL file, or "-" for stdin
+        fmt: "csv" or "jsonl" (detected from the extension when omitted)
+    """
+    fmt = _detect_format(source, fmt)
+    reader = iter_jsonl_rows if fmt == "jsonl" else iter_csv_rows
+    if source == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        yield from reader(stream)
+        return
+    # Read with utf-8-sig to strip BOM if present
+    with open(source, newline="", encoding="utf-8-sig") as f:
+        yield from reader(f)
+
+
+def iter_jobs(
+    rows: Iterable[Dict[str, str]],
+    require_url: bool = False,
+    seen: Optional[set] = None,
+    priority: Optional[int] = None,
+    kind_of: Optional[Callable[[Job], str]] = None,
+) -> Iterator[Job]:
+    """
+    Turn rows into validated, de-duplicated jobs.
+
+    Args:
+        rows: Normalized input rows (startup_name, startup_url, priority, ...)
+        require_url: Skip rows without a URL (web-only runners)
+        seen: Slugs already emitted; shared across calls to dedupe several sources
+        priority: Overrides the rows' priority column
+        kind_of: Job -> kind for fair queuing ("deck"/"web"); unset kinds count as full pipelines
+
+    Yields:
+        One Job per unique slug
+    """
+    seen = set() if seen is None else seen
+    for row in rows:
+        name = row.get("startup_name", "")
+        if not name:
+            print(f"Skipping row (missing company name): {row}")
+            continue
+
+        url = normalize_url(row.get("startup_url", ""))
+        if url is None:
+            print(f"Skipping row (invalid URL): {row}")
+            continue
+        if require_url and not url:
+            print(f"Skipping row (missing name/url): {row}")
+            continue
+
+        slug = slugify(name)
+        if slug in seen:
+            print(f"Skipping duplicate startup: {name}")
+            continue
+        seen.add(slug)
+
+        job_priority = priority
+        if job_priority is None:
+            try:
+                job_priority = parse_priority(row.get("priority", ""))
+            except ValueError as e:
+                print(f"{e} for {name}, using normal")
+                job_priority = PRIORITY_LEVELS["normal"]
+
+        extra = {k: v for k, v in row.items() if k not in ("startup_name", "startup_url", "priority")}
+        job = Job(startup_name=name, startup_url=url, slug=slug, extra=extra, priority=job_priority)
+        if kind_of is not None:
+            job.kind = kind_of(job)
+        yield job
+
+
+def enqueue(source: str, queue: JobQueue, fmt: Optional[str] = None, priority: Optional[int] = None) -> int:
+    """
+    Stream a source into a work queue.
+
+    Args:
+        source: Path to CSV/JSONL, or "-" for stdin
+        queue: JobQueue to push onto
+        fmt: Optional explicit format
+        priority: Overrides the rows' priority column
+
+    Returns:
+        Number of jobs added (pending jobs bumped to a higher priority are not counted)
+    """
+    added = 0
+    for job in iter_jobs(iter_rows(source, fmt), priority=priority):
+        if queue.put(job):
+            added += 1
+    return added
+
+
+def main():
+    """CLI: append startups to an existing queue."""
+    parser = argparse.ArgumentParser(description="Append startups to the PitchPanda work queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="Stream a CSV/JSONL file (or - for stdin) into the queue")
+    add.add_argument("source")
+    add.add_argument("--format", choices=["csv", "jsonl"])
+    add.add_argument("--queue", default=DEFAULT_QUEUE_PATH)
+    add.add_argument("--priority", help="Priority for every row: urgent, high, normal, low or an integer")
+    args = parser.parse_args()
+
+    if args.source != "-" and not os.path.exists(args.source):
+        raise SystemExit(f"Input not found: {args.source}")
+    try:
+        priority = parse_priority(args.priority) if args.priority else None
+    except ValueError as e:
+        parser.error(str(e))
+    added = enqueue(args.source, JobQueue(args.queue), args.format, priority=priority)
+    print(f"Queued {added} startups in {args.queue}")
+
+
+if __name__ == "__main__":
+    main()
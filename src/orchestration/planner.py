@@ -0,0 +1,615 @@
+"""
+Pre-flight run planning and a runtime budget guard.
+
+``plan_run`` walks the input rows and decks before a big run and estimates,
+per company and stage, the input text tokens (counted with tiktoken on the
+actual prompts and response schemas), slide image tokens and output tokens.
+It projects cost and wall time for a worker count and request rate limit
+without calling any model:
+
+    python -m src.main pitches.csv --plan --workers 8 --rpm 500
+
+``BudgetGuard`` enforces a spend and/or deadline cap while the run is going.
+For each claimed company it checks what is already spent, what the
+companies in flight are expected to cost, and how much of the remaining
+time the company may use. It runs the company in full, with the least
+degraded execution plan that fits (skipped competitor research or market
+sizing, low-detail slides, deferred evaluation; see core/degradation.py),
+or not at all, in which case the job goes back to the queue for a later
+run.
+"""
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from ..core.degradation import (
+    DEFER_EVALUATION, DEGRADATION_LEVELS, LOW_DETAIL_SLIDES, SKIP_COMPETITION, SKIP_MARKET_SIZE,
+)
+from ..core.structured import strict_response_format
+from ..core.telemetry import estimate_cost, estimate_image_tokens
+from ..core.utils import slugify
+from ..deck_analysis.graph import (
+    DECK_EXCLUDE, MIN_TRIAGE_SLIDES, TRIAGE_MODEL, VISION_MODEL,
+)
+from ..deck_analysis.prompts import create_deck_summary_message, create_triage_message
+from ..deck_analysis.rasterizers import RASTER_DPI, get_rasterizer
+from ..deck_analysis.schemas import DeckAnalysis, DeckTriage
+from ..evaluation.criteria import CRITERIA
+from ..evaluation.graph import (
+    CRITERION_INPUT_PROMPT, EVALUATION_MODE, EVALUATION_MODEL, RUBRIC_CONTEXT_PROMPT,
+    RUBRIC_SYSTEM_PROMPT, RUBRIC_TASK_PROMPT, SUMMARY_INPUT_PROMPT, SUMMARY_SYSTEM_PROMPT,
+    criterion_system_prompt,
+)
+from ..evaluation.rubrics import get_rubric, rubric_instructions
+from ..evaluation.schemas import CompanyEvaluation, Criterion, EvaluationSummary
+from ..merge_analysis.graph import RESOLVE_INPUT_PROMPT, RESOLVE_MODEL, RESOLVE_SYSTEM_PROMPT
+from ..merge_analysis.schemas import MergeResolution
+from ..web_analysis.graph import ANALYSIS_EXCLUDE, WEB_MODEL
+from ..web_analysis.prompts import COMP_PROMPT, MARKET_SIZE_PROMPT, prompt as WEB_PROMPT
+from ..web_analysis.schemas import Analysis, CompetitorList, MarketSize
+
+
+# Characters per token when the tiktoken encoding is unavailable (offline)
+CHARS_PER_TOKEN = 4.0
+# Homepage text kept by fetch_website
+WEB_TEXT_CHARS = 10000
+# Slides are assumed 16:9 (960x540 pt) when rendered at RASTER_DPI
+SLIDE_POINTS = (960, 540)
+# Share of slides triage keeps at high detail (team/market/traction/financials)
+HIGH_DETAIL_SHARE = 0.7
+# Pages assumed when a deck cannot be opened or comes from stdin
+DEFAULT_PAGES = 15
+# Typical sizes (tokens) of generated documents fed into later stages
+WEB_ANALYSIS_TOKENS = 1800
+DECK_ANALYSIS_TOKENS = 4500
+MERGED_ANALYSIS_TOKENS = 3500
+# Typical output tokens per call
+OUTPUT_TOKENS: Dict[str, int] = {
+    "web.analyze": 700,
+    "web.competition": 900,
+    "web.market_size": 600,
+    "deck.triage_per_slide": 12,
+    "deck.analyze": 4000,
+    "merge.resolve": 300,
+    "evaluation.criterion": 200,
+    "evaluation.summary": 700,
+    "evaluation.rubric": 1500,
+}
+# Latency model per model: (seconds of overhead, input tokens/s, output tokens/s)
+LATENCY: Dict[str, tuple] = {
+    "gpt-4o": (1.0, 6000.0, 60.0),
+    "gpt-4o-mini": (0.6, 10000.0, 90.0),
+}
+# Homepage fetch and slide rendering (seconds)
+FETCH_SECONDS = 2.0
+RASTER_SECONDS_PER_PAGE = 0.15
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens the way the OpenAI models do (o200k_base).
+
+    Falls back to a characters-per-token estimate when tiktoken or its
+    encoding file is unavailable.
+    """
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def _schema_tokens(schema, exclude=()) -> int:
+    return count_tokens(json.dumps(strict_response_format(schema, exclude=exclude)))
+
+
+def _template_tokens(template) -> int:
+    """Static text of a ChatPromptTemplate (variables count as their names)."""
+    return sum(count_tokens(m.prompt.template) for m in template.messages if hasattr(m, "prompt"))
+
+
+def _message_tokens(messages) -> int:
+    """Text tokens of LangChain messages (image parts are counted separately)."""
+    total = 0
+    for message in messages:
+        content = message.content
+        if isinstance(content, str):
+            total += count_tokens(content)
+        else:
+            total += sum(count_tokens(p.get("text", "")) for p in content if p.get("type") == "text")
+    return total
+
+
+class CallEstimate(BaseModel):
+    """One projected LLM call."""
+    stage: str
+    node: str
+    model: str
+    input_tokens: int
+    image_tokens: int = 0
+    output_tokens: int
+    # Calls sharing a group run concurrently; the slowest one counts for wall time
+    group: Optional[str] = None
+
+    @property
+    def cost_usd(self) -> float:
+        return estimate_cost(self.model, self.input_tokens + self.image_tokens, self.output_tokens)
+
+    @property
+    def seconds(self) -> float:
+        overhead, input_rate, output_rate = LATENCY.get(self.model, LATENCY["gpt-4o"])
+        return overhead + (self.input_tokens + self.image_tokens) / input_rate + self.output_tokens / output_rate
+
+
+class CompanyEstimate(BaseModel):
+    """Projected calls and non-LLM work for one company."""
+    name: str
+    slug: str
+    has_url: bool
+    pdf_path: Optional[str] = None
+    pages: int = 0
+    calls: List[CallEstimate] = Field(default_factory=list)
+    # Fetching and rasterization time
+    io_seconds: float = 0.0
+
+    def degraded(self, degradations: Iterable[str]) -> "CompanyEstimate":
+        """
+        Projection under a deadline-mode execution plan.
+
+        Args:
+            degradations: Degradation names (core/degradation.py)
+
+        Returns:
+            A copy with the skipped calls removed and the cheaper ones adjusted
+        """
+        applied = set(degradations)
+        if not applied:
+            return self
+        calls = []
+        for call in self.calls:
+            if call.stage == "web" and (
+                (call.node == "competition" and SKIP_COMPETITION in applied)
+                or (call.node == "market_size" and SKIP_MARKET_SIZE in applied)
+            ):
+                continue
+            if call.stage == "evaluation" and DEFER_EVALUATION in applied:
+                continue
+            if call.stage == "deck" and LOW_DETAIL_SLIDES in applied:
+                if call.node == "triage_slides":
+                    continue
+                call = call.model_copy(update={"image_tokens": self.pages * estimate_image_tokens(0, 0, "low")})
+            calls.append(call)
+        return self.model_copy(update={"calls": calls})
+
+    def cost_usd(self) -> float:
+        return sum(c.cost_usd for c in self.calls)
+
+    def wall_seconds(self) -> float:
+        groups: Dict[str, float] = {}
+        total = self.io_seconds
+        for call in self.calls:
+            if call.group:
+                groups[call.group] = max(groups.get(call.group, 0.0), call.seconds)
+            else:
+                total += call.seconds
+        return total + sum(groups.values())
+
+
+class RunPlan(BaseModel):
+    """Projection for a whole run."""
+    companies: List[CompanyEstimate]
+    workers: int
+    rpm: Optional[int] = None
+
+    @property
+    def llm_calls(self) -> int:
+        return sum(len(c.calls) for c in self.companies)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(c.cost_usd() for c in self.companies)
+
+    @property
+    def wall_seconds(self) -> float:
+        """Worker-bound wall time, or the rate limit's if that is slower."""
+        by_workers = sum(c.wall_seconds() for c in self.companies) / max(1, self.workers)
+        by_rate = self.llm_calls / self.rpm * 60 if self.rpm else 0.0
+        return max(by_workers, by_rate)
+
+
+def count_pages(pdf_path: str) -> int:
+    """Page count of a deck (DEFAULT_PAGES if it cannot be read)."""
+    try:
+        return get_rasterizer().page_count(pdf_path)
+    except Exception as e:
+        print(f"  Could not count pages of {pdf_path}: {e}")
+        return DEFAULT_PAGES
+
+
+def _slide_image_tokens(pages: int) -> tuple:
+    """(triage tokens, analysis tokens) for a deck of ``pages`` slides."""
+    width, height = (round(p * RASTER_DPI / 72) for p in SLIDE_POINTS)
+    high = estimate_image_tokens(width, height, "high")
+    low = estimate_image_tokens(width, height, "low")
+    if pages < MIN_TRIAGE_SLIDES:
+        return 0, pages * high
+    high_slides = round(pages * HIGH_DETAIL_SHARE)
+    return pages * low, high_slides * high + (pages - high_slides) * low
+
+
+def estimate_company(
+    name: str,
+    url: str,
+    pdf_path: Optional[str],
+    pages: Optional[int] = None,
+    rubrics: Iterable[str] = ("vc",),
+) -> CompanyEstimate:
+    """
+    Project the LLM calls the pipeline makes for one company.
+
+    Args:
+        name: Startup name
+        url: Website URL (empty = no web analysis)
+        pdf_path: Pitch deck, if one was found
+        pages: Page count (counted from the PDF when None)
+        rubrics: Evaluation rubrics
+
+    Returns:
+        CompanyEstimate with one CallEstimate per projected call
+    """
+    est = CompanyEstimate(name=name, slug=slugify(name), has_url=bool(url), pdf_path=pdf_path)
+    calls = est.calls
+
+    if url:
+        est.io_seconds += FETCH_SECONDS
+        web_text = WEB_TEXT_CHARS // CHARS_PER_TOKEN
+        analysis_in = _template_tokens(WEB_PROMPT) + int(web_text) + _schema_tokens(Analysis, ANALYSIS_EXCLUDE)
+        calls.append(CallEstimate(stage="web", node="analyze", model=WEB_MODEL,
+                                  input_tokens=analysis_in, output_tokens=OUTPUT_TOKENS["web.analyze"]))
+        summary = OUTPUT_TOKENS["web.analyze"]
+        calls.append(CallEstimate(stage="web", node="competition", model=WEB_MODEL,
+                                  input_tokens=_template_tokens(COMP_PROMPT) + summary + _schema_tokens(CompetitorList),
+                                  output_tokens=OUTPUT_TOKENS["web.competition"]))
+        calls.append(CallEstimate(stage="web", node="market_size", model=WEB_MODEL,
+                                  input_tokens=_template_tokens(MARKET_SIZE_PROMPT) + summary + _schema_tokens(MarketSize),
+                                  output_tokens=OUTPUT_TOKENS["web.market_size"]))
+
+    if pdf_path:
+        est.pages = count_pages(pdf_path) if pages is None else pages
+        est.io_seconds += est.pages * RASTER_SECONDS_PER_PAGE
+        triage_images, analysis_images = _slide_image_tokens(est.pages)
+        if triage_images:
+            calls.append(CallEstimate(
+                stage="deck", node="triage_slides", model=TRIAGE_MODEL,
+                input_tokens=_message_tokens(create_triage_message([])) + 5 * est.pages + _schema_tokens(DeckTriage),
+                image_tokens=triage_images,
+                output_tokens=OUTPUT_TOKENS["deck.triage_per_slide"] * est.pages,
+            ))
+        calls.append(CallEstimate(
+            stage="deck", node="analyze_deck", model=VISION_MODEL,
+            input_tokens=_message_tokens(create_deck_summary_message([])) + _schema_tokens(DeckAnalysis, DECK_EXCLUDE),
+            image_tokens=analysis_images,
+            output_tokens=OUTPUT_TOKENS["deck.analyze"],
+        ))
+
+    if not (url or pdf_path):
+        return est
+
+    # Both analyses write JSON sidecars, so the rule-based pre-merge runs and only conflicts go to the LLM
+    sources = (WEB_ANALYSIS_TOKENS if url else 0) + (DECK_ANALYSIS_TOKENS if pdf_path else 0)
+    calls.append(CallEstimate(
+        stage="merge", node="resolve_conflicts", model=RESOLVE_MODEL,
+        input_tokens=count_tokens(RESOLVE_SYSTEM_PROMPT + RESOLVE_INPUT_PROMPT) + sources // 3
+        + _schema_tokens(MergeResolution),
+        output_tokens=OUTPUT_TOKENS["merge.resolve"],
+    ))
+
+    rubrics = list(rubrics)
+    if len(rubrics) > 1:
+        context = count_tokens(RUBRIC_SYSTEM_PROMPT + RUBRIC_CONTEXT_PROMPT) + MERGED_ANALYSIS_TOKENS
+        for name in rubrics:
+            task = count_tokens(RUBRIC_TASK_PROMPT + rubric_instructions(get_rubric(name)))
+            calls.append(CallEstimate(
+                stage="evaluation", node=f"rubric_{name}", model=EVALUATION_MODEL,
+                input_tokens=context + task + _schema_tokens(CompanyEvaluation),
+                output_tokens=OUTPUT_TOKENS["evaluation.rubric"], group="rubrics",
+            ))
+    elif EVALUATION_MODE == "parallel":
+        # Each criterion reads only its sections of the merged analysis (about half of it)
+        for spec in CRITERIA:
+            calls.append(CallEstimate(
+                stage="evaluation", node=f"score_{spec.field}", model=EVALUATION_MODEL,
+                input_tokens=count_tokens(criterion_system_prompt(spec) + CRITERION_INPUT_PROMPT)
+                + MERGED_ANALYSIS_TOKENS // 2 + _schema_tokens(Criterion),
+                output_tokens=OUTPUT_TOKENS["evaluation.criterion"], group="criteria",
+            ))
+        calls.append(CallEstimate(
+            stage="evaluation", node="summarize_evaluation", model=EVALUATION_MODEL,
+            input_tokens=count_tokens(SUMMARY_SYSTEM_PROMPT + SUMMARY_INPUT_PROMPT)
+            + MERGED_ANALYSIS_TOKENS // 2 + _schema_tokens(EvaluationSummary),
+            output_tokens=OUTPUT_TOKENS["evaluation.summary"],
+        ))
+    else:
+        calls.append(CallEstimate(
+            stage="evaluation", node="evaluate_company", model=EVALUATION_MODEL,
+            input_tokens=count_tokens(rubric_instructions(get_rubric(rubrics[0]))) + MERGED_ANALYSIS_TOKENS
+            + _schema_tokens(CompanyEvaluation),
+            output_tokens=OUTPUT_TOKENS["evaluation.rubric"],
+        ))
+    return est
+
+
+def plan_run(
+    jobs: Iterable,
+    find_deck: Callable[[str], Optional[str]],
+    workers: int = 1,
+    rpm: Optional[int] = None,
+    rubrics: Iterable[str] = ("vc",),
+) -> RunPlan:
+    """
+    Project cost and wall time of a run without calling any model.
+
+    Args:
+        jobs: Jobs with ``startup_name`` and ``startup_url`` (see intake.iter_jobs)
+        find_deck: Company name -> deck PDF path or None
+        workers: Companies analyzed concurrently
+        rpm: Request-per-minute limit of the API key (None = unlimited)
+        rubrics: Evaluation rubrics
+
+    Returns:
+        RunPlan
+    """
+    rubrics = list(rubrics)
+    companies = [
+        estimate_company(job.startup_name, job.startup_url, find_deck(job.startup_name), rubrics=rubrics)
+        for job in jobs
+    ]
+    return RunPlan(companies=companies, workers=workers, rpm=rpm)
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a duration such as "90m", "1.5h", "45s" or a plain number of minutes.
+
+    Args:
+        value: Duration text
+
+    Returns:
+        Seconds
+
+    Raises:
+        ValueError: Not a positive duration
+    """
+    text = value.strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600}
+    scale = units.get(text[-1:], None)
+    number = text[:-1] if scale else text
+    try:
+        seconds = float(number) * (scale or 60)
+    except ValueError:
+        raise ValueError(f"Invalid duration '{value}' (use e.g. 90m, 1.5h or minutes)") from None
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: '{value}'")
+    return seconds
+
+
+def _duration(seconds: float) -> str:
+    minutes = seconds / 60
+    return f"{minutes / 60:.1f} h" if minutes >= 90 else f"{minutes:.0f} min"
+
+
+def render_plan(plan: RunPlan, top_n: int = 10) -> str:
+    """
+    Render a run plan as markdown.
+
+    Args:
+        plan: RunPlan from ``plan_run``
+        top_n: Most expensive companies to list
+
+    Returns:
+        Markdown text
+    """
+    stages: Dict[str, Dict[str, float]] = {}
+    for company in plan.companies:
+        for call in company.calls:
+            row = stages.setdefault(call.stage, {"calls": 0, "input": 0, "images": 0, "output": 0, "cost": 0.0})
+            row["calls"] += 1
+            row["input"] += call.input_tokens
+            row["images"] += call.image_tokens
+            row["output"] += call.output_tokens
+            row["cost"] += call.cost_usd
+
+    decks = [c for c in plan.companies if c.pdf_path]
+    lines = [
+        "# PitchPanda run plan",
+        "",
+        f"- Companies: {len(plan.companies)} ({sum(c.has_url for c in plan.companies)} with a URL, "
+        f"{len(decks)} with a deck, {sum(c.pages for c in decks)} pages)",
+        f"- LLM calls: {plan.llm_calls}",
+        f"- Projected cost: ${plan.cost_usd:.2f}",
+        f"- Projected wall time: {_duration(plan.wall_seconds)} with {plan.workers} worker(s)"
+        + (f" at {plan.rpm} requests/min" if plan.rpm else ""),
+        "",
+        "| Stage | Calls | Input tokens | Image tokens | Output tokens | Cost ($) |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for stage, row in stages.items():
+        lines.append(
+            f"| {stage} | {row['calls']:.0f} | {row['input']:.0f} | {row['images']:.0f} | "
+            f"{row['output']:.0f} | {row['cost']:.2f} |"
+        )
+    if plan.rpm and plan.llm_calls / plan.rpm * 60 >= plan.wall_seconds:
+        lines += ["", "The rate limit, not the worker count, bounds wall time."]
+
+    lines += ["", "## Deadline-mode plans", "",
+              "| Degradations | Cost ($) | Wall |", "|---|---:|---:|"]
+    for level in DEGRADATION_LEVELS:
+        degraded = plan.model_copy(update={"companies": [c.degraded(level) for c in plan.companies]})
+        lines.append(f"| {', '.join(level) or 'none'} | {degraded.cost_usd:.2f} | {_duration(degraded.wall_seconds)} |")
+
+    lines += ["", f"## Most expensive companies (top {top_n})", "",
+              "| Company | Pages | Calls | Cost ($) | Wall |", "|---|---:|---:|---:|---:|"]
+    for c in sorted(plan.companies, key=lambda c: c.cost_usd(), reverse=True)[:top_n]:
+        lines.append(f"| {c.name} | {c.pages} | {len(c.calls)} | {c.cost_usd():.3f} | {_duration(c.wall_seconds())} |")
+    return "\n".join(lines) + "\n"
+
+
+# Budget guard decisions
+ADMIT = "admit"
+DEGRADE = "degrade"
+STOP = "stop"
+# Finished companies needed before observed/planned ratios calibrate the estimates
+MIN_OBSERVED = 3
+
+
+class Admission(NamedTuple):
+    """A budget guard decision and the execution plan it admits a company with."""
+    decision: str
+    degradations: Tuple[str, ...] = ()
+    # Projected (calibrated) cost and wall time of the company under this plan
+    cost_usd: float = 0.0
+    wall_seconds: float = 0.0
+    # Uncalibrated projection, compared with the actual cost/wall when it finishes
+    planned: Tuple[float, float] = (0.0, 0.0)
+
+
+class BudgetGuard:
+    """
+    Admits companies, with an execution plan, while the spend and deadline caps allow.
+
+    For each claimed company the guard picks the least degraded level of
+    ``DEGRADATION_LEVELS`` whose projected cost still fits the spend cap
+    and whose projected wall time fits the company's share of the time
+    left (remaining time x workers / companies still to run). When only
+    the fully degraded plan would finish before the deadline it uses that;
+    when not even that fits, the company is not admitted. Projections come
+    from the plan and are scaled by the observed/planned ratios once a few
+    companies have finished.
+
+    Thread-safe; one guard is shared by all workers of a run.
+    """
+
+    def __init__(
+        self,
+        max_cost_usd: Optional[float] = None,
+        deadline: Optional[float] = None,
+        estimate: Optional[CompanyEstimate] = None,
+        workers: int = 1,
+    ):
+        """
+        Args:
+            max_cost_usd: Spend cap for the run (None = no cap)
+            deadline: Epoch seconds by which the run must finish (None = none)
+            estimate: Typical company, used for jobs without their own estimate
+            workers: Companies analyzed concurrently
+        """
+        self.max_cost_usd = max_cost_usd
+        self.deadline = deadline
+        self.workers = max(1, workers)
+        self.estimate = estimate or estimate_company("typical", "https://example.com", "deck.pdf", pages=DEFAULT_PAGES)
+        self._lock = threading.Lock()
+        self._spent = 0.0
+        self._committed = 0.0  # projected cost of companies in flight
+        self._in_flight = 0
+        self._observed: List[tuple] = []  # (actual cost, actual wall, planned cost, planned wall)
+        self.admitted = self.degraded = self.stopped = 0
+        self.levels_used: Dict[Tuple[str, ...], int] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.max_cost_usd is not None or self.deadline is not None
+
+    def _ratios(self) -> tuple:
+        """Observed / planned (cost, wall) over finished companies (1, 1 until enough are seen)."""
+        if len(self._observed) < MIN_OBSERVED:
+            return 1.0, 1.0
+        planned_cost = sum(o[2] for o in self._observed)
+        planned_wall = sum(o[3] for o in self._observed)
+        return (
+            sum(o[0] for o in self._observed) / planned_cost if planned_cost else 1.0,
+            sum(o[1] for o in self._observed) / planned_wall if planned_wall else 1.0,
+        )
+
+    def admit(self, estimate: Optional[CompanyEstimate] = None, backlog: int = 0) -> Admission:
+        """
+        Decide whether (and how) a worker may run a claimed company.
+
+        Args:
+            estimate: The company's projection (default: the guard's typical company)
+            backlog: Companies still pending after this one
+
+        Returns:
+            Admission: ADMIT (full plan), DEGRADE (with degradations) or STOP
+        """
+        est = estimate or self.estimate
+        with self._lock:
+            if not self.active:
+                self._in_flight += 1
+                self.admitted += 1
+                return Admission(ADMIT)
+            cost_ratio, wall_ratio = self._ratios()
+            remaining = self.deadline - time.time() if self.deadline is not None else None
+            # This company's fair share of the worker-time left
+            share = remaining * self.workers / (backlog + self._in_flight + 1) if remaining is not None else None
+
+            candidates = []
+            for level in DEGRADATION_LEVELS:
+                plan = est.degraded(level)
+                planned = (plan.cost_usd(), plan.wall_seconds())
+                cost, wall = planned[0] * cost_ratio, planned[1] * wall_ratio
+                if self.max_cost_usd is not None and self._spent + self._committed + cost > self.max_cost_usd:
+                    continue
+                candidates.append(Admission(DEGRADE if level else ADMIT, level, cost, wall, planned))
+            admission = next((a for a in candidates if share is None or a.wall_seconds <= share), None)
+            if admission is None and candidates and candidates[-1].wall_seconds <= remaining:
+                # Behind schedule: run as degraded as possible rather than not at all
+                admission = candidates[-1]
+            if admission is None:
+                self.stopped += 1
+                return Admission(STOP)
+
+            self._in_flight += 1
+            self._committed += admission.cost_usd
+            if admission.decision == DEGRADE:
+                self.degraded += 1
+            else:
+                self.admitted += 1
+            self.levels_used[admission.degradations] = self.levels_used.get(admission.degradations, 0) + 1
+            return admission
+
+    def finished(self, admission: Admission, cost_usd: float, wall_seconds: float) -> None:
+        """Record a finished (or failed) company admitted by ``admit``."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._committed = max(0.0, self._committed - admission.cost_usd)
+            self._spent += cost_usd
+            if admission.planned[0] or admission.planned[1]:
+                self._observed.append((cost_usd, wall_seconds) + tuple(admission.planned))
+
+    def summary(self) -> str:
+        with self._lock:
+            spent = self._spent
+        parts = [f"${spent:.2f} spent"]
+        if self.max_cost_usd is not None:
+            parts.append(f"cap ${self.max_cost_usd:.2f}")
+        lines = [
+            f"Budget guard: {', '.join(parts)}; {self.admitted} full, "
+            f"{self.degraded} degraded, stopped {'yes' if self.stopped else 'no'}"
+        ]
+        for level, count in sorted(self.levels_used.items(), key=lambda item: len(item[0])):
+            if level:
+                lines.append(f"  {count} x {', '.join(level)}")
+        return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""
+Split a batch run across machines and consolidate the results.
+
+Each machine runs ``python -m src.main pitches.csv --shard i/N`` and only
+analyzes the companies whose stable slug hash falls in its shard. At the end
+of a run a ledger (one JSON line per job) is written next to the outputs.
+Once every shard is done, the per-shard output directories are merged:
+
+Usage:
+    python -m src.orchestration.sharding merge shard-0/output shard-1/output --into output
+
+For dynamic work distribution instead of static shards, point every worker
+process at the same queue file and let them claim jobs as they go:
+    python -m src.main pitches.csv --queue /shared/queue.sqlite             # loads the queue
+    python -m src.main --worker-only --queue /shared/queue.sqlite --workers 4   # on each extra node
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from typing import List, Optional, Tuple
+
+from ..core.telemetry import CompanyTrace, Span, Tracer
+from ..core.utils import ensure_dir
+from .work_queue import JobQueue
+
+
+LEDGER_PREFIX = "ledger"
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse an ``i/N`` shard spec (0-based index).
+
+    Args:
+        spec: e.g. "0/4"
+
+    Returns:
+        (index, count)
+    """
+    try:
+        index, count = (int(x) for x in spec.split("/", 1))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N (e.g. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}': index must be in [0, {count})")
+    return index, count
+
+
+def shard_of(slug: str, count: int) -> int:
+    """Stable shard index for a slug (independent of PYTHONHASHSEED and CSV order)."""
+    digest = hashlib.sha1(slug.encode("utf-8")).hexdigest()
+    return int(digest[:16], 16) % count
+
+
+def in_shard(slug: str, shard: Optional[Tuple[int, int]]) -> bool:
+    """True if ``slug`` belongs to ``shard`` (always True when not sharding)."""
+    if shard is None:
+        return True
+    index, count = shard
+    return shard_of(slug, count) == index
+
+
+def shard_suffix(shard: Optional[Tuple[int, int]]) -> str:
+    """Filename suffix for shard-specific artifacts, e.g. ".shard-0-of-4"."""
+    if shard is None:
+        return ""
+    return f".shard-{shard[0]}-of-{shard[1]}"
+
+
+def _company_outputs(output_dir: str, slug: str) -> List[str]:
+    company_dir = os.path.join(output_dir, slug)
+    if not os.path.isdir(company_dir):
+        return []
+    return sorted(f for f in os.listdir(company_dir) if f.endswith(".md"))
+
+
+def write_ledger(queue: JobQueue, output_dir: str, shard: Optional[Tuple[int, int]] = None) -> str:
+    """
+    Write the run ledger: final status and output files for every queued job.
+
+    Args:
+        queue: Queue the run consumed
+        output_dir: Root output directory
+        shard: Shard this run covered (used in the filename)
+
+    Returns:
+        Path to the ledger file
+    """
+    ensure_dir(output_dir)
+    path = os.path.join(output_dir, f"{LEDGER_PREFIX}{shard_suffix(shard)}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in queue.ledger():
+            entry["shard"] = list(shard) if shard else None
+            entry["outputs"] = _company_outputs(output_dir, entry["slug"])
+            f.write(json.dumps(entry) + "\n")
+    return path
+
+
+def _read_ledgers(output_dir: str) -> List[dict]:
+    entries = []
+    for name in sorted(os.listdir(output_dir)):
+        if name.startswith(LEDGER_PREFIX) and name.endswith(".jsonl"):
+            with open(os.path.join(output_dir, name), encoding="utf-8") as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+    return entries
+
+
+def merge_shards(sources: List[str], dest: str) -> dict:
+    """
+    Consolidate per-shard output directories into one.
+
+    For each slug the entry that finished last wins; its company folder is
+    copied into ``dest``. A combined ledger and a run report rebuilt from the
+    per-company traces are written to ``dest``.
+
+    Args:
+        sources: Shard output directories
+        dest: Destination output directory
+
+    Returns:
+        Counts of merged companies per status
+    """
+    ensure_dir(dest)
+    latest = {}
+    for source in sources:
+        for entry in _read_ledgers(source):
+            entry["_source"] = source
+            current = latest.get(entry["slug"])
+            if current is None or (entry.get("finished_at") or 0) >= (current.get("finished_at") or 0):
+                latest[entry["slug"]] = entry
+
+    tracer = Tracer()
+    counts = {}
+    with open(os.path.join(dest, f"{LEDGER_PREFIX}.jsonl"), "w", encoding="utf-8") as ledger:
+        for slug, entry in sorted(latest.items()):
+            source_dir = os.path.join(entry.pop("_source"), slug)
+            dest_dir = os.path.join(dest, slug)
+            if os.path.isdir(source_dir) and os.path.abspath(source_dir) != os.path.abspath(dest_dir):
+                shutil.copytree(source_dir, dest_dir, dirs_exist_ok=True)
+            ledger.write(json.dumps(entry) + "\n")
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+
+            trace_path = os.path.join(dest_dir, "trace.jsonl")
+            if os.path.exists(trace_path):
+                with open(trace_path, encoding="utf-8") as f:
+                    spans = [Span.model_validate_json(line) for line in f if line.strip()]
+                tracer.companies.append(CompanyTrace(
+                    name=entry["job"]["startup_name"], output_dir=dest_dir, ready_at=0.0, spans=spans,
+                ))
+
+    tracer.write_report(os.path.join(dest, "run_report.md"))
+    return counts
+
+
+def main():
+    """CLI: merge shard outputs."""
+    parser = argparse.ArgumentParser(description="Consolidate sharded PitchPanda runs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge = sub.add_parser("merge", help="Merge per-shard output directories")
+    merge.add_argument("sources", nargs="+", help="Shard output directories")
+    merge.add_argument("--into", required=True, help="Destination output directory")
+    args = parser.parse_args()
+
+    counts = merge_shards(args.sources, args.into)
+    print(f"Merged {sum(counts.values())} companies into {args.into}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Persistent local work queue backed by SQLite.
+
+Intake pushes jobs, workers claim them one at a time. Because the queue
+lives on disk, new startups can be appended (``python -m
+src.orchestration.intake add ...``) while a run is in progress, and a run
+that is interrupted can be resumed by pointing at the same queue file.
+
+Claims are not FIFO across the board:
+
+- Higher ``priority`` jobs are always claimed first, so an urgent company
+  (e.g. for tomorrow's partner meeting) overtakes everything still pending.
+  Re-adding a pending company with a higher priority bumps it.
+- Within a priority, job kinds (``deck``: full pipeline with a pitch deck,
+  ``web``: website only) share workers by weighted fair queuing. Each kind
+  has a virtual time that advances by ``KIND_COSTS[kind] / KIND_WEIGHTS[kind]``
+  per claim and the kind with the earliest virtual finish goes next, so a
+  backlog of long deck jobs cannot starve short web-only jobs.
+- Within a kind, jobs are claimed in enqueue order.
+
+A job that hit its stage or company deadline (``core/deadlines.py``) goes to
+the back of the queue for another attempt, so it does not block the rest of
+the batch; after ``MAX_TIMEOUT_ATTEMPTS`` it is left TIMED_OUT and retried at
+the start of the next run.
+
+Each claim records its owning process (host, pid and process start time).
+When a run starts, jobs left RUNNING by a process that no longer exists
+(a crashed or interrupted run) go back to PENDING.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+DEFAULT_QUEUE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "output", "queue.sqlite")
+)
+
+# Job lifecycle
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+# Attempts (including the first) before a timed-out job waits for the next run
+MAX_TIMEOUT_ATTEMPTS = 2
+
+# Job kinds for fair queuing; jobs of unknown kind are treated as full pipelines
+DECK_KIND = "deck"
+WEB_KIND = "web"
+DEFAULT_KIND = DECK_KIND
+# Relative work per job (a deck job is several vision calls plus rasterization)
+KIND_COSTS: Dict[str, float] = {DECK_KIND: 4.0, WEB_KIND: 1.0}
+# Share of worker time each kind gets while both are backlogged
+KIND_WEIGHTS: Dict[str, float] = {DECK_KIND: 1.0, WEB_KIND: 1.0}
+_SYSTEM_CLOCK = "*"
+
+
+class Job(BaseModel):
+    """One startup to analyze."""
+    startup_name: str
+    startup_url: str = ""
+    slug: str
+    enqueued_at: float = Field(default_factory=time.time)
+    extra: Dict[str, str] = Field(default_factory=dict)  # Any additional input columns
+    attempts: int = 0
+    priority: int = 0  # higher runs first (see intake.PRIORITY_LEVELS)
+    kind: str = ""  # DECK_KIND or WEB_KIND, for fair queuing
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    slug TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    claimed_at REAL,
+    finished_at REAL,
+    worker TEXT,
+    error TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    kind TEXT NOT NULL DEFAULT '',
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS fair_queue (
+    kind TEXT PRIMARY KEY,
+    virtual_time REAL NOT NULL
+);
+"""
+# Columns added after the first release; older queue files are migrated on open
+_MIGRATIONS = {
+    "priority": "ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0",
+    "kind": "ALTER TABLE jobs ADD COLUMN kind TEXT NOT NULL DEFAULT ''",
+    "owner": "ALTER TABLE jobs ADD COLUMN owner TEXT",
+}
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, enqueued_at);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority, kind, enqueued_at);
+"""
+
+
+def _start_time(pid: int) -> str:
+    """Start time of a process in clock ticks since boot ("" where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Field 22; fields after the parenthesised command name start at field 3
+            return f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return ""
+
+
+def process_owner() -> str:
+    """Owner id recorded on claims: ``host:pid:start time`` (the start time tells a reused pid apart)."""
+    pid = os.getpid()
+    return f"{socket.gethostname()}:{pid}:{_start_time(pid)}"
+
+
+def _owner_alive(owner: str) -> bool:
+    """True if the process in a local owner id is still running."""
+    _, pid, started = owner.split(":", 2)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # running under another user
+    except (ValueError, OSError):
+        return False
+    return not started or _start_time(int(pid)) == started
+
+
+class JobQueue:
+    """SQLite-backed priority queue of Jobs, safe to share across threads and processes."""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+            conn.executescript(_INDEXES)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps threads independent
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def put(self, job: Job) -> bool:
+        """
+        Add a job unless the same slug is already pending or running.
+
+        A slug that finished in an earlier run is re-queued. A pending slug
+        added again with a higher priority is bumped to that priority.
+
+        Args:
+            job: Job to enqueue
+
+        Returns:
+            True if the job was queued
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, priority FROM jobs WHERE slug = ?", (job.slug,)).fetchone()
+            if row and row[0] in (PENDING, RUNNING):
+                if row[0] == PENDING and job.priority > row[1]:
+                    conn.execute("UPDATE jobs SET priority = ? WHERE slug = ?", (job.priority, job.slug))
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (slug, payload, status, attempts, enqueued_at, priority, kind) "
+                "VALUES (?, ?, ?, 0, ?, ?, ?)",
+                (job.slug, job.model_dump_json(), PENDING, job.enqueued_at, job.priority, job.kind or DEFAULT_KIND),
+            )
+            conn.execute("COMMIT")
+            return True
+
+    def claim(self, worker: str = "") -> Optional[Job]:
+        """
+        Atomically take the next pending job.
+
+        Highest priority first; within it, the job kind with the earliest
+        weighted-fair-queuing finish time; within the kind, the oldest job.
+
+        Args:
+            worker: Identifier recorded on the job
+
+        Returns:
+            The claimed Job, or None if nothing is pending
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            top = conn.execute("SELECT MAX(priority) FROM jobs WHERE status = ?", (PENDING,)).fetchone()[0]
+            if top is None:
+                conn.execute("COMMIT")
+                return None
+            kinds = [
+                r[0] for r in conn.execute(
+                    "SELECT DISTINCT kind FROM jobs WHERE status = ? AND priority = ?", (PENDING, top)
+                )
+            ]
+            kind = self._next_kind(conn, kinds)
+            slug, payload, attempts, priority = conn.execute(
+                "SELECT slug, payload, attempts, priority FROM jobs WHERE status = ? AND priority = ? AND kind = ? "
+                "ORDER BY enqueued_at LIMIT 1",
+                (PENDING, top, kind),
+            ).fetchone()
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, claimed_at = ?, worker = ?, owner = ? WHERE slug = ?",
+                (RUNNING, attempts + 1, time.time(), worker, process_owner(), slug),
+            )
+            conn.execute("COMMIT")
+        job = Job.model_validate_json(payload)
+        job.attempts = attempts + 1
+        job.priority = priority
+        return job
+
+    @staticmethod
+    def _next_kind(conn, kinds) -> str:
+        """Pick the backlogged kind with the earliest virtual finish time and advance the clocks."""
+        clocks = dict(conn.execute("SELECT kind, virtual_time FROM fair_queue").fetchall())
+        # A kind that was idle restarts at the system clock (start of the last claim), so it cannot bank credit
+        system = clocks.get(_SYSTEM_CLOCK, 0.0)
+        start = {k: max(clocks.get(k, 0.0), system) for k in kinds}
+        finish = {
+            k: start[k] + KIND_COSTS.get(k or DEFAULT_KIND, 1.0) / KIND_WEIGHTS.get(k or DEFAULT_KIND, 1.0)
+            for k in kinds
+        }
+        kind = min(kinds, key=lambda k: (finish[k], k))
+        conn.executemany(
+            "INSERT OR REPLACE INTO fair_queue (kind, virtual_time) VALUES (?, ?)",
+            [(kind, finish[kind]), (_SYSTEM_CLOCK, start[kind])],
+        )
+        return kind
+
+    def complete(self, slug: str, status: str = DONE, error: Optional[str] = None) -> None:
+        """Mark a claimed job finished (DONE, FAILED or TIMED_OUT)."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE slug = ?",
+                (status, time.time(), error, slug),
+            )
+
+    def release(self, slug: str) -> None:
+        """Put a claimed job back to PENDING without counting the attempt."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), claimed_at = NULL, worker = NULL, "
+                "owner = NULL WHERE slug = ? AND status = ?",
+                (PENDING, slug, RUNNING),
+            )
+
+    def time_out(self, slug: str, error: str) -> bool:
+        """
+        Record a claimed job that hit a deadline.
+
+        The job is re-queued behind everything pending at its priority unless
+        it has used MAX_TIMEOUT_ATTEMPTS, in which case it is marked TIMED_OUT.
+
+        Args:
+            slug: Job slug
+            error: What timed out
+
+        Returns:
+            True if the job was re-queued for this run
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT attempts FROM jobs WHERE slug = ?", (slug,)).fetchone()
+            retry = row is not None and row[0] < MAX_TIMEOUT_ATTEMPTS
+            if retry:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, enqueued_at = ?, claimed_at = NULL, worker = NULL, owner = NULL, "
+                    "error = ? WHERE slug = ?",
+                    (PENDING, time.time(), error, slug),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE slug = ?",
+                    (TIMED_OUT, time.time(), error, slug),
+                )
+            conn.execute("COMMIT")
+        return retry
+
+    def requeue_timed_out(self) -> int:
+        """
+        Return TIMED_OUT jobs from earlier runs to PENDING with a fresh attempt count.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, worker = NULL WHERE status = ?",
+                (PENDING, TIMED_OUT),
+            )
+            return cur.rowcount
+
+    def requeue_stale(self, older_than_s: float = 3600) -> int:
+        """
+        Return jobs left RUNNING by a process that is gone (e.g. a crashed or interrupted run) to PENDING.
+
+        Owners on this host are checked directly, so a rerun right after a
+        crash picks their jobs up again. Jobs claimed on another host (queue
+        file on shared storage) cannot be checked and are only re-queued once
+        claimed more than ``older_than_s`` ago; jobs claimed before owners
+        were recorded are re-queued.
+
+        Args:
+            older_than_s: Minimum time since the claim for jobs owned by another host
+
+        Returns:
+            Number of jobs re-queued
+        """
+        host = socket.gethostname()
+        cutoff = time.time() - older_than_s
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT slug, owner, claimed_at FROM jobs WHERE status = ?", (RUNNING,)).fetchall()
+            stale = []
+            for slug, owner, claimed_at in rows:
+                if not owner:
+                    stale.append(slug)
+                elif owner.split(":", 1)[0] == host:
+                    if not _owner_alive(owner):
+                        stale.append(slug)
+                elif (claimed_at or 0) < cutoff:
+                    stale.append(slug)
+            conn.executemany(
+                "UPDATE jobs SET status = ?, worker = NULL, owner = NULL WHERE slug = ? AND status = ?",
+                [(PENDING, slug, RUNNING) for slug in stale],
+            )
+            conn.execute("COMMIT")
+        return len(stale)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def pending(self) -> int:
+        """Number of jobs waiting to be claimed."""
+        return self.counts().get(PENDING, 0)
+
+    def ledger(self) -> list:
+        """All jobs with their final status, in enqueue order."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT slug, payload, status, attempts, enqueued_at, claimed_at, finished_at, worker, error, priority "
+                "FROM jobs ORDER BY enqueued_at"
+            ).fetchall()
+        keys = [
+            "slug", "payload", "status", "attempts", "enqueued_at", "claimed_at", "finished_at", "worker", "error",
+            "priority",
+        ]
+        entries = []
+        for row in rows:
+            entry = dict(zip(keys, row))
+            entry["job"] = json.loads(entry.pop("payload"))
+            entries.append(entry)
+        return entries
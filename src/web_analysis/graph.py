@@ -1,18 +1,22 @@
 """LangGraph workflow for web analysis."""
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from dotenv import load_dotenv
 from pydantic import BaseModel, ValidationError
 
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser
 from langgraph.graph import StateGraph, END
 
 from .prompts import prompt, COMP_PROMPT, MARKET_SIZE_PROMPT
-from .utils import fetch_website_text
-from .schemas import Analysis, Competitor, MarketSize
+from .utils import (
+    fetch_website, classify_fetch,
+    FETCH_OK, FETCH_THIN, FETCH_HTTP_ERROR, FETCH_PARKED, FETCH_JS_SHELL,
+)
+from .schemas import Analysis, CompetitorList, MarketSize
+from ..core.cascade import run_cascade
+from ..core.degradation import SKIP_COMPETITION, SKIP_MARKET_SIZE
+from ..core.llm import get_structured_model
+from ..core.telemetry import traced_node, record_event
 
 
 # ---------- State ----------
@@ -20,33 +24,85 @@ class AnalysisState(BaseModel):
     startup_name: str
     startup_url: str
     website_text: str = ""
+    fetch_status: str = ""  # ok | http_error | parked | js_shell | thin
+    fetch_detail: str = ""
     result_json: Dict[str, Any] = {}
+    degradations: List[str] = []  # deadline-mode skips (core/degradation.py)
 
 
-# ---------- LLM + Parser ----------
-load_dotenv()
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
-parser = JsonOutputParser()
+# ---------- LLM ----------
+WEB_MODEL = "gpt-4o-mini"
+# Filled in by later nodes / the fetch gate, not by the problem-solution call
+ANALYSIS_EXCLUDE = ("market_size", "competition", "review_reason")
+
+
+def _llm(schema, exclude=(), model=WEB_MODEL):
+    """Pooled web-analysis model constrained to ``schema`` (strict JSON schema)."""
+    return get_structured_model(schema, model, temperature=0.2, exclude=exclude)
 
 
 # ---------- Nodes ----------
+REVIEW_REASONS = {
+    FETCH_HTTP_ERROR: "the website could not be fetched",
+    FETCH_PARKED: "the domain looks parked or for sale",
+    FETCH_JS_SHELL: "the homepage only renders with JavaScript, no readable text was served",
+}
+
+
+@traced_node("web")
 def fetch_node(state: AnalysisState) -> AnalysisState:
-    """Fetch website text content."""
-    state.website_text = fetch_website_text(state.startup_url)
+    """Fetch website text content and classify how usable it is."""
+    result = fetch_website(state.startup_url)
+    state.fetch_status = classify_fetch(result)
+    state.fetch_detail = result.error or f"HTTP {result.status_code}, {len(result.text)} chars of text"
+    if result.error:
+        state.website_text = f"(Error fetching site: {result.error})"
+    else:
+        state.website_text = result.text or "(No readable text found on homepage.)"
+    record_event(f"fetch_gate.{state.fetch_status}")
     return state
 
 
+def route_after_fetch(state: AnalysisState) -> str:
+    """Only spend LLM calls on sites with something to analyze."""
+    if state.fetch_status in (FETCH_OK, FETCH_THIN):
+        return "analyze"
+    return "manual_review"
+
+
+def route_after_validate(state: AnalysisState) -> str:
+    """Thin sites stop after the basic analysis; competitors/market size would be guesswork."""
+    if state.fetch_status != FETCH_OK:
+        return END
+    if SKIP_COMPETITION in state.degradations:
+        return route_after_competition(state)
+    return "competition"
+
+
+def route_after_competition(state: AnalysisState) -> str:
+    """Market sizing unless the deadline plan skips it."""
+    if SKIP_MARKET_SIZE in state.degradations:
+        return END
+    return "market_size"
+
+
+@traced_node("web")
 def analyze_node(state: AnalysisState) -> AnalysisState:
     """Analyze website and extract problem/solution."""
-    chain = prompt | llm | parser
-    state.result_json = chain.invoke({
+    payload = {
         "startup_name": state.startup_name,
         "startup_url": state.startup_url,
         "website_text": state.website_text
-    })
+    }
+    
+    def attempt(model):
+        return (prompt | _llm(Analysis, exclude=ANALYSIS_EXCLUDE, model=model)).invoke(payload)
+    
+    state.result_json = run_cascade("web", WEB_MODEL, attempt).model_dump()
     return state
 
 
+@traced_node("web")
 def validate_node(state: AnalysisState) -> AnalysisState:
     """
     Convert raw dict to our Pydantic Analysis model, do minimal corrections.
@@ -75,13 +131,43 @@ def validate_node(state: AnalysisState) -> AnalysisState:
         analysis.active_locations = []
     analysis.active_locations = [str(x).strip() for x in analysis.active_locations if str(x).strip()]
 
+    if state.fetch_status == FETCH_THIN:
+        analysis.review_reason = (
+            f"the homepage has very little text ({state.fetch_detail}); "
+            "competition and market size were skipped"
+        )
+    elif state.fetch_status == FETCH_OK:
+        # The routers below act on these; record them here, while the node's span is open
+        for name in (SKIP_COMPETITION, SKIP_MARKET_SIZE):
+            if name in state.degradations:
+                record_event(f"degraded.{name}")
+
     state.result_json = analysis.model_dump()
     return state
 
 
+@traced_node("web")
+def manual_review_node(state: AnalysisState) -> AnalysisState:
+    """Placeholder analysis for sites that can't be analyzed, flagged for manual review."""
+    reason = f"{REVIEW_REASONS.get(state.fetch_status, state.fetch_status)} ({state.fetch_detail})"
+    analysis = Analysis(
+        company_summary="Website could not be analyzed automatically.",
+        problem={"general": "Unknown", "example": "Unknown"},
+        solution={"what_it_is": "Unknown", "how_it_works": "Unknown", "example": "Unknown"},
+        product_type="Unknown",
+        sector="Unknown",
+        subsector="Unknown",
+        sources=[state.startup_url],
+        review_reason=reason,
+    )
+    state.result_json = analysis.model_dump()
+    return state
+
+
+@traced_node("web")
 def competition_node(state: AnalysisState) -> AnalysisState:
     """Use the validated Analysis (problem/solution/etc.) to propose competitors."""
-    chain = COMP_PROMPT | llm | parser
+    chain = COMP_PROMPT | _llm(CompetitorList)
 
     a = Analysis(**state.result_json)
     payload = {
@@ -98,26 +184,16 @@ def competition_node(state: AnalysisState) -> AnalysisState:
         "active_locations": ", ".join(a.active_locations) if a.active_locations else "[]",
     }
 
-    raw = chain.invoke(payload)
-    # raw should be {"competition": [ ... ]}; be defensive
-    comp_list = raw.get("competition", []) if isinstance(raw, dict) else []
-    # Coerce each item via pydantic (drops bad fields, ensures lists exist)
-    clean_comp = []
-    for item in comp_list:
-        try:
-            clean_comp.append(Competitor(**item).model_dump())
-        except Exception:
-            continue
-
-    # Write back into the Analysis blob -> state
-    a.competition = [Competitor(**c) for c in clean_comp]
+    # Reply is schema-constrained, so every competitor is already valid
+    a.competition = chain.invoke(payload).competition
     state.result_json = a.model_dump()
     return state
 
 
+@traced_node("web")
 def market_size_node(state: AnalysisState) -> AnalysisState:
     """Calculate market size estimates (TAM, SAM, SOM) based on the validated Analysis."""
-    chain = MARKET_SIZE_PROMPT | llm | parser
+    chain = MARKET_SIZE_PROMPT | _llm(MarketSize)
 
     a = Analysis(**state.result_json)
     payload = {
@@ -134,19 +210,11 @@ def market_size_node(state: AnalysisState) -> AnalysisState:
     }
 
     try:
-        raw = chain.invoke(payload)
-        # raw should be {"tam": ..., "sam": ..., "som": ..., "calculation_context": ..., "note": ...}
-        market_size = MarketSize(**raw)
-        a.market_size = market_size
+        a.market_size = chain.invoke(payload)
     except Exception as e:
-        # If market size calculation fails, create a default/error state
-        a.market_size = MarketSize(
-            tam="Unable to calculate",
-            sam="Unable to calculate",
-            som="Unable to calculate",
-            calculation_context=f"Market size calculation failed: {str(e)}",
-            note="Please validate market size manually using primary research."
-        )
+        # API failure or refusal: leave the section out rather than guess
+        print(f"Market size calculation failed: {e}")
+        a.market_size = None
 
     state.result_json = a.model_dump()
     return state
@@ -161,12 +229,14 @@ def build_graph():
     builder.add_node("validate", validate_node)
     builder.add_node("competition", competition_node)
     builder.add_node("market_size", market_size_node)
+    builder.add_node("manual_review", manual_review_node)
     
     builder.set_entry_point("fetch")
-    builder.add_edge("fetch", "analyze")
+    builder.add_conditional_edges("fetch", route_after_fetch, ["analyze", "manual_review"])
+    builder.add_edge("manual_review", END)
     builder.add_edge("analyze", "validate")
-    builder.add_edge("validate", "competition")
-    builder.add_edge("competition", "market_size")
+    builder.add_conditional_edges("validate", route_after_validate, ["competition", "market_size", END])
+    builder.add_conditional_edges("competition", route_after_competition, ["market_size", END])
     builder.add_edge("market_size", END)
     
     return builder.compile()
@@ -11,9 +11,9 @@ Or with a custom CSV path:
 """
 import os
 import sys
-import csv
 
 from .graph import analysis_graph, AnalysisState
+from ..orchestration.intake import iter_rows, iter_jobs
 
 
 # Default paths
@@ -31,9 +31,9 @@ def run_csv(csv_path: str = INPUT_CSV):
     Run web analysis on all startups in the CSV file.
     
     Args:
-        csv_path: Path to CSV file with columns: startup_name, startup_url
+        csv_path: Path to CSV/JSONL file with columns: startup_name, startup_url ("-" for stdin)
     """
-    if not os.path.exists(csv_path):
+    if csv_path != "-" and not os.path.exists(csv_path):
         raise SystemExit(
             f"Missing input CSV at {csv_path}\n"
             f"Expected columns: startup_name,startup_url"
@@ -44,59 +44,39 @@ def run_csv(csv_path: str = INPUT_CSV):
     print(f"Reading from: {csv_path}")
     print(f"{'='*60}\n")
 
-    # Read with utf-8-sig to strip BOM if present
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-
-        # Normalize headers in case of BOM / stray spaces
-        if reader.fieldnames:
-            reader.fieldnames = [
-                (fn or "").lstrip("\ufeff").strip() 
-                for fn in reader.fieldnames
-            ]
-
-        startup_number = 1
-        for row in reader:
-            # Normalize keys coming from DictReader just in case
-            row = {
-                (k or "").lstrip("\ufeff").strip(): (v or "").strip() 
-                for k, v in row.items()
-            }
-
-            name = row.get("startup_name", "")
-            url = row.get("startup_url", "")
-            
-            if not name or not url:
-                print(f"Skipping row (missing name/url): {row}")
-                continue
-
-            print(f"\n[{startup_number}] Analyzing: {name}")
-            print(f"URL: {url}")
-            
-            state = AnalysisState(startup_name=name, startup_url=url)
-            result = analysis_graph.invoke(state)
-            
-            # Save the analysis to output folder (numbered folder, single file inside)
-            # Sanitize startup name for folder (keep alphanum and hyphens)
-            import re
-            safe_name = re.sub(r"[^a-z0-9-]", "", name.lower().replace(" ", "-"))
-            folder_name = f"{startup_number}-{safe_name}"
-            output_dir = os.path.join(OUTPUT_DIR, folder_name)
-            os.makedirs(output_dir, exist_ok=True)
-
-            # Single markdown file inside the numbered folder
-            output_file = os.path.join(output_dir, "web_analysis.md")
-            
-            from .renderer import render_markdown
-            from .schemas import Analysis
-            analysis = Analysis(**result["result_json"])
-            markdown = render_markdown(name, url, analysis)
-            
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(markdown)
-            
-            print(f"Saved to: {output_file}")
-            startup_number += 1
+    # Stream validated, de-duplicated rows
+    startup_number = 1
+    for job in iter_jobs(iter_rows(csv_path), require_url=True):
+        name = job.startup_name
+        url = job.startup_url
+
+        print(f"\n[{startup_number}] Analyzing: {name}")
+        print(f"URL: {url}")
+        
+        state = AnalysisState(startup_name=name, startup_url=url)
+        result = analysis_graph.invoke(state)
+        
+        # Save the analysis to output folder (numbered folder, single file inside)
+        # Sanitize startup name for folder (keep alphanum and hyphens)
+        import re
+        safe_name = re.sub(r"[^a-z0-9-]", "", name.lower().replace(" ", "-"))
+        folder_name = f"{startup_number}-{safe_name}"
+        output_dir = os.path.join(OUTPUT_DIR, folder_name)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Single markdown file inside the numbered folder
+        output_file = os.path.join(output_dir, "web_analysis.md")
+        
+        from .renderer import render_markdown
+        from .schemas import Analysis
+        analysis = Analysis(**result["result_json"])
+        markdown = render_markdown(name, url, analysis)
+        
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        
+        print(f"Saved to: {output_file}")
+        startup_number += 1
 
     print(f"\n{'='*60}")
     print(f"Analysis complete!")
@@ -1,28 +1,12 @@
-from langchain_core.prompts import ChatPromptTemplate
+from ...core.prompt_cache import cacheable_prompt
 
-COMP_PROMPT = ChatPromptTemplate.from_template("""
-You are an evidence-driven AI analyst. Using the target startup's validated profile below, return 5–10 competing startups
+# Static instructions first (cached by the provider), target profile last
+COMP_SYSTEM = """
+You are an evidence-driven AI analyst. Using the target startup's validated profile (in the user message), return 5–10 competing startups
 that solve the same user problem (problem similarity should be near-identical). Focus on companies that demonstrate the
 problem/solution fit on their product pages, docs, case studies, or pricing pages. Do not invent competitors — only include
 companies that have verifiable public evidence for the claims below.
 
-TARGET STARTUP (ground truth):
-- Name: {startup_name}
-- URL: {startup_url}
-
-Problem (general): {problem_general}
-Problem (example): {problem_example}
-
-Solution (what_it_is): {solution_what}
-Solution (how_it_works): {solution_how}
-Solution (example): {solution_example}
-
-Product type: {product_type}
-Sector/Subsector: {sector} / {subsector}
-Active locations: {active_locations}
-
----
-
 INSTRUCTIONS
 - Return JSON ONLY in this exact structure:
 {{
@@ -58,6 +42,24 @@ REQUIRED GUIDELINES
 OUTPUT QUALITY
 - Prioritize accuracy over quantity. If a company looks similar but you cannot find a clear page or product evidence, omit it.
 - If the competitor is an adjacent or partial competitor, mark that clearly in `differences` and set `confidence` accordingly.
+"""
+
+COMP_TARGET = """TARGET STARTUP (ground truth):
+- Name: {startup_name}
+- URL: {startup_url}
+
+Problem (general): {problem_general}
+Problem (example): {problem_example}
+
+Solution (what_it_is): {solution_what}
+Solution (how_it_works): {solution_how}
+Solution (example): {solution_example}
+
+Product type: {product_type}
+Sector/Subsector: {sector} / {subsector}
+Active locations: {active_locations}
 
 Now return the JSON.
-""")
+"""
+
+COMP_PROMPT = cacheable_prompt(COMP_SYSTEM, COMP_TARGET)
@@ -1,28 +1,13 @@
-from langchain_core.prompts import ChatPromptTemplate
+from ...core.prompt_cache import cacheable_prompt
 
-MARKET_SIZE_PROMPT = ChatPromptTemplate.from_template("""
+# Static instructions first (cached by the provider), target profile last
+MARKET_SIZE_SYSTEM = """
 You are a quantitative analyst calculating market size estimates for a startup. Your job is to build 
 a **bottom-up calculation** with explicit formulas and numbers. Do NOT provide generic estimates.
 
 CRITICAL: Each market size estimate MUST show the exact formula you used. Think like a spreadsheet:
 define each variable, state its numeric value, and show the multiplication/division step-by-step.
 
-TARGET STARTUP:
-- Name: {startup_name}
-- URL: {startup_url}
-
-Problem (general): {problem_general}
-Problem (example): {problem_example}
-
-Solution (what_it_is): {solution_what}
-Solution (how_it_works): {solution_how}
-
-Product type: {product_type}
-Sector/Subsector: {sector} / {subsector}
-Active locations: {active_locations}
-
----
-
 TASK:
 Calculate TAM, SAM, and SOM using explicit formulas. Each calculation must follow this structure:
 
@@ -105,6 +90,23 @@ CRITICAL RULES:
 - Do NOT copy generic industry reports without tying them to this specific startup's problem/solution
 - Do NOT inflate numbers to make the startup look good
 - If data is unavailable, state your assumption explicitly and mark confidence as low
+"""
+
+MARKET_SIZE_TARGET = """TARGET STARTUP:
+- Name: {startup_name}
+- URL: {startup_url}
+
+Problem (general): {problem_general}
+Problem (example): {problem_example}
+
+Solution (what_it_is): {solution_what}
+Solution (how_it_works): {solution_how}
+
+Product type: {product_type}
+Sector/Subsector: {sector} / {subsector}
+Active locations: {active_locations}
 
 Now calculate the market size for the target startup using explicit formulas.
-""")
+"""
+
+MARKET_SIZE_PROMPT = cacheable_prompt(MARKET_SIZE_SYSTEM, MARKET_SIZE_TARGET)
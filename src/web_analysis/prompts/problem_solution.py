@@ -1,25 +1,17 @@
-from langchain_core.prompts import ChatPromptTemplate
+from ...core.prompt_cache import cacheable_prompt
 
+# Static instructions first (cached by the provider), per-startup evidence last
 PROMPT_MD = """### 🧠 Prompt: "Startup Problem & Solution Extraction"
 
 **TASK**
-You are an AI analyst. For the given startup name and website, identify and clearly describe:
+You are an AI analyst. For the startup named in the user message, identify and clearly describe:
 1) The problem the startup is solving
 2) The solution it provides
 3) The product type (website, SaaS, platform, app, service, hardware, marketplace, API, etc.)
 4) The sector (broad) and subsector (specific)
 5) **Active locations** (countries/regions/cities where the company currently operates or has offices)
 
-Startup:
-- Name: {startup_name}
-- URL: {startup_url}
-
-Use the website content below as primary evidence. If claims are unclear, infer cautiously and be explicit.
-
----
-
-### Website Evidence (verbatim text, trimmed)
-{website_text}
+Use the website content in the user message as primary evidence. If claims are unclear, infer cautiously and be explicit.
 
 ---
 
@@ -64,8 +56,18 @@ Concrete example:
 
 Active locations example:
 ["Belgium", "Netherlands", "Germany (DACH)", "London, UK"]
+"""
+
+STARTUP_MD = """Startup:
+- Name: {startup_name}
+- URL: {startup_url}
+
+### Website Evidence (verbatim text, trimmed)
+{website_text}
+
+---
 
 Now produce the JSON.
 """
 
-prompt = ChatPromptTemplate.from_template(PROMPT_MD)
+prompt = cacheable_prompt(PROMPT_MD, STARTUP_MD)
@@ -158,11 +158,13 @@ def render_markdown(name: str, url: str, a: Analysis) -> str:
     # Copy-paste one-liners
     clipboard_block = render_competition_clipboard(a.product_type, a.competition)
 
+    review_line = f"\n> **Needs manual review:** {a.review_reason}\n" if a.review_reason else ""
+
     # Final Markdown document
     return f"""# {name}
 
 **Website:** {url}
-
+{review_line}
 ## Summary
 
 {a.company_summary}
@@ -54,6 +54,11 @@ class Competitor(BaseModel):
     why_included: Optional[str] = Field(default="", description="One-line justification linking target's problem to this competitor")
 
 
+class CompetitorList(BaseModel):
+    """Reply shape of the competition prompt."""
+    competition: List[Competitor] = Field(default_factory=list)
+
+
 class Analysis(BaseModel):
     company_summary: str = Field(..., description="2-3 sentence elevator pitch describing the company")
     problem: Problem
@@ -69,3 +74,6 @@ class Analysis(BaseModel):
 
     # Competition data
     competition: List[Competitor] = Field(default_factory=list)
+
+    # Set when the website could not be analyzed (dead, parked, JS-only or near-empty)
+    review_reason: Optional[str] = Field(default=None, description="Why this analysis needs manual review")
@@ -1,12 +1,27 @@
 """Utility functions for web analysis."""
 
 import re
+import time
+from typing import Optional
+
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from pydantic import BaseModel
+from urllib.parse import urlparse, urlsplit
+
+from ..core.deadlines import check_deadline, remaining
+from ..core.singleflight import SingleFlight, fingerprint
 
 DEFAULT_UA = "Mozilla/5.0 (PitchPanda/1.0; +https://pitchpanda.local)"
 
+# Connect/read timeout per socket operation, and a cap on the whole download
+# so a tarpit that trickles bytes cannot hold a worker (both shrink to the
+# stage deadline, see core/deadlines.py)
+FETCH_TIMEOUT = 20.0
+FETCH_TOTAL_TIMEOUT = 30.0
+FETCH_MAX_BYTES = 5_000_000
+FETCH_CHUNK_BYTES = 16_384
+
 
 def ensure_scheme(url: str) -> str:
     """Ensure URL has a scheme (http/https)."""
@@ -15,21 +30,152 @@ def ensure_scheme(url: str) -> str:
     return url
 
 
-def fetch_website_text(url: str, max_chars: int = 10000) -> str:
-    """Fetch and extract text content from a website."""
+# Fetch outcomes (see classify_fetch)
+FETCH_OK = "ok"
+FETCH_HTTP_ERROR = "http_error"
+FETCH_PARKED = "parked"
+FETCH_JS_SHELL = "js_shell"
+FETCH_THIN = "thin"
+
+# Below this many characters of visible text there is too little to analyze in depth
+MIN_TEXT_CHARS = 400
+
+PARKED_PATTERNS = re.compile(
+    r"domain (?:name )?(?:is|may be) for sale|buy this domain|this domain is parked|"
+    r"parked (?:free|domain)|domain parking|the domain \S+ is for sale",
+    re.IGNORECASE,
+)
+# Marketplace names only count next to for-sale wording ("hello@jordan.com" is not dan.com)
+PARKED_MARKETPLACES = re.compile(
+    r"(?<![\w.@-])(?:hugedomains|sedo|dan|afternic)\.com\b|(?<![\w.@-])godaddy\.com/domains\b",
+    re.IGNORECASE,
+)
+FOR_SALE_PATTERNS = re.compile(
+    r"\bfor sale\b|\bmake an offer\b|\b(?:buy|purchase|acquire) (?:this|the) domain\b",
+    re.IGNORECASE,
+)
+JS_REQUIRED_PATTERNS = re.compile(
+    r"enable javascript|javascript is (?:required|disabled)|requires javascript|"
+    r"you need to enable javascript",
+    re.IGNORECASE,
+)
+
+
+class FetchResult(BaseModel):
+    """Homepage fetch outcome, kept so the graph can decide whether to analyze."""
+    url: str
+    status_code: Optional[int] = None
+    text: str = ""
+    html_chars: int = 0
+    script_tags: int = 0
+    js_required: bool = False
+    error: Optional[str] = None
+
+
+_fetch_flight = SingleFlight("fetch")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a homepage URL for de-duplicating fetches (scheme added, host lowercased, no fragment or trailing slash)."""
+    parts = urlsplit(ensure_scheme(url.strip()))
+    path = parts.path.rstrip("/")
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}{query}"
+
+
+def fetch_website(url: str, max_chars: int = 10000) -> FetchResult:
+    """
+    Fetch a homepage and extract its visible text.
+
+    Concurrent fetches of the same (normalized) URL share one request.
+
+    Args:
+        url: Website URL (scheme optional)
+        max_chars: Maximum characters of text to keep
+
+    Returns:
+        FetchResult with the text and the signals used by classify_fetch
+    """
     url = ensure_scheme(url)
+    key = fingerprint(normalize_url(url), max_chars)
+    # Each caller gets its own copy; the graph fills state from it
+    return _fetch_flight.do(key, lambda: _fetch(url, max_chars)).model_copy()
+
+
+def _download(url: str) -> tuple:
+    """GET a page within FETCH_TOTAL_TIMEOUT and the current deadline; returns (response, html)."""
+    budget = min(FETCH_TOTAL_TIMEOUT, remaining(FETCH_TOTAL_TIMEOUT))
+    started = time.monotonic()
+    # Per socket operation, so a stalled server is also cut off near the budget
+    timeout = max(0.1, min(FETCH_TIMEOUT, budget))
+    with requests.get(url, headers={"User-Agent": DEFAULT_UA}, timeout=timeout, stream=True) as resp:
+        body = bytearray()
+        while len(body) <= FETCH_MAX_BYTES:
+            if time.monotonic() - started > budget:
+                check_deadline()
+                raise TimeoutError(f"Download exceeded {budget:.0f}s")
+            # read1 returns whatever has arrived, so a server trickling bytes is checked between reads
+            chunk = resp.raw.read1(FETCH_CHUNK_BYTES, decode_content=True)
+            if not chunk:
+                break
+            body.extend(chunk)
+        return resp, bytes(body).decode(resp.encoding or "utf-8", errors="replace")
+
+
+def _fetch(url: str, max_chars: int) -> FetchResult:
+    try:
+        resp, html = _download(url)
+    except Exception as e:
+        check_deadline()
+        return FetchResult(url=url, error=str(e))
+    result = FetchResult(url=url, status_code=resp.status_code, html_chars=len(html))
     try:
-        resp = requests.get(url, headers={"User-Agent": DEFAULT_UA}, timeout=20)
         resp.raise_for_status()
-        html = resp.text
         soup = BeautifulSoup(html, "html.parser")
+        result.script_tags = len(soup.find_all("script"))
+        noscript = " ".join(t.get_text(" ") for t in soup.find_all("noscript"))
+        result.js_required = bool(JS_REQUIRED_PATTERNS.search(noscript))
         for tag in soup(["script", "style", "noscript", "svg"]):
             tag.decompose()
         text = " ".join(soup.get_text(separator=" ").split())
-        text = re.sub(r"\s+", " ", text).strip()
-        return text[:max_chars] if text else "(No readable text found on homepage.)"
+        result.text = re.sub(r"\s+", " ", text).strip()[:max_chars]
     except Exception as e:
-        return f"(Error fetching site: {e})"
+        result.error = str(e)
+    return result
+
+
+def is_parked(text: str) -> bool:
+    """True if the text reads like a parked or for-sale domain page."""
+    if PARKED_PATTERNS.search(text):
+        return True
+    return bool(PARKED_MARKETPLACES.search(text) and FOR_SALE_PATTERNS.search(text))
+
+
+def classify_fetch(result: FetchResult) -> str:
+    """
+    Classify a fetch so dead or empty sites can skip the LLM calls.
+
+    Returns:
+        One of FETCH_OK, FETCH_HTTP_ERROR, FETCH_PARKED, FETCH_JS_SHELL, FETCH_THIN
+    """
+    if result.error or (result.status_code or 0) >= 400:
+        return FETCH_HTTP_ERROR
+    if is_parked(result.text[:2000]):
+        return FETCH_PARKED
+    if len(result.text) < MIN_TEXT_CHARS:
+        # Plenty of markup/scripts but almost no text: client-rendered app shell
+        if result.js_required or (result.script_tags >= 3 and result.html_chars > 20 * max(len(result.text), 1)):
+            return FETCH_JS_SHELL
+        return FETCH_THIN
+    return FETCH_OK
+
+
+def fetch_website_text(url: str, max_chars: int = 10000) -> str:
+    """Fetch and extract text content from a website."""
+    result = fetch_website(url, max_chars)
+    if result.error:
+        return f"(Error fetching site: {result.error})"
+    return result.text or "(No readable text found on homepage.)"
 
 
 def hostname(url: str) -> str: